@@ -3,54 +3,75 @@ Flask REST API Server for FYP Recommender System
 Provides endpoints for the React frontend to interact with the backend.
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from typing import Dict, List, Optional
 from datetime import datetime
-import uuid
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 from student_profile import StudentProfile, Proficiency, InterestLevel
 from fyp_recommender import FYPRecommender
 from storage_manager import StorageManager
-from knowledge_base import KnowledgeBase
+from knowledge_base import get_kb
+from data_extractor import DataExtractor
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson, used by jsonify and request.json."""
+    
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=self.default,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 
 app = Flask(__name__)
+if ORJSON_AVAILABLE:
+    app.json = ORJSONProvider(app)
 CORS(app)  # Enable CORS for all routes
 
 # Initialize components
 storage = StorageManager()
-recommender = FYPRecommender(enable_ml_fallback=True)
-kb = KnowledgeBase()
+kb = get_kb()
+recommender = FYPRecommender(enable_ml_fallback=True, kb=kb)
+data_extractor = DataExtractor(kb=kb)
 
 # ==================== Helper Functions ====================
 
 def frontend_to_backend_student(data: dict) -> StudentProfile:
     """Convert frontend student format to backend StudentProfile."""
+    prefs = data.get('preferences') or {}
     student = StudentProfile(
         student_id=data['id'],
         name=data['name'],
         cgpa=data['cgpa'],
         major=data['major'],
         year=data['year'],
-        max_weekly_hours=data.get('preferences', {}).get('max_weekly_hours', 20),
-        team_size_preference=data.get('preferences', {}).get('team_size', 1)
+        max_weekly_hours=prefs.get('max_weekly_hours', 20),
+        team_size_preference=prefs.get('team_size', 1)
     )
     
     # Convert skills array to dict
-    for skill in data.get('skills', []):
-        proficiency = Proficiency[skill['proficiency']]
-        student.add_skill(skill['name'], proficiency)
+    for skill in data.get('skills') or ():
+        student.add_skill(skill['name'], Proficiency[skill['proficiency']])
     
     # Convert interests array to dict
-    for interest in data.get('interests', []):
-        level = InterestLevel[interest['level']]
-        student.add_interest(interest['domain'], level)
+    for interest in data.get('interests') or ():
+        student.add_interest(interest['domain'], InterestLevel[interest['level']])
     
     # Add preferred domains from preferences
-    student.preferred_domains = data.get('preferences', {}).get('preferred_domains', [])
+    student.preferred_domains = prefs.get('preferred_domains', [])
     
     # Add completed courses
-    student.completed_courses = set(data.get('completed_courses', []))
+    student.completed_courses = set(data.get('completed_courses') or ())
     
     return student
 
@@ -80,15 +101,30 @@ def backend_to_frontend_student(student: StudentProfile) -> dict:
     }
 
 
+# Required skill/course lists per topic id; topics are fixed at runtime
+_topic_requirements: Dict[str, tuple] = {}
+
+
+def _requirement_lists(topic) -> tuple:
+    """(required_skills, required_courses) of a topic, built once per topic id."""
+    lists = _topic_requirements.get(topic.id)
+    if lists is None:
+        reqs = topic.requirements
+        lists = (tuple(reqs.required_skills.keys()), tuple(reqs.required_courses))
+        _topic_requirements[topic.id] = lists
+    return lists
+
+
 def recommendation_to_frontend(rec, topic) -> dict:
     """Convert backend Recommendation to frontend format."""
+    required_skills, required_courses = _requirement_lists(topic)
     return {
         'topic_id': topic.id,
         'title': topic.title,
         'description': topic.description,
         'match_score': rec.score / 100.0,  # Normalize to 0-1 for frontend
-        'required_skills': list(topic.requirements.required_skills.keys()),
-        'required_courses': list(topic.requirements.required_courses),
+        'required_skills': required_skills,
+        'required_courses': required_courses,
         'explanation': rec.explanation,
         'domain': topic.domain,
         # Extended details
@@ -101,14 +137,28 @@ def recommendation_to_frontend(rec, topic) -> dict:
 
 # ==================== Student Endpoints ====================
 
+# Encoded frontend profiles for one version of the students file: (version, [json, ...])
+_students_payload = (None, None)
+
+
 @app.route('/api/students', methods=['GET'])
 def get_students():
     """Get all students."""
+    global _students_payload
     try:
-        students = storage.load_all_students()
-        return jsonify([backend_to_frontend_student(s) for s in students.values()])
+        version = storage.students_version()
+        cached_version, encoded = _students_payload
+        if encoded is None or cached_version != version:
+            # Every profile is converted before the response starts, so a bad one still
+            # gets a 500; the files are read one at a time and only the JSON is kept
+            encoded = [app.json.dumps(backend_to_frontend_student(student))
+                       for student in storage.iter_students()]
+            _students_payload = (version, encoded)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
+    
+    # The brackets are sent around the joined profiles rather than copied into one more string
+    return Response(iter(('[', ','.join(encoded), ']')), mimetype='application/json')
 
 
 @app.route('/api/students/<student_id>', methods=['GET'])
@@ -237,7 +287,8 @@ def get_history():
         frontend_history = []
         for entry in history:
             frontend_history.append({
-                'id': str(uuid.uuid4()),  # Generate unique ID for frontend
+                # Entries saved before IDs were stored get a stable derived ID
+                'id': entry.get('id') or f"{entry['student_id']}-{entry['timestamp']}",
                 'student_id': entry['student_id'],
                 'student_name': entry['student_name'],
                 'timestamp': entry['timestamp'],
@@ -287,63 +338,36 @@ def clear_history():
 
 # ==================== Metadata Endpoints ====================
 
+def _build_options() -> dict:
+    """Build the dropdown options payload; the knowledge base is fixed at runtime."""
+    return {
+        'skills': data_extractor.get_all_skills(),
+        'courses': data_extractor.get_all_courses(),
+        'domains': data_extractor.get_all_domains(),
+        'majors': data_extractor.get_majors(),
+        'proficiency_levels': data_extractor.get_proficiency_levels(),
+        'interest_levels': data_extractor.get_interest_levels()
+    }
+
+
+# Serialized once at startup and served as-is on every request
+_OPTIONS_JSON = app.json.dumps(_build_options())
+
+
 @app.route('/api/options', methods=['GET'])
 def get_options():
     """Get dropdown options for the frontend."""
-    try:
-        # Aggregate all unique skills and courses from Knowledge Base
-        all_skills = set()
-        all_courses = set()
-        
-        # From domains
-        for d in kb.domains.values():
-            all_skills.update(d.base_skills.keys())
-            all_courses.update(d.base_courses)
-            
-        # From techniques
-        for t in kb.techniques.values():
-            all_skills.update(t.required_skills.keys())
-            
-        # From contexts
-        for c in kb.contexts.values():
-            all_skills.update(c.additional_skills.keys())
-            all_courses.update(c.additional_courses)
-            
-        return jsonify({
-            'skills': sorted(list(all_skills)),
-            'courses': sorted(list(all_courses)),
-            'domains': sorted(list(kb.domains.keys())),
-            'majors': [
-                'Computer Science',
-                'Software Engineering',
-                'Information Technology',
-                'Data Science',
-                'Cybersecurity'
-            ],
-            'proficiency_levels': ['NOVICE', 'INTERMEDIATE', 'ADVANCED', 'EXPERT'],
-            'interest_levels': ['LOW', 'MEDIUM', 'HIGH', 'VERY_HIGH']
-        })
-    except Exception as e:
-        print(f"Error fetching options: {e}")
-        return jsonify({'error': str(e)}), 500
+    return app.response_class(_OPTIONS_JSON, mimetype='application/json')
 
 
 @app.route('/api/stats', methods=['GET'])
 def get_stats():
     """Get dashboard statistics."""
     try:
-        students = storage.load_all_students()
-        history = storage.load_recommendation_history()
-        
-        # Count total recommendations
-        total_recommendations = sum(
-            len(entry.get('recommendations', []))
-            for entry in history
-        )
-        
+        counters = storage.get_counters()
         return jsonify({
-            'students': len(students),
-            'recommendations': total_recommendations,
+            'students': counters['total_students'],
+            'recommendations': counters['total_recommendations'],
             'topics': len(kb.topics)
         })
     except Exception as e:
@@ -372,6 +396,7 @@ if __name__ == '__main__':
     print(f"Backend API: http://localhost:5000/api")
     print(f"ML Fallback: {'Enabled' if recommender.enable_ml_fallback else 'Disabled'}")
     print("=" * 60)
-    print("\nStarting server...\n")
+    print("\nStarting development server (use wsgi.py with gunicorn in production)...\n")
     
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    # No debug reloader; threaded so concurrent requests do not queue behind each other
+    app.run(host='0.0.0.0', port=5000, threaded=True)
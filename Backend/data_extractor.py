@@ -3,16 +3,16 @@ Data Extractor Module
 Extracts all possible dropdown values from the knowledge base for GUI consistency.
 """
 
-from typing import List, Set, Dict
-from knowledge_base import KnowledgeBase
-from student_profile import Proficiency, InterestLevel
+from typing import List, Set, Dict, Optional
+from knowledge_base import KnowledgeBase, get_kb
+from student_profile import PROFICIENCY_NAMES, INTEREST_NAMES
 
 
 class DataExtractor:
     """Extracts and caches all possible values for GUI dropdowns."""
     
-    def __init__(self):
-        self.kb = KnowledgeBase()
+    def __init__(self, kb: Optional[KnowledgeBase] = None):
+        self.kb = kb or get_kb()
         self._all_skills: Set[str] = set()
         self._all_courses: Set[str] = set()
         self._extract_data()
@@ -55,11 +55,11 @@ class DataExtractor:
     
     def get_proficiency_levels(self) -> List[str]:
         """Get list of proficiency level names."""
-        return [p.name for p in Proficiency]
+        return list(PROFICIENCY_NAMES[1:])
     
     def get_interest_levels(self) -> List[str]:
         """Get list of interest level names."""
-        return [i.name for i in InterestLevel]
+        return list(INTEREST_NAMES[1:])
     
     def get_majors(self) -> List[str]:
         """Get common majors (can be extended)."""
@@ -2,6 +2,11 @@ from typing import List
 from recommendation_engine import Recommendation
 from student_profile import StudentProfile
 
+# Report rules, built once instead of on every line that uses them
+SEPARATOR = "=" * 60
+WARNING_BANNER = "⚠" * 60
+
+
 class ExplanationGenerator:
     """
     Generates human-readable explanations for recommendations.
@@ -10,24 +15,24 @@ class ExplanationGenerator:
     def generate_report(self, student: StudentProfile, recommendations: List[Recommendation], ml_used: bool = False) -> str:
         report = []
         report.append(f"FYP Recommendation Report for {student.name}")
-        report.append("=" * 60)
+        report.append(SEPARATOR)
         report.append(f"Major: {student.major} | CGPA: {student.cgpa}")
         report.append(f"Interests: {', '.join(student.preferred_domains)}")
         
         # ML Fallback Notice
         if ml_used:
-            report.append("\n" + "⚠" * 60)
+            report.append("\n" + WARNING_BANNER)
             report.append("ℹ️  ML FALLBACK ACTIVATED")
             report.append("Some recommendations use relaxed constraints to ensure you have options.")
             report.append("Consider improving your skills/CGPA for better knowledge-based matches.")
-            report.append("⚠" * 60)
+            report.append(WARNING_BANNER)
         
         report.append(f"\n{len(recommendations)} Top Recommendations based on your profile:\n")
 
         for i, rec in enumerate(recommendations):
-            report.append(f"{'='*60}")
+            report.append(SEPARATOR)
             report.append(f"RANK #{i+1}: {rec.topic.title}")
-            report.append(f"{'='*60}")
+            report.append(SEPARATOR)
             report.append(f"📊 MATCH SCORE: {rec.score:.2f}/100  |  Topic ID: {rec.topic.id}")
             report.append(f"Domain: {rec.topic.domain}  |  Difficulty: {rec.topic.difficulty}")
             report.append(f"\nDescription: {rec.topic.description}")
@@ -1,20 +1,38 @@
+from functools import lru_cache
 from typing import List, Optional
 from student_profile import StudentProfile
-from knowledge_base import KnowledgeBase
+from knowledge_base import KnowledgeBase, get_kb
 from inference_engine import InferenceEngine
 from recommendation_engine import RecommendationEngine, Recommendation
 from explanation_generator import ExplanationGenerator
 from topic_tracker import TopicTracker
 from ml_recommender import MLRecommender
+from scoring_kernels import warm_up
+
+# Warm the scoring kernels once per process (e.g. per server worker) at import
+warm_up()
+
+
+@lru_cache(maxsize=4096)
+def _build_explanation(reasons: tuple) -> str:
+    """Brief explanation from a recommendation's leading match reasons (shared across requests)."""
+    if not reasons:
+        return "Recommended based on your profile compatibility."
+    explanation = " ".join(reasons)
+    if not explanation.endswith('.'):
+        explanation += "."
+    return explanation
+
 
 class FYPRecommender:
     """
     Main system orchestrator for the FYP Topic Recommender.
     Integrates all components: Knowledge Base, Inference, Recommendation, Explanation, and Topic Tracking.
     """
-    def __init__(self, csv_file: str = "selected_topics.csv", enable_ml_fallback: bool = True):
-        # 1. Initialize Knowledge Base
-        self.kb = KnowledgeBase()
+    def __init__(self, csv_file: str = "selected_topics.csv", enable_ml_fallback: bool = True,
+                 kb: Optional[KnowledgeBase] = None):
+        # 1. Initialize Knowledge Base (shared instance unless one is injected)
+        self.kb = kb or get_kb()
         
         # 2. Initialize Inference Engine
         self.inference_engine = InferenceEngine()
@@ -113,12 +131,7 @@ class FYPRecommender:
         for rec in recommendations:
             if not rec.explanation:
                 # Construct a brief explanation from match reasons
-                if rec.match_reasons:
-                    rec.explanation = " ".join(rec.match_reasons[:2])
-                    if not rec.explanation.endswith('.'):
-                        rec.explanation += "."
-                else:
-                    rec.explanation = "Recommended based on your profile compatibility."
+                rec.explanation = _build_explanation(tuple(rec.match_reasons[:2]))
 
         return recommendations
     
@@ -3,13 +3,37 @@ FYP Recommender System - Enhanced Professional GUI Application
 Beautiful, modern interface with improved colors, fonts, and spacing.
 """
 
+import queue
+import sys
+from collections import OrderedDict
+from bisect import bisect_left
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
-from typing import Dict, List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice, starmap
+from tkinter import ttk, messagebox, scrolledtext, font as tkfont
+from typing import Callable, Dict, Iterable, List, Optional
 from student_profile import StudentProfile, Proficiency, InterestLevel
 from data_extractor import DataExtractor
 from storage_manager import StorageManager
 from fyp_recommender import FYPRecommender
+from knowledge_base import get_kb
+
+# Level name -> enum member, for turning the form's stored level names back into enums
+_PROF_MAP = {member.name: member for member in Proficiency}
+_INT_MAP = {member.name: member for member in InterestLevel}
+
+# "name (LEVEL)" formatter for the skill and interest listboxes
+_ITEM_FMT = "{0} ({1})".format
+
+# Recommendation results kept in the GUI's LRU cache
+_REC_CACHE_SIZE = 64
+
+# History rows inserted per event-loop turn
+_HISTORY_CHUNK = 200
+
+# Version of the history cells stored with each saved entry; bump when
+# _history_cells changes so older entries are formatted afresh on display
+_HISTORY_ROW_VERSION = 1
 
 
 class FYPRecommenderGUI:
@@ -37,14 +61,71 @@ class FYPRecommenderGUI:
         self.root.geometry("1400x900")
         self.root.configure(bg=self.COLORS['bg'])
         
-        # Initialize backend components
-        self.data_extractor = DataExtractor()
+        # Initialize backend components (sharing one knowledge base)
+        kb = get_kb()
+        self.data_extractor = DataExtractor(kb=kb)
         self.storage_manager = StorageManager()
-        self.recommender = FYPRecommender()
+        self.recommender = FYPRecommender(kb=kb)
+        
+        # Dropdown values are fixed by the knowledge base, so fetch each list once
+        self._options = {
+            'majors': self.data_extractor.get_majors(),
+            'years': self.data_extractor.get_years(),
+            'skills': self.data_extractor.get_all_skills(),
+            'domains': self.data_extractor.get_all_domains(),
+            'courses': self.data_extractor.get_all_courses(),
+            'proficiency_levels': self.data_extractor.get_proficiency_levels(),
+            'interest_levels': self.data_extractor.get_interest_levels(),
+        }
         
         # Current student being edited
         self.current_student: Optional[StudentProfile] = None
         
+        # View Students rows (id, name, major, cgpa, year); only a window of them is in the Treeview
+        self._all_students: List[tuple] = []
+        self._shown_students: List[tuple] = []
+        self._first_visible = 0
+        self._visible_rows = 18
+        self._rendered_rows: Dict[str, tuple] = {}   # iid -> row currently in the Treeview
+        
+        # Search state: casefolded "id\0name\0major" per row, last query and its matching row indices
+        self._search_keys: List[str] = []
+        self._last_query = ""
+        self._last_matches: List[int] = []
+        self._filter_job = None
+        
+        # Parallel to _all_students and sorted the same way: IDs and "id - name" combobox labels
+        self._student_ids: List[str] = []
+        self._student_labels: List[str] = []
+        
+        # Pending after_idle callback while history is being streamed in, and what the
+        # history table holds once streamed: (filter, entry count, marker of the newest entry)
+        self._history_job = None
+        self._history_view: Optional[tuple] = None
+        
+        # Full profiles already read this session, valid while the students file keeps this version
+        self._profiles: Dict[str, StudentProfile] = {}
+        self._profiles_version: Optional[tuple] = None
+        
+        # Rendered details text per student ID: (profile fingerprint, text)
+        self._details_cache: Dict[str, tuple] = {}
+        
+        # Generated recommendations keyed by (student_id, profile fingerprint, count, selections version)
+        self._rec_cache: "OrderedDict[tuple, list]" = OrderedDict()
+        
+        # Storage reads and writes run on one worker thread and recommendation generation on another,
+        # so a long generation never holds up list or history loads; finished jobs are
+        # queued back to the Tk thread, which alone touches widgets
+        self._pool = ThreadPoolExecutor(max_workers=1)
+        self._rec_executor = ThreadPoolExecutor(max_workers=1)
+        self._result_q: "queue.Queue[tuple]" = queue.Queue()
+        
+        # Add/Edit form lists; the listboxes only display them
+        self._skills: List[tuple] = []      # (skill, proficiency name)
+        self._interests: List[tuple] = []   # (domain, interest level name)
+        self._courses: List[str] = []
+        self._domains: List[str] = []
+        
         # Setup UI
         self._setup_modern_styles()
         self._create_header()
@@ -53,103 +134,97 @@ class FYPRecommenderGUI:
         self._create_status_bar()
         
         # Load initial data
+        self.root.after(50, self._drain_queue)
         self._refresh_student_list()
     
+    def _submit(self, fn: Callable, *args, on_done: Callable[[Future], None],
+                executor: Optional[ThreadPoolExecutor] = None, **kwargs):
+        """Run fn(*args, **kwargs) on a worker thread (the storage one by default) and pass its future to on_done on the Tk thread."""
+        future = (executor or self._pool).submit(fn, *args, **kwargs)
+        future.add_done_callback(lambda f: self._result_q.put((on_done, f)))
+    
+    def _drain_queue(self):
+        """Hand finished background jobs to their callbacks, then poll again."""
+        try:
+            while True:
+                try:
+                    on_done, future = self._result_q.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    on_done(future)
+                except Exception:
+                    # Reported like any Tk callback error; later results are still delivered
+                    self.root.report_callback_exception(*sys.exc_info())
+        finally:
+            self.root.after(50, self._drain_queue)
+    
     def _setup_modern_styles(self):
         """Configure modern, professional styling with larger fonts and better colors."""
+        # Named fonts, created once and shared by every widget and style
+        self.FONTS = {
+            'small': tkfont.Font(family="Segoe UI", size=10),
+            'body': tkfont.Font(family="Segoe UI", size=11),
+            'bold': tkfont.Font(family="Segoe UI", size=11, weight="bold"),
+            'large': tkfont.Font(family="Segoe UI", size=12),
+            'large_bold': tkfont.Font(family="Segoe UI", size=12, weight="bold"),
+            'subtitle': tkfont.Font(family="Segoe UI", size=13),
+            'section': tkfont.Font(family="Segoe UI", size=13, weight="bold"),
+            'header': tkfont.Font(family="Segoe UI", size=14, weight="bold"),
+            'title': tkfont.Font(family="Segoe UI", size=24, weight="bold"),
+            'banner': tkfont.Font(family="Segoe UI", size=28, weight="bold"),
+            'mono': tkfont.Font(family="Consolas", size=11),
+        }
+        
+        colors, fonts = self.COLORS, self.FONTS
+        
+        # Every style the tabs use is declared here, before any widget exists;
+        # nothing reconfigures styles later, so lazily built tabs never re-theme
+        style_spec = (
+            # Frames
+            ("TFrame", dict(background=colors['bg'])),
+            ("Card.TFrame", dict(background=colors['white'], relief=tk.RAISED, borderwidth=1)),
+            # Labels
+            ("TLabel", dict(background=colors['bg'], foreground=colors['text'], font=fonts['body'])),
+            ("Title.TLabel", dict(font=fonts['title'], foreground=colors['primary'], background=colors['bg'])),
+            ("Subtitle.TLabel", dict(font=fonts['large'], foreground=colors['text_light'], background=colors['bg'])),
+            ("Header.TLabel", dict(font=fonts['header'], foreground=colors['primary'], background=colors['white'])),
+            ("SectionLabel.TLabel", dict(font=fonts['large_bold'], foreground=colors['text'], background=colors['white'])),
+            # Buttons
+            ("TButton", dict(font=fonts['body'], padding=(15, 8))),
+            ("Primary.TButton", dict(font=fonts['large_bold'], padding=(20, 10))),
+            ("Success.TButton", dict(font=fonts['bold'], padding=(15, 8))),
+            ("Danger.TButton", dict(font=fonts['body'], padding=(15, 8))),
+            # Entry and Combobox
+            ("TEntry", dict(font=fonts['body'], padding=8)),
+            ("TCombobox", dict(font=fonts['body'], padding=8)),
+            ("TSpinbox", dict(font=fonts['body'], padding=8)),
+            # LabelFrame
+            ("TLabelframe", dict(background=colors['white'], borderwidth=2, relief=tk.GROOVE)),
+            ("TLabelframe.Label", dict(font=fonts['section'], foreground=colors['primary'], background=colors['white'])),
+            # Notebook (Tabs)
+            ("TNotebook", dict(background=colors['bg'], borderwidth=0)),
+            ("TNotebook.Tab", dict(font=fonts['large_bold'], padding=(20, 12))),
+            # Treeview
+            ("Treeview", dict(font=fonts['body'], rowheight=35,
+                              background=colors['white'], fieldbackground=colors['white'])),
+            ("Treeview.Heading", dict(font=fonts['large_bold'], background=colors['primary'],
+                                      foreground=colors['white'], padding=10)),
+        )
+        style_maps = (
+            ("Primary.TButton", dict(background=[('active', colors['primary_dark'])])),
+            ("TNotebook.Tab", dict(background=[('selected', colors['primary'])],
+                                   foreground=[('selected', colors['white'])])),
+            ("Treeview.Heading", dict(background=[('active', colors['primary_dark'])])),
+        )
+        
         style = ttk.Style()
         style.theme_use('clam')
-        
-        # Configure Frame
-        style.configure("TFrame", background=self.COLORS['bg'])
-        style.configure("Card.TFrame", background=self.COLORS['white'], 
-                       relief=tk.RAISED, borderwidth=1)
-        
-        # Configure Labels
-        style.configure("TLabel", 
-                       background=self.COLORS['bg'],
-                       foreground=self.COLORS['text'],
-                       font=("Segoe UI", 11))
-        
-        style.configure("Title.TLabel",
-                       font=("Segoe UI", 24, "bold"),
-                       foreground=self.COLORS['primary'],
-                       background=self.COLORS['bg'])
-        
-        style.configure("Subtitle.TLabel",
-                       font=("Segoe UI", 12),
-                       foreground=self.COLORS['text_light'],
-                       background=self.COLORS['bg'])
-        
-        style.configure("Header.TLabel",
-                       font=("Segoe UI", 14, "bold"),
-                       foreground=self.COLORS['primary'],
-                       background=self.COLORS['white'])
-        
-        style.configure("SectionLabel.TLabel",
-                       font=("Segoe UI", 12, "bold"),
-                       foreground=self.COLORS['text'],
-                       background=self.COLORS['white'])
-        
-        # Configure Buttons
-        style.configure("TButton",
-                       font=("Segoe UI", 11),
-                       padding=(15, 8))
-        
-        style.configure("Primary.TButton",
-                       font=("Segoe UI", 12, "bold"),
-                       padding=(20, 10))
-        
-        style.map("Primary.TButton",
-                 background=[('active', self.COLORS['primary_dark'])])
-        
-        style.configure("Success.TButton",
-                       font=("Segoe UI", 11, "bold"),
-                       padding=(15, 8))
-        
-        style.configure("Danger.TButton",
-                       font=("Segoe UI", 11),
-                       padding=(15, 8))
-        
-        # Configure Entry and Combobox
-        style.configure("TEntry", font=("Segoe UI", 11), padding=8)
-        style.configure("TCombobox", font=("Segoe UI", 11), padding=8)
-        style.configure("TSpinbox", font=("Segoe UI", 11), padding=8)
-        
-        # Configure LabelFrame
-        style.configure("TLabelframe",
-                       background=self.COLORS['white'],
-                       borderwidth=2,
-                       relief=tk.GROOVE)
-        style.configure("TLabelframe.Label",
-                       font=("Segoe UI", 13, "bold"),
-                       foreground=self.COLORS['primary'],
-                       background=self.COLORS['white'])
-        
-        # Configure Notebook (Tabs)
-        style.configure("TNotebook",
-                       background=self.COLORS['bg'],
-                       borderwidth=0)
-        style.configure("TNotebook.Tab",
-                       font=("Segoe UI", 12, "bold"),
-                       padding=(20, 12))
-        style.map("TNotebook.Tab",
-                 background=[('selected', self.COLORS['primary'])],
-                 foreground=[('selected', self.COLORS['white'])])
-        
-        # Configure Treeview
-        style.configure("Treeview",
-                       font=("Segoe UI", 11),
-                       rowheight=35,
-                       background=self.COLORS['white'],
-                       fieldbackground=self.COLORS['white'])
-        style.configure("Treeview.Heading",
-                       font=("Segoe UI", 12, "bold"),
-                       background=self.COLORS['primary'],
-                       foreground=self.COLORS['white'],
-                       padding=10)
-        style.map("Treeview.Heading",
-                 background=[('active', self.COLORS['primary_dark'])])
+        configure, map_ = style.configure, style.map
+        for name, options in style_spec:
+            configure(name, **options)
+        for name, options in style_maps:
+            map_(name, **options)
     
     def _create_header(self):
         """Create beautiful header section."""
@@ -160,7 +235,7 @@ class FYPRecommenderGUI:
         # Title
         title_label = tk.Label(header_frame,
                               text="🎓 FYP Recommender System",
-                              font=("Segoe UI", 28, "bold"),
+                              font=self.FONTS['banner'],
                               bg=self.COLORS['primary'],
                               fg=self.COLORS['white'])
         title_label.pack(pady=(20, 5))
@@ -168,25 +243,25 @@ class FYPRecommenderGUI:
         # Subtitle
         subtitle_label = tk.Label(header_frame,
                                  text="Intelligent Project Matching Powered by AI",
-                                 font=("Segoe UI", 13),
+                                 font=self.FONTS['subtitle'],
                                  bg=self.COLORS['primary'],
                                  fg=self.COLORS['white'])
         subtitle_label.pack()
     
     def _create_menu(self):
         """Create menu bar."""
-        menubar = tk.Menu(self.root, font=("Segoe UI", 10))
+        menubar = tk.Menu(self.root, font=self.FONTS['small'])
         self.root.config(menu=menubar)
         
         # File menu
-        file_menu = tk.Menu(menubar, tearoff=0, font=("Segoe UI", 10))
+        file_menu = tk.Menu(menubar, tearoff=0, font=self.FONTS['small'])
         menubar.add_cascade(label="File", menu=file_menu)
         file_menu.add_command(label="Export All Data", command=self._export_data)
         file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.root.quit)
         
         # Help menu
-        help_menu = tk.Menu(menubar, tearoff=0, font=("Segoe UI", 10))
+        help_menu = tk.Menu(menubar, tearoff=0, font=self.FONTS['small'])
         menubar.add_cascade(label="Help", menu=help_menu)
         help_menu.add_command(label="About", command=self._show_about)
     
@@ -200,11 +275,25 @@ class FYPRecommenderGUI:
         self.notebook = ttk.Notebook(notebook_container)
         self.notebook.pack(fill=tk.BOTH, expand=True)
         
-        # Create tabs
-        self._create_add_student_tab()
-        self._create_view_students_tab()
-        self._create_recommendations_tab()
-        self._create_history_tab()
+        # Create tabs: only the default tab is built now, the others on first selection
+        self._pending_tabs: Dict[str, tuple] = {}
+        for text, builder in (("➕ Add/Edit Student", self._create_add_student_tab),
+                              ("👥 View Students", self._create_view_students_tab),
+                              ("🎯 Recommendations", self._create_recommendations_tab),
+                              ("📜 History", self._create_history_tab)):
+            tab = tk.Frame(self.notebook, bg=self.COLORS['bg'])
+            self.notebook.add(tab, text=text)
+            self._pending_tabs[str(tab)] = (tab, builder)
+        
+        self._build_tab(self.notebook.select())
+        self.notebook.bind("<<NotebookTabChanged>>", lambda e: self._build_tab(self.notebook.select()))
+    
+    def _build_tab(self, tab_id: str):
+        """Build a tab's widgets the first time it is shown."""
+        pending = self._pending_tabs.pop(str(tab_id), None)
+        if pending:
+            tab, builder = pending
+            builder(tab)
     
     def _create_status_bar(self):
         """Create enhanced status bar at bottom."""
@@ -219,28 +308,21 @@ class FYPRecommenderGUI:
                                textvariable=self.status_var,
                                bg=self.COLORS['primary_dark'],
                                fg=self.COLORS['white'],
-                               font=("Segoe UI", 11),
+                               font=self.FONTS['body'],
                                anchor=tk.W,
                                padx=15)
         status_label.pack(fill=tk.BOTH, expand=True)
     
     # ==================== TAB 1: Add/Edit Student ====================
     
-    def _create_add_student_tab(self):
+    def _create_add_student_tab(self, tab: tk.Frame):
         """Create the Add/Edit Student tab with enhanced design."""
-        tab = tk.Frame(self.notebook, bg=self.COLORS['bg'])
-        self.notebook.add(tab, text="➕ Add/Edit Student")
         
         # Create scrollable frame
         canvas = tk.Canvas(tab, bg=self.COLORS['bg'], highlightthickness=0)
         scrollbar = ttk.Scrollbar(tab, orient="vertical", command=canvas.yview)
         scrollable_frame = tk.Frame(canvas, bg=self.COLORS['bg'])
         
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-        
         canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
         canvas.configure(yscrollcommand=scrollbar.set)
         
@@ -249,67 +331,68 @@ class FYPRecommenderGUI:
         basic_frame.grid(row=0, column=0, columnspan=2, sticky="ew", padx=15, pady=10)
         
         # Student ID
-        ttk.Label(basic_frame, text="Student ID:", font=("Segoe UI", 11, "bold")).grid(
+        ttk.Label(basic_frame, text="Student ID:", font=self.FONTS['bold']).grid(
             row=0, column=0, sticky="w", pady=8, padx=5)
         self.student_id_var = tk.StringVar()
-        id_entry = ttk.Entry(basic_frame, textvariable=self.student_id_var, width=35, font=("Segoe UI", 11))
+        id_entry = ttk.Entry(basic_frame, textvariable=self.student_id_var, width=35, font=self.FONTS['body'])
         id_entry.grid(row=0, column=1, sticky="w", pady=8, padx=5)
         
         # Name
-        ttk.Label(basic_frame, text="Full Name:", font=("Segoe UI", 11, "bold")).grid(
+        ttk.Label(basic_frame, text="Full Name:", font=self.FONTS['bold']).grid(
             row=1, column=0, sticky="w", pady=8, padx=5)
         self.name_var = tk.StringVar()
-        ttk.Entry(basic_frame, textvariable=self.name_var, width=35, font=("Segoe UI", 11)).grid(
+        ttk.Entry(basic_frame, textvariable=self.name_var, width=35, font=self.FONTS['body']).grid(
             row=1, column=1, sticky="w", pady=8, padx=5)
         
         # CGPA
-        ttk.Label(basic_frame, text="CGPA:", font=("Segoe UI", 11, "bold")).grid(
+        ttk.Label(basic_frame, text="CGPA:", font=self.FONTS['bold']).grid(
             row=2, column=0, sticky="w", pady=8, padx=5)
         self.cgpa_var = tk.DoubleVar(value=3.0)
         cgpa_spinbox = ttk.Spinbox(basic_frame, from_=0.0, to=4.0, increment=0.1,
-                                   textvariable=self.cgpa_var, width=33, font=("Segoe UI", 11))
+                                   textvariable=self.cgpa_var, width=33, font=self.FONTS['body'])
         cgpa_spinbox.grid(row=2, column=1, sticky="w", pady=8, padx=5)
         
         # Major
-        ttk.Label(basic_frame, text="Major:", font=("Segoe UI", 11, "bold")).grid(
+        ttk.Label(basic_frame, text="Major:", font=self.FONTS['bold']).grid(
             row=3, column=0, sticky="w", pady=8, padx=5)
         self.major_var = tk.StringVar()
         major_combo = ttk.Combobox(basic_frame, textvariable=self.major_var,
-                                   values=self.data_extractor.get_majors(), width=33, font=("Segoe UI", 11))
+                                   values=self._options['majors'], width=33, font=self.FONTS['body'])
         major_combo.grid(row=3, column=1, sticky="w", pady=8, padx=5)
         
         # Year
-        ttk.Label(basic_frame, text="Year:", font=("Segoe UI", 11, "bold")).grid(
+        ttk.Label(basic_frame, text="Year:", font=self.FONTS['bold']).grid(
             row=4, column=0, sticky="w", pady=8, padx=5)
         self.year_var = tk.IntVar(value=4)
         year_combo = ttk.Combobox(basic_frame, textvariable=self.year_var,
-                                 values=self.data_extractor.get_years(), width=33, font=("Segoe UI", 11))
+                                 values=self._options['years'], width=33, font=self.FONTS['body'])
         year_combo.grid(row=4, column=1, sticky="w", pady=8, padx=5)
         
         # Skills Section
         skills_frame = ttk.LabelFrame(scrollable_frame, text="💻 Technical Skills", padding=20)
         skills_frame.grid(row=1, column=0, sticky="nsew", padx=15, pady=10)
         
-        ttk.Label(skills_frame, text="Select Skill:", font=("Segoe UI", 11, "bold")).grid(
+        ttk.Label(skills_frame, text="Select Skill:", font=self.FONTS['bold']).grid(
             row=0, column=0, sticky="w", pady=5)
         self.skill_var = tk.StringVar()
         skill_combo = ttk.Combobox(skills_frame, textvariable=self.skill_var,
-                                   values=self.data_extractor.get_all_skills(), width=30, font=("Segoe UI", 11))
+                                   values=self._options['skills'], width=30, font=self.FONTS['body'])
         skill_combo.grid(row=0, column=1, sticky="w", pady=5, padx=5)
         
-        ttk.Label(skills_frame, text="Proficiency:", font=("Segoe UI", 11, "bold")).grid(
+        ttk.Label(skills_frame, text="Proficiency:", font=self.FONTS['bold']).grid(
             row=1, column=0, sticky="w", pady=5)
         self.skill_level_var = tk.StringVar(value="INTERMEDIATE")
         skill_level_combo = ttk.Combobox(skills_frame, textvariable=self.skill_level_var,
-                                        values=self.data_extractor.get_proficiency_levels(), width=30, font=("Segoe UI", 11))
+                                        values=self._options['proficiency_levels'], width=30, font=self.FONTS['body'])
         skill_level_combo.grid(row=1, column=1, sticky="w", pady=5, padx=5)
         
         add_skill_btn = ttk.Button(skills_frame, text="➕ Add Skill", command=self._add_skill, style="Success.TButton")
         add_skill_btn.grid(row=2, column=0, columnspan=2, pady=10)
         
         # Skills listbox with larger font
-        self.skills_listbox = tk.Listbox(skills_frame, height=8, width=45, font=("Segoe UI", 11),
-                                         bg=self.COLORS['white'], selectbackground=self.COLORS['primary'])
+        self.skills_listbox = tk.Listbox(skills_frame, height=8, width=45, font=self.FONTS['body'],
+                                         bg=self.COLORS['white'], selectbackground=self.COLORS['primary'],
+                                         selectmode=tk.EXTENDED)
         self.skills_listbox.grid(row=3, column=0, columnspan=2, pady=5)
         
         ttk.Button(skills_frame, text="❌ Remove Selected", command=self._remove_skill, style="Danger.TButton").grid(
@@ -319,26 +402,27 @@ class FYPRecommenderGUI:
         interests_frame = ttk.LabelFrame(scrollable_frame, text="❤️ Interests & Domains", padding=20)
         interests_frame.grid(row=1, column=1, sticky="nsew", padx=15, pady=10)
         
-        ttk.Label(interests_frame, text="Select Interest:", font=("Segoe UI", 11, "bold")).grid(
+        ttk.Label(interests_frame, text="Select Interest:", font=self.FONTS['bold']).grid(
             row=0, column=0, sticky="w", pady=5)
         self.interest_var = tk.StringVar()
         interest_combo = ttk.Combobox(interests_frame, textvariable=self.interest_var,
-                                     values=self.data_extractor.get_all_domains(), width=30, font=("Segoe UI", 11))
+                                     values=self._options['domains'], width=30, font=self.FONTS['body'])
         interest_combo.grid(row=0, column=1, sticky="w", pady=5, padx=5)
         
-        ttk.Label(interests_frame, text="Interest Level:", font=("Segoe UI", 11, "bold")).grid(
+        ttk.Label(interests_frame, text="Interest Level:", font=self.FONTS['bold']).grid(
             row=1, column=0, sticky="w", pady=5)
         self.interest_level_var = tk.StringVar(value="HIGH")
         interest_level_combo = ttk.Combobox(interests_frame, textvariable=self.interest_level_var,
-                                           values=self.data_extractor.get_interest_levels(), width=30, font=("Segoe UI", 11))
+                                           values=self._options['interest_levels'], width=30, font=self.FONTS['body'])
         interest_level_combo.grid(row=1, column=1, sticky="w", pady=5, padx=5)
         
         ttk.Button(interests_frame, text="➕ Add Interest", command=self._add_interest, style="Success.TButton").grid(
             row=2, column=0, columnspan=2, pady=10)
         
         # Interests listbox
-        self.interests_listbox = tk.Listbox(interests_frame, height=8, width=45, font=("Segoe UI", 11),
-                                           bg=self.COLORS['white'], selectbackground=self.COLORS['primary'])
+        self.interests_listbox = tk.Listbox(interests_frame, height=8, width=45, font=self.FONTS['body'],
+                                           bg=self.COLORS['white'], selectbackground=self.COLORS['primary'],
+                                           selectmode=tk.EXTENDED)
         self.interests_listbox.grid(row=3, column=0, columnspan=2, pady=5)
         
         ttk.Button(interests_frame, text="❌ Remove Selected", command=self._remove_interest, style="Danger.TButton").grid(
@@ -350,14 +434,15 @@ class FYPRecommenderGUI:
         
         self.course_var = tk.StringVar()
         course_combo = ttk.Combobox(courses_frame, textvariable=self.course_var,
-                                   values=self.data_extractor.get_all_courses(), width=35, font=("Segoe UI", 11))
+                                   values=self._options['courses'], width=35, font=self.FONTS['body'])
         course_combo.grid(row=0, column=0, pady=5, padx=5)
         
         ttk.Button(courses_frame, text="➕ Add Course", command=self._add_course, style="Success.TButton").grid(
             row=1, column=0, pady=10)
         
-        self.courses_listbox = tk.Listbox(courses_frame, height=8, width=45, font=("Segoe UI", 11),
-                                         bg=self.COLORS['white'], selectbackground=self.COLORS['primary'])
+        self.courses_listbox = tk.Listbox(courses_frame, height=8, width=45, font=self.FONTS['body'],
+                                         bg=self.COLORS['white'], selectbackground=self.COLORS['primary'],
+                                         selectmode=tk.EXTENDED)
         self.courses_listbox.grid(row=2, column=0, pady=5)
         
         ttk.Button(courses_frame, text="❌ Remove Selected", command=self._remove_course, style="Danger.TButton").grid(
@@ -367,31 +452,32 @@ class FYPRecommenderGUI:
         prefs_frame = ttk.LabelFrame(scrollable_frame, text="⚙️ Preferences", padding=20)
         prefs_frame.grid(row=2, column=1, sticky="nsew", padx=15, pady=10)
         
-        ttk.Label(prefs_frame, text="Max Weekly Hours:", font=("Segoe UI", 11, "bold")).grid(
+        ttk.Label(prefs_frame, text="Max Weekly Hours:", font=self.FONTS['bold']).grid(
             row=0, column=0, sticky="w", pady=8, padx=5)
         self.max_hours_var = tk.IntVar(value=20)
-        ttk.Spinbox(prefs_frame, from_=5, to=40, textvariable=self.max_hours_var, width=33, font=("Segoe UI", 11)).grid(
+        ttk.Spinbox(prefs_frame, from_=5, to=40, textvariable=self.max_hours_var, width=33, font=self.FONTS['body']).grid(
             row=0, column=1, pady=8, padx=5)
         
-        ttk.Label(prefs_frame, text="Team Size:", font=("Segoe UI", 11, "bold")).grid(
+        ttk.Label(prefs_frame, text="Team Size:", font=self.FONTS['bold']).grid(
             row=1, column=0, sticky="w", pady=8, padx=5)
         self.team_size_var = tk.IntVar(value=1)
-        ttk.Spinbox(prefs_frame, from_=1, to=5, textvariable=self.team_size_var, width=33, font=("Segoe UI", 11)).grid(
+        ttk.Spinbox(prefs_frame, from_=1, to=5, textvariable=self.team_size_var, width=33, font=self.FONTS['body']).grid(
             row=1, column=1, pady=8, padx=5)
         
-        ttk.Label(prefs_frame, text="Preferred Domains:", font=("Segoe UI", 11, "bold")).grid(
+        ttk.Label(prefs_frame, text="Preferred Domains:", font=self.FONTS['bold']).grid(
             row=2, column=0, columnspan=2, sticky="w", pady=8, padx=5)
         
         self.domain_var = tk.StringVar()
         domain_combo = ttk.Combobox(prefs_frame, textvariable=self.domain_var,
-                                   values=self.data_extractor.get_all_domains(), width=35, font=("Segoe UI", 11))
+                                   values=self._options['domains'], width=35, font=self.FONTS['body'])
         domain_combo.grid(row=3, column=0, columnspan=2, pady=5, padx=5)
         
         ttk.Button(prefs_frame, text="➕ Add Domain", command=self._add_domain, style="Success.TButton").grid(
             row=4, column=0, columnspan=2, pady=10)
         
-        self.domains_listbox = tk.Listbox(prefs_frame, height=5, width=45, font=("Segoe UI", 11),
-                                         bg=self.COLORS['white'], selectbackground=self.COLORS['primary'])
+        self.domains_listbox = tk.Listbox(prefs_frame, height=5, width=45, font=self.FONTS['body'],
+                                         bg=self.COLORS['white'], selectbackground=self.COLORS['primary'],
+                                         selectmode=tk.EXTENDED)
         self.domains_listbox.grid(row=5, column=0, columnspan=2, pady=5)
         
         ttk.Button(prefs_frame, text="❌ Remove Selected", command=self._remove_domain, style="Danger.TButton").grid(
@@ -414,24 +500,41 @@ class FYPRecommenderGUI:
         # Pack canvas and scrollbar
         canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        # Bound only now that the form is built, and coalesced so a burst of
+        # resizes recomputes the scroll region once
+        scroll_job = None
+        
+        def update_scrollregion():
+            nonlocal scroll_job
+            scroll_job = None
+            canvas.configure(scrollregion=canvas.bbox("all"))
+        
+        def schedule_scrollregion(event=None):
+            nonlocal scroll_job
+            if scroll_job is not None:
+                self.root.after_cancel(scroll_job)
+            scroll_job = self.root.after(50, update_scrollregion)
+        
+        scrollable_frame.bind("<Configure>", schedule_scrollregion)
+        schedule_scrollregion()
     
     # ==================== TAB 2: View Students ====================
     
-    def _create_view_students_tab(self):
+    def _create_view_students_tab(self, tab: tk.Frame):
         """Create the View Students tab with enhanced design."""
-        tab = tk.Frame(self.notebook, bg=self.COLORS['bg'])
-        self.notebook.add(tab, text="👥 View Students")
         
         # Search frame
         search_frame = tk.Frame(tab, bg=self.COLORS['white'], relief=tk.RAISED, borderwidth=2)
         search_frame.pack(fill=tk.X, padx=15, pady=15)
         
-        ttk.Label(search_frame, text="🔍 Search:", font=("Segoe UI", 12, "bold"),
+        ttk.Label(search_frame, text="🔍 Search:", font=self.FONTS['large_bold'],
                  background=self.COLORS['white']).pack(side=tk.LEFT, padx=15, pady=15)
         self.search_var = tk.StringVar()
-        self.search_var.trace('w', lambda *args: self._filter_students())
-        search_entry = ttk.Entry(search_frame, textvariable=self.search_var, width=40, font=("Segoe UI", 12))
+        search_entry = ttk.Entry(search_frame, textvariable=self.search_var, width=40, font=self.FONTS['large'])
         search_entry.pack(side=tk.LEFT, padx=10, pady=15)
+        # Filter on typing only; programmatic search_var.set() does not refilter
+        search_entry.bind("<KeyRelease>", lambda e: self._schedule_filter())
         
         # Students table
         table_frame = tk.Frame(tab, bg=self.COLORS['bg'])
@@ -445,12 +548,16 @@ class FYPRecommenderGUI:
             self.students_tree.heading(col, text=col)
             self.students_tree.column(col, width=200)
         
-        # Scrollbar
-        tree_scroll = ttk.Scrollbar(table_frame, orient="vertical", command=self.students_tree.yview)
-        self.students_tree.configure(yscrollcommand=tree_scroll.set)
+        # Scrollbar drives a virtual window: only the visible rows exist in the Treeview
+        self.students_scroll = ttk.Scrollbar(table_frame, orient="vertical", command=self._scroll_students)
+        self.students_tree.bind("<Configure>", self._on_students_resize)
+        self.students_tree.bind("<MouseWheel>", self._on_students_wheel)
+        self.students_tree.bind("<Button-4>", self._on_students_wheel)
+        self.students_tree.bind("<Button-5>", self._on_students_wheel)
         
         self.students_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        tree_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.students_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self._apply_student_filter(incremental=False)
         
         # Buttons
         button_frame = tk.Frame(tab, bg=self.COLORS['bg'])
@@ -463,23 +570,22 @@ class FYPRecommenderGUI:
     
     # ==================== TAB 3: Get Recommendations ====================
     
-    def _create_recommendations_tab(self):
+    def _create_recommendations_tab(self, tab: tk.Frame):
         """Create the Get Recommendations tab with enhanced design."""
-        tab = tk.Frame(self.notebook, bg=self.COLORS['bg'])
-        self.notebook.add(tab, text="🎯 Recommendations")
         
         # Selection frame
         select_frame = ttk.LabelFrame(tab, text="🎓 Select Student & Generate", padding=20)
         select_frame.pack(fill=tk.X, padx=15, pady=15)
         
-        ttk.Label(select_frame, text="Student:", font=("Segoe UI", 11, "bold")).pack(side=tk.LEFT, padx=10)
+        ttk.Label(select_frame, text="Student:", font=self.FONTS['bold']).pack(side=tk.LEFT, padx=10)
         self.rec_student_var = tk.StringVar()
-        self.rec_student_combo = ttk.Combobox(select_frame, textvariable=self.rec_student_var, width=45, font=("Segoe UI", 11))
+        self.rec_student_combo = ttk.Combobox(select_frame, textvariable=self.rec_student_var, width=45, font=self.FONTS['body'])
+        self.rec_student_combo['values'] = self._student_labels
         self.rec_student_combo.pack(side=tk.LEFT, padx=10)
         
-        ttk.Label(select_frame, text="Count:", font=("Segoe UI", 11, "bold")).pack(side=tk.LEFT, padx=20)
+        ttk.Label(select_frame, text="Count:", font=self.FONTS['bold']).pack(side=tk.LEFT, padx=20)
         self.rec_count_var = tk.IntVar(value=5)
-        ttk.Spinbox(select_frame, from_=1, to=10, textvariable=self.rec_count_var, width=10, font=("Segoe UI", 11)).pack(side=tk.LEFT, padx=10)
+        ttk.Spinbox(select_frame, from_=1, to=10, textvariable=self.rec_count_var, width=10, font=self.FONTS['body']).pack(side=tk.LEFT, padx=10)
         
         ttk.Button(select_frame, text="✨ Generate Recommendations", style="Primary.TButton",
                   command=self._generate_recommendations).pack(side=tk.LEFT, padx=25)
@@ -488,51 +594,90 @@ class FYPRecommenderGUI:
         results_frame = ttk.LabelFrame(tab, text="📊 Recommendation Results", padding=15)
         results_frame.pack(fill=tk.BOTH, expand=True, padx=15, pady=10)
         
-        self.rec_text = scrolledtext.ScrolledText(results_frame, wrap=tk.WORD, font=("Consolas", 11),
-                                                  bg=self.COLORS['white'], fg=self.COLORS['text'])
-        self.rec_text.pack(fill=tk.BOTH, expand=True)
+        self.rec_summary_var = tk.StringVar()
+        ttk.Label(results_frame, textvariable=self.rec_summary_var, font=self.FONTS['bold']).pack(anchor=tk.W, pady=(0, 8))
+        
+        # One row per recommendation; rows are cheap to insert compared to laid-out text
+        columns = ("Rank", "Topic", "Domain", "Score", "Risk", "Why it matches")
+        self.rec_tree = ttk.Treeview(results_frame, columns=columns, show="headings")
+        for col, width in zip(columns, (60, 320, 180, 80, 180, 480)):
+            self.rec_tree.heading(col, text=col)
+            self.rec_tree.column(col, width=width, stretch=col == "Why it matches")
+        
+        rec_scroll = ttk.Scrollbar(results_frame, orient="vertical", command=self.rec_tree.yview)
+        self.rec_tree.configure(yscrollcommand=rec_scroll.set)
+        self.rec_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        rec_scroll.pack(side=tk.RIGHT, fill=tk.Y)
         
         # Action buttons
         action_frame = tk.Frame(tab, bg=self.COLORS['bg'])
         action_frame.pack(fill=tk.X, padx=15, pady=15)
         
         ttk.Button(action_frame, text="💾 Save to History", command=self._save_to_history, style="Success.TButton").pack(side=tk.LEFT, padx=10)
-        ttk.Button(action_frame, text="🗑️ Clear Results", command=lambda: self.rec_text.delete(1.0, tk.END)).pack(side=tk.LEFT, padx=10)
+        ttk.Button(action_frame, text="🗑️ Clear Results", command=self._clear_recommendations).pack(side=tk.LEFT, padx=10)
     
     # ==================== TAB 4: History ====================
     
-    def _create_history_tab(self):
+    def _create_history_tab(self, tab: tk.Frame):
         """Create the Recommendations History tab with enhanced design."""
-        tab = tk.Frame(self.notebook, bg=self.COLORS['bg'])
-        self.notebook.add(tab, text="📜 History")
         
         # Filter frame
         filter_frame = tk.Frame(tab, bg=self.COLORS['white'], relief=tk.RAISED, borderwidth=2)
         filter_frame.pack(fill=tk.X, padx=15, pady=15)
         
-        ttk.Label(filter_frame, text="Filter by Student:", font=("Segoe UI", 11, "bold"),
+        ttk.Label(filter_frame, text="Filter by Student:", font=self.FONTS['bold'],
                  background=self.COLORS['white']).pack(side=tk.LEFT, padx=15, pady=15)
         self.history_filter_var = tk.StringVar()
-        self.history_filter_combo = ttk.Combobox(filter_frame, textvariable=self.history_filter_var, width=35, font=("Segoe UI", 11))
+        self.history_filter_combo = ttk.Combobox(filter_frame, textvariable=self.history_filter_var, width=35, font=self.FONTS['body'])
+        self.history_filter_combo['values'] = self._student_labels
         self.history_filter_combo.pack(side=tk.LEFT, padx=10, pady=15)
         
         ttk.Button(filter_frame, text="📋 Show All", command=lambda: self._load_history(None)).pack(side=tk.LEFT, padx=10)
-        ttk.Button(filter_frame, text="🔍 Filter", command=lambda: self._load_history(self.history_filter_var.get()), style="Success.TButton").pack(side=tk.LEFT, padx=10)
+        ttk.Button(filter_frame, text="🔍 Filter", command=lambda: self._load_history(self.history_filter_var.get().split(" - ")[0] or None), style="Success.TButton").pack(side=tk.LEFT, padx=10)
         ttk.Button(filter_frame, text="🗑️ Clear History", command=self._clear_history, style="Danger.TButton").pack(side=tk.LEFT, padx=20)
         
         # History display
         history_frame = tk.Frame(tab, bg=self.COLORS['bg'])
         history_frame.pack(fill=tk.BOTH, expand=True, padx=15, pady=10)
         
-        self.history_text = scrolledtext.ScrolledText(history_frame, wrap=tk.WORD, font=("Consolas", 11),
-                                                      bg=self.COLORS['white'], fg=self.COLORS['text'])
-        self.history_text.pack(fill=tk.BOTH, expand=True)
+        # One row per saved entry, newest first
+        columns = ("#", "Date", "Student", "ML Used", "Count", "Topics")
+        self.history_tree = ttk.Treeview(history_frame, columns=columns, show="headings")
+        for col, width in zip(columns, (60, 180, 220, 80, 70, 560)):
+            self.history_tree.heading(col, text=col)
+            self.history_tree.column(col, width=width, stretch=col == "Topics")
+        
+        history_scroll = ttk.Scrollbar(history_frame, orient="vertical", command=self.history_tree.yview)
+        self.history_tree.configure(yscrollcommand=history_scroll.set)
+        self.history_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        history_scroll.pack(side=tk.RIGHT, fill=tk.Y)
         
         # Load initial history
         self._load_history()
     
     # ==================== Helper Methods (keeping existing logic) ====================
     
+    def _redraw_listbox(self, listbox: tk.Listbox, items: Iterable[str]):
+        """Replace a listbox's contents with one bulk insert."""
+        listbox.delete(0, tk.END)
+        listbox.insert(tk.END, *items)
+    
+    def _redraw_skills(self):
+        """Show the form's skills as "skill (LEVEL)"."""
+        self._redraw_listbox(self.skills_listbox, starmap(_ITEM_FMT, self._skills))
+    
+    def _redraw_interests(self):
+        """Show the form's interests as "domain (LEVEL)"."""
+        self._redraw_listbox(self.interests_listbox, starmap(_ITEM_FMT, self._interests))
+    
+    def _delete_selected(self, listbox: tk.Listbox, items: List) -> bool:
+        """Delete every item selected in a listbox from its backing list; False if none was."""
+        selection = listbox.curselection()
+        # Highest index first so earlier deletions do not shift the later ones
+        for i in sorted(selection, reverse=True):
+            del items[i]
+        return bool(selection)
+    
     def _add_skill(self):
         """Add skill to the listbox."""
         skill = self.skill_var.get().strip()
@@ -542,15 +687,15 @@ class FYPRecommenderGUI:
             messagebox.showwarning("Warning", "Please select a skill")
             return
         
-        self.skills_listbox.insert(tk.END, f"{skill} ({level})")
+        self._skills.append((skill, level))
+        self._redraw_skills()
         self.skill_var.set("")
         self.status_var.set(f"✓ Added skill: {skill}")
     
     def _remove_skill(self):
-        """Remove selected skill from listbox."""
-        selection = self.skills_listbox.curselection()
-        if selection:
-            self.skills_listbox.delete(selection)
+        """Remove selected skills from listbox."""
+        if self._delete_selected(self.skills_listbox, self._skills):
+            self._redraw_skills()
             self.status_var.set("✓ Skill removed")
     
     def _add_interest(self):
@@ -562,15 +707,15 @@ class FYPRecommenderGUI:
             messagebox.showwarning("Warning", "Please select an interest")
             return
         
-        self.interests_listbox.insert(tk.END, f"{interest} ({level})")
+        self._interests.append((interest, level))
+        self._redraw_interests()
         self.interest_var.set("")
         self.status_var.set(f"✓ Added interest: {interest}")
     
     def _remove_interest(self):
-        """Remove selected interest from listbox."""
-        selection = self.interests_listbox.curselection()
-        if selection:
-            self.interests_listbox.delete(selection)
+        """Remove selected interests from listbox."""
+        if self._delete_selected(self.interests_listbox, self._interests):
+            self._redraw_interests()
             self.status_var.set("✓ Interest removed")
     
     def _add_course(self):
@@ -581,15 +726,15 @@ class FYPRecommenderGUI:
             messagebox.showwarning("Warning", "Please select a course")
             return
         
-        self.courses_listbox.insert(tk.END, course)
+        self._courses.append(course)
+        self._redraw_listbox(self.courses_listbox, self._courses)
         self.course_var.set("")
         self.status_var.set(f"✓ Added course: {course}")
     
     def _remove_course(self):
-        """Remove selected course from listbox."""
-        selection = self.courses_listbox.curselection()
-        if selection:
-            self.courses_listbox.delete(selection)
+        """Remove selected courses from listbox."""
+        if self._delete_selected(self.courses_listbox, self._courses):
+            self._redraw_listbox(self.courses_listbox, self._courses)
             self.status_var.set("✓ Course removed")
     
     def _add_domain(self):
@@ -600,15 +745,15 @@ class FYPRecommenderGUI:
             messagebox.showwarning("Warning", "Please select a domain")
             return
         
-        self.domains_listbox.insert(tk.END, domain)
+        self._domains.append(domain)
+        self._redraw_listbox(self.domains_listbox, self._domains)
         self.domain_var.set("")
         self.status_var.set(f"✓ Added domain: {domain}")
     
     def _remove_domain(self):
-        """Remove selected domain from listbox."""
-        selection = self.domains_listbox.curselection()
-        if selection:
-            self.domains_listbox.delete(selection)
+        """Remove selected domains from listbox."""
+        if self._delete_selected(self.domains_listbox, self._domains):
+            self._redraw_listbox(self.domains_listbox, self._domains)
             self.status_var.set("✓ Domain removed")
     
     def _save_student(self):
@@ -635,41 +780,50 @@ class FYPRecommenderGUI:
             )
             
             # Add skills
-            for i in range(self.skills_listbox.size()):
-                item = self.skills_listbox.get(i)
-                skill_name, level_str = item.rsplit(" (", 1)
-                level_str = level_str.rstrip(")")
-                student.add_skill(skill_name, Proficiency[level_str])
+            for skill_name, level_str in self._skills:
+                student.add_skill(skill_name, _PROF_MAP[level_str])
             
             # Add interests
-            for i in range(self.interests_listbox.size()):
-                item = self.interests_listbox.get(i)
-                interest_name, level_str = item.rsplit(" (", 1)
-                level_str = level_str.rstrip(")")
-                student.add_interest(interest_name, InterestLevel[level_str])
+            for interest_name, level_str in self._interests:
+                student.add_interest(interest_name, _INT_MAP[level_str])
             
             # Add courses
-            for i in range(self.courses_listbox.size()):
-                student.completed_courses.add(self.courses_listbox.get(i))
+            student.completed_courses.update(self._courses)
             
-            # Add preferred domains
-            for i in range(self.domains_listbox.size()):
-                domain = self.domains_listbox.get(i)
-                if domain not in student.preferred_domains:
+            # Add preferred domains, skipping ones add_interest already listed (set lookups,
+            # not a scan of the growing list per domain)
+            listed = set(student.preferred_domains)
+            for domain in self._domains:
+                if domain not in listed:
+                    listed.add(domain)
                     student.preferred_domains.append(domain)
             
             # Save to storage
-            if self.storage_manager.save_student(student):
-                messagebox.showinfo("Success", f"✓ Student {student.name} saved successfully!")
-                self.status_var.set(f"✓ Saved student: {student.student_id}")
-                self._refresh_student_list()
-                self._clear_form()
-            else:
-                messagebox.showerror("Error", "Failed to save student")
+            self.status_var.set("⏳ Saving student...")
+            self._submit(self.storage_manager.save_student, student,
+                         on_done=lambda future: self._on_student_saved(future, student))
         
         except Exception as e:
             messagebox.showerror("Error", f"Error saving student: {str(e)}")
     
+    def _on_student_saved(self, future: Future, student: StudentProfile):
+        """Tk thread: report a student save and show the saved profile."""
+        try:
+            saved = future.result()
+        except Exception as e:
+            messagebox.showerror("Error", f"Error saving student: {str(e)}")
+            return
+        
+        if saved:
+            self._invalidate_recommendations(student.student_id)
+            self._remember_student(student, saved=True)
+            messagebox.showinfo("Success", f"✓ Student {student.name} saved successfully!")
+            self.status_var.set(f"✓ Saved student: {student.student_id}")
+            self._upsert_student(student)
+            self._clear_form()
+        else:
+            messagebox.showerror("Error", "Failed to save student")
+    
     def _clear_form(self):
         """Clear all form fields."""
         self.student_id_var.set("")
@@ -680,6 +834,10 @@ class FYPRecommenderGUI:
         self.max_hours_var.set(20)
         self.team_size_var.set(1)
         
+        self._skills.clear()
+        self._interests.clear()
+        self._courses.clear()
+        self._domains.clear()
         self.skills_listbox.delete(0, tk.END)
         self.interests_listbox.delete(0, tk.END)
         self.courses_listbox.delete(0, tk.END)
@@ -690,7 +848,8 @@ class FYPRecommenderGUI:
     
     def _load_student_dialog(self):
         """Show dialog to load a student."""
-        student_ids = self.storage_manager.get_all_student_ids()
+        # The IDs already listed in View Students (kept current by this app's saves and deletes)
+        student_ids = list(self._student_ids)
         
         if not student_ids:
             messagebox.showinfo("Info", "No students saved yet")
@@ -702,10 +861,10 @@ class FYPRecommenderGUI:
         dialog.geometry("400x200")
         dialog.configure(bg=self.COLORS['bg'])
         
-        ttk.Label(dialog, text="Select Student ID:", font=("Segoe UI", 12, "bold")).pack(pady=20)
+        ttk.Label(dialog, text="Select Student ID:", font=self.FONTS['large_bold']).pack(pady=20)
         
         student_var = tk.StringVar()
-        combo = ttk.Combobox(dialog, textvariable=student_var, values=student_ids, width=35, font=("Segoe UI", 11))
+        combo = ttk.Combobox(dialog, textvariable=student_var, values=student_ids, width=35, font=self.FONTS['body'])
         combo.pack(pady=15)
         
         def load():
@@ -718,8 +877,10 @@ class FYPRecommenderGUI:
     
     def _load_student_to_form(self, student_id: str):
         """Load a student profile into the form."""
-        student = self.storage_manager.load_student(student_id)
-        
+        self._with_student(student_id, lambda student: self._fill_form(student_id, student))
+    
+    def _fill_form(self, student_id: str, student: Optional[StudentProfile]):
+        """Tk thread: show a loaded profile in the form."""
         if not student:
             messagebox.showerror("Error", f"Student {student_id} not found")
             return
@@ -736,72 +897,221 @@ class FYPRecommenderGUI:
         self.max_hours_var.set(student.max_weekly_hours)
         self.team_size_var.set(student.team_size_preference)
         
-        # Load skills
-        for skill_name, level in student.skills.items():
-            self.skills_listbox.insert(tk.END, f"{skill_name} ({level.name})")
-        
-        # Load interests
-        for interest_name, level in student.interests.items():
-            self.interests_listbox.insert(tk.END, f"{interest_name} ({level.name})")
-        
-        # Load courses
-        for course in student.completed_courses:
-            self.courses_listbox.insert(tk.END, course)
-        
-        # Load domains
-        for domain in student.preferred_domains:
-            self.domains_listbox.insert(tk.END, domain)
+        # Load skills, interests, courses and domains
+        self._skills.extend((skill_name, level.name) for skill_name, level in student.skills.items())
+        self._interests.extend((interest_name, level.name) for interest_name, level in student.interests.items())
+        self._courses.extend(student.completed_courses)
+        self._domains.extend(student.preferred_domains)
+        self._redraw_skills()
+        self._redraw_interests()
+        self._redraw_listbox(self.courses_listbox, self._courses)
+        self._redraw_listbox(self.domains_listbox, self._domains)
         
         self.current_student = student
         self.status_var.set(f"✓ Loaded student: {student.name}")
     
+    def _with_student(self, student_id: str, callback: Callable[[Optional[StudentProfile]], None]):
+        """
+        Pass the full profile for an ID (None if there is none) to callback on the Tk thread,
+        directly if already held, else once the storage worker has read it.
+        """
+        student = self._cached_student(student_id)
+        if student is not None:
+            callback(student)
+            return
+        
+        def loaded(future: Future):
+            try:
+                version, student = future.result()
+            except Exception as e:
+                version, student = None, None
+                print(f"Error loading student: {e}")
+            if student is not None:
+                self._remember_student(student, version)
+            callback(student)
+        
+        self._submit(self._read_student, student_id, on_done=loaded)
+    
+    def _cached_student(self, student_id: str) -> Optional[StudentProfile]:
+        """Profile held for an ID, or None; everything held is dropped once the file changes."""
+        version = self.storage_manager.students_version()
+        if version != self._profiles_version:
+            self._profiles.clear()
+            self._profiles_version = version
+        return self._profiles.get(student_id)
+    
+    def _remember_student(self, student: StudentProfile, version: Optional[tuple] = None,
+                          saved: bool = False):
+        """
+        Hold a profile read at the given students file version, or one this app just saved
+        (the other held profiles are still current after our own write).
+        """
+        current = self.storage_manager.students_version()
+        if saved:
+            self._profiles_version = current
+        elif version != current:
+            # Read before the file last changed; it may be stale
+            return
+        self._cached_student(student.student_id)
+        self._profiles[student.student_id] = student
+    
+    def _read_student(self, student_id: str) -> tuple:
+        """Worker thread: (students file version, profile or None) for an ID."""
+        version = self.storage_manager.students_version()
+        return version, self.storage_manager.load_student(student_id)
+    
     def _refresh_student_list(self):
         """Refresh the student list in View Students tab."""
-        # Clear existing items
-        for item in self.students_tree.get_children():
-            self.students_tree.delete(item)
-        
-        # Load all students
-        students = self.storage_manager.load_all_students()
-        
-        for student in students.values():
-            self.students_tree.insert("", tk.END, values=(
-                student.student_id,
-                student.name,
-                student.major,
-                f"{student.cgpa:.2f}",
-                student.year
-            ))
-        
-        # Update recommendation combo
-        student_list = [f"{s.student_id} - {s.name}" for s in students.values()]
-        self.rec_student_combo['values'] = student_list
-        self.history_filter_combo['values'] = student_list
+        self.status_var.set("⏳ Loading students...")
+        self._submit(self._read_student_rows, on_done=self._show_student_list)
+    
+    @staticmethod
+    def _student_row(student: StudentProfile) -> tuple:
+        """View Students row for a profile: (id, name, major, cgpa, year)."""
+        return (student.student_id, student.name, student.major, f"{student.cgpa:.2f}", student.year)
+    
+    def _read_student_rows(self) -> tuple:
+        """Worker thread: load all students as parallel (ids, rows, search keys, combobox labels)."""
+        # Only the summary index is read, already sorted by ID; full profiles load on demand
+        rows = [
+            (s["student_id"], s["name"], s["major"], f"{s['cgpa']:.2f}", s["year"])
+            for s in self.storage_manager.load_student_index()
+        ]
+        ids = [row[0] for row in rows]
+        search_keys = ["\0".join(row[:3]).casefold() for row in rows]
+        labels = [f"{row[0]} - {row[1]}" for row in rows]
+        return ids, rows, search_keys, labels
+    
+    def _show_student_list(self, future: Future):
+        """Tk thread: install freshly loaded student rows."""
+        try:
+            (self._student_ids, self._all_students,
+             self._search_keys, self._student_labels) = future.result()
+        except Exception as e:
+            self.status_var.set(f"❌ Error loading students: {e}")
+            return
         
-        self.status_var.set(f"✓ Loaded {len(students)} students")
+        self._sync_student_widgets()
+        self.status_var.set(f"✓ Loaded {len(self._all_students)} students")
+    
+    def _upsert_student(self, student: StudentProfile):
+        """Insert or replace one student in the sorted lists, without reloading the file."""
+        row = self._student_row(student)
+        i = bisect_left(self._student_ids, student.student_id)
+        entry = (row, "\0".join(row[:3]).casefold(), f"{student.student_id} - {student.name}")
+        if i < len(self._student_ids) and self._student_ids[i] == student.student_id:
+            self._all_students[i], self._search_keys[i], self._student_labels[i] = entry
+        else:
+            self._student_ids.insert(i, student.student_id)
+            self._all_students.insert(i, entry[0])
+            self._search_keys.insert(i, entry[1])
+            self._student_labels.insert(i, entry[2])
+        self._sync_student_widgets()
+    
+    def _remove_student(self, student_id: str):
+        """Drop one student from the sorted lists, without reloading the file."""
+        i = bisect_left(self._student_ids, student_id)
+        if i < len(self._student_ids) and self._student_ids[i] == student_id:
+            for column in (self._student_ids, self._all_students, self._search_keys, self._student_labels):
+                del column[i]
+            self._sync_student_widgets()
+    
+    def _sync_student_widgets(self):
+        """Push the student lists to the widgets of tabs that have been built."""
+        # The rest read the lists when they are built
+        if hasattr(self, 'students_tree'):
+            self._apply_student_filter(incremental=False)
+        if hasattr(self, 'rec_student_combo'):
+            self.rec_student_combo['values'] = self._student_labels
+        if hasattr(self, 'history_filter_combo'):
+            self.history_filter_combo['values'] = self._student_labels
+    
+    def _schedule_filter(self):
+        """Debounce search keystrokes so filtering runs once typing pauses."""
+        if self._filter_job is not None:
+            self.root.after_cancel(self._filter_job)
+        self._filter_job = self.root.after(120, self._filter_students)
     
     def _filter_students(self):
         """Filter students based on search text."""
-        search_text = self.search_var.get().lower()
-        
-        # Clear existing items
-        for item in self.students_tree.get_children():
-            self.students_tree.delete(item)
-        
-        # Load and filter students
-        students = self.storage_manager.load_all_students()
-        
-        for student in students.values():
-            if (search_text in student.student_id.lower() or 
-                search_text in student.name.lower() or
-                search_text in student.major.lower()):
-                self.students_tree.insert("", tk.END, values=(
-                    student.student_id,
-                    student.name,
-                    student.major,
-                    f"{student.cgpa:.2f}",
-                    student.year
-                ))
+        self._filter_job = None
+        self._apply_student_filter()
+    
+    def _apply_student_filter(self, incremental: bool = True):
+        """Select the rows matching the search text and show the first window of them."""
+        search_text = self.search_var.get().casefold()
+        
+        # A query that extends the previous one can only match a subset of its rows
+        if incremental and search_text.startswith(self._last_query):
+            candidates = self._last_matches
+        else:
+            candidates = range(len(self._all_students))
+        
+        keys = self._search_keys
+        self._last_matches = [i for i in candidates if search_text in keys[i]]
+        self._last_query = search_text
+        self._shown_students = [self._all_students[i] for i in self._last_matches]
+        self._first_visible = 0
+        self._render_student_window()
+    
+    def _render_student_window(self):
+        """Insert only the rows that fit in the Treeview viewport and sync the scrollbar."""
+        rows = self._shown_students
+        self._first_visible = max(0, min(self._first_visible, len(rows) - self._visible_rows))
+        window = rows[self._first_visible:self._first_visible + self._visible_rows]
+        
+        # Diff against the rows already in the Treeview: scrolling by a row or narrowing the
+        # search only touches the rows that changed, and kept rows keep their selection
+        tree = self.students_tree
+        rendered = self._rendered_rows
+        wanted = {row[0] for row in window}
+        stale = [iid for iid in rendered if iid not in wanted]
+        if stale:
+            tree.delete(*stale)
+            for iid in stale:
+                del rendered[iid]
+        
+        # Kept rows are already in window order, so inserting each new row at its index places it
+        for index, row in enumerate(window):
+            previous = rendered.get(row[0])
+            if previous is None:
+                tree.insert("", index, iid=row[0], values=row)
+            elif previous != row:
+                tree.item(row[0], values=row)
+            rendered[row[0]] = row
+        
+        if rows:
+            self.students_scroll.set(self._first_visible / len(rows),
+                                     (self._first_visible + len(window)) / len(rows))
+        else:
+            self.students_scroll.set(0.0, 1.0)
+    
+    def _scroll_students(self, *args):
+        """Scrollbar command: move the virtual window instead of scrolling Treeview items."""
+        if args[0] == "moveto":
+            self._first_visible = int(float(args[1]) * len(self._shown_students))
+        elif args[0] == "scroll":
+            step = self._visible_rows if args[2] == "pages" else 1
+            self._first_visible += int(args[1]) * step
+        self._render_student_window()
+    
+    def _on_students_wheel(self, event):
+        """Scroll the virtual window with the mouse wheel."""
+        if event.num == 4 or event.delta > 0:
+            self._first_visible -= 3
+        else:
+            self._first_visible += 3
+        self._render_student_window()
+        return "break"
+    
+    def _on_students_resize(self, event):
+        """Recompute how many rows fit when the Treeview is resized."""
+        row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        # One row's worth of height goes to the column headings
+        visible_rows = max(1, event.height // row_height - 1)
+        if visible_rows != self._visible_rows:
+            self._visible_rows = visible_rows
+            self._render_student_window()
     
     def _view_student_details(self):
         """View detailed information about selected student."""
@@ -810,12 +1120,23 @@ class FYPRecommenderGUI:
             messagebox.showwarning("Warning", "Please select a student")
             return
         
-        item = self.students_tree.item(selection[0])
-        student_id = item['values'][0]
-        
-        student = self.storage_manager.load_student(student_id)
+        # Rows are inserted with the student ID as their item ID
+        self._with_student(selection[0], self._show_student_details)
+    
+    def _show_student_details(self, student: Optional[StudentProfile]):
+        """Tk thread: open the details window for a loaded profile."""
         if not student:
             return
+        student_id = student.student_id
+        
+        # Reuse the text rendered for this exact profile last time
+        fingerprint = self._student_fingerprint(student)
+        cached = self._details_cache.get(student_id)
+        if cached is not None and cached[0] == fingerprint:
+            details = cached[1]
+        else:
+            details = self._format_student_details(student)
+            self._details_cache[student_id] = (fingerprint, details)
         
         # Create details window
         details_window = tk.Toplevel(self.root)
@@ -823,48 +1144,50 @@ class FYPRecommenderGUI:
         details_window.geometry("700x600")
         details_window.configure(bg=self.COLORS['bg'])
         
-        text = scrolledtext.ScrolledText(details_window, wrap=tk.WORD, font=("Consolas", 11),
+        text = scrolledtext.ScrolledText(details_window, wrap=tk.WORD, font=self.FONTS['mono'],
                                         bg=self.COLORS['white'], fg=self.COLORS['text'])
         text.pack(fill=tk.BOTH, expand=True, padx=15, pady=15)
         
-        # Format details
-        details = f"""
-STUDENT PROFILE
-{'=' * 70}
-
-Basic Information:
-  Student ID: {student.student_id}
-  Name: {student.name}
-  Major: {student.major}
-  CGPA: {student.cgpa:.2f}
-  Year: {student.year}
-
-Skills:
-"""
-        for skill, level in student.skills.items():
-            details += f"  • {skill}: {level.name}\n"
-        
-        details += "\nInterests:\n"
-        for interest, level in student.interests.items():
-            details += f"  • {interest}: {level.name}\n"
-        
-        details += "\nCompleted Courses:\n"
-        for course in sorted(student.completed_courses):
-            details += f"  • {course}\n"
-        
-        details += f"\nPreferred Domains:\n"
-        for domain in student.preferred_domains:
-            details += f"  • {domain}\n"
-        
-        details += f"""
-Preferences:
-  Max Weekly Hours: {student.max_weekly_hours}
-  Team Size Preference: {student.team_size_preference}
-"""
-        
         text.insert(1.0, details)
         text.config(state=tk.DISABLED)
     
+    def _format_student_details(self, student: StudentProfile) -> str:
+        """Text shown in the student details window."""
+        parts = [
+            "",
+            "STUDENT PROFILE",
+            "=" * 70,
+            "",
+            "Basic Information:",
+            f"  Student ID: {student.student_id}",
+            f"  Name: {student.name}",
+            f"  Major: {student.major}",
+            f"  CGPA: {student.cgpa:.2f}",
+            f"  Year: {student.year}",
+            "",
+            "Skills:",
+        ]
+        parts.extend(f"  • {skill}: {level.name}" for skill, level in student.skills.items())
+        
+        parts.extend(("", "Interests:"))
+        parts.extend(f"  • {interest}: {level.name}" for interest, level in student.interests.items())
+        
+        parts.extend(("", "Completed Courses:"))
+        parts.extend(f"  • {course}" for course in sorted(student.completed_courses))
+        
+        parts.extend(("", "Preferred Domains:"))
+        parts.extend(f"  • {domain}" for domain in student.preferred_domains)
+        
+        parts.extend((
+            "",
+            "Preferences:",
+            f"  Max Weekly Hours: {student.max_weekly_hours}",
+            f"  Team Size Preference: {student.team_size_preference}",
+            "",
+        ))
+        details = "\n".join(parts)
+        return details
+    
     def _edit_student(self):
         """Edit selected student."""
         selection = self.students_tree.selection()
@@ -872,8 +1195,7 @@ Preferences:
             messagebox.showwarning("Warning", "Please select a student")
             return
         
-        item = self.students_tree.item(selection[0])
-        student_id = item['values'][0]
+        student_id = selection[0]
         
         # Switch to Add/Edit tab and load student
         self.notebook.select(0)
@@ -887,15 +1209,29 @@ Preferences:
             return
         
         item = self.students_tree.item(selection[0])
-        student_id = item['values'][0]
+        student_id = selection[0]
         student_name = item['values'][1]
         
         if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete {student_name}?"):
-            if self.storage_manager.delete_student(student_id):
-                messagebox.showinfo("Success", f"✓ Student {student_name} deleted")
-                self._refresh_student_list()
-            else:
-                messagebox.showerror("Error", "Failed to delete student")
+            self._submit(self.storage_manager.delete_student, student_id,
+                         on_done=lambda future: self._on_student_deleted(future, student_id, student_name))
+    
+    def _on_student_deleted(self, future: Future, student_id: str, student_name: str):
+        """Tk thread: report a student deletion and drop the student from the views."""
+        try:
+            deleted = future.result()
+        except Exception as e:
+            deleted = False
+            print(f"Error deleting student: {e}")
+        
+        if deleted:
+            self._invalidate_recommendations(student_id)
+            self._details_cache.pop(student_id, None)
+            self._profiles.pop(student_id, None)
+            messagebox.showinfo("Success", f"✓ Student {student_name} deleted")
+            self._remove_student(student_id)
+        else:
+            messagebox.showerror("Error", "Failed to delete student")
     
     def _generate_recommendations(self):
         """Generate recommendations for selected student."""
@@ -907,35 +1243,101 @@ Preferences:
         
         # Extract student ID
         student_id = student_info.split(" - ")[0]
-        student = self.storage_manager.load_student(student_id)
+        count = self.rec_count_var.get()
+        
+        self._clear_recommendations()
+        self.rec_summary_var.set("⏳ Generating recommendations...")
+        
+        # A profile already read this session is used as-is; otherwise it is read off the Tk thread
+        student = self._cached_student(student_id)
+        if student is not None:
+            self._start_recommendations(student, count)
+            return
+        self._submit(self._read_student, student_id,
+                     on_done=lambda future: self._on_rec_student_loaded(future, count))
+    
+    def _on_rec_student_loaded(self, future: Future, count: int):
+        """Tk thread: hold the loaded student and start on its recommendations."""
+        try:
+            version, student = future.result()
+        except Exception as e:
+            student = None
+            print(f"Error loading student: {e}")
         
         if not student:
+            self.rec_summary_var.set("")
             messagebox.showerror("Error", "Student not found")
             return
         
-        # Generate recommendations
-        self.rec_text.delete(1.0, tk.END)
-        self.rec_text.insert(1.0, "⏳ Generating recommendations...\n\n")
-        self.root.update()
+        self._remember_student(student, version)
+        self._start_recommendations(student, count)
+    
+    def _start_recommendations(self, student: StudentProfile, count: int):
+        """Tk thread: show a cached report for the student or start generating one."""
+        key = (student.student_id, self._student_fingerprint(student), count, self._selections_version())
+        recommendations = self._rec_cache.get(key)
+        if recommendations is not None:
+            self._rec_cache.move_to_end(key)
+            # Same profile and count as an earlier run: reuse its results
+            self._show_recommendations(student, recommendations)
+            return
         
+        self._submit(self.recommender.get_raw_recommendations, student, count,
+                     on_done=lambda future: self._on_report_ready(future, student, key),
+                     executor=self._rec_executor)
+    
+    def _on_report_ready(self, future: Future, student: StudentProfile, key: tuple):
+        """Tk thread: display and cache generated recommendations."""
         try:
-            report = self.recommender.get_recommendations_for_student(
-                student, 
-                top_n=self.rec_count_var.get()
-            )
-            
-            self.rec_text.delete(1.0, tk.END)
-            self.rec_text.insert(1.0, report)
-            
-            self.status_var.set(f"✓ Generated recommendations for {student.name}")
-            
-            # Store current recommendations for saving
-            self.current_recommendations = report
-            self.current_rec_student = student
-        
+            recommendations = future.result()
         except Exception as e:
-            self.rec_text.delete(1.0, tk.END)
-            self.rec_text.insert(1.0, f"❌ Error generating recommendations:\n{str(e)}")
+            self.rec_summary_var.set(f"❌ Error generating recommendations: {str(e)}")
+            return
+        
+        self._rec_cache[key] = recommendations
+        if len(self._rec_cache) > _REC_CACHE_SIZE:
+            self._rec_cache.popitem(last=False)
+        self._show_recommendations(student, recommendations)
+    
+    def _show_recommendations(self, student: StudentProfile, recommendations: List):
+        """Fill the results table and remember the recommendations for saving."""
+        self._clear_recommendations()
+        for rank, rec in enumerate(recommendations, 1):
+            self.rec_tree.insert('', tk.END, values=(
+                rank, rec.topic.title, rec.topic.domain, f"{rec.score:.2f}",
+                rec.risk_level, "; ".join(rec.match_reasons)
+            ))
+        
+        if not recommendations:
+            summary = f"No suitable topics found for {student.name}. Please broaden your interests or acquire more skills."
+        else:
+            summary = f"{len(recommendations)} recommendations for {student.name} ({student.major}, CGPA {student.cgpa})"
+            if any("ML Fallback" in rec.risk_level for rec in recommendations):
+                summary += " — ℹ️ ML fallback used, some constraints relaxed"
+        self.rec_summary_var.set(summary)
+        
+        self.status_var.set(f"✓ Generated recommendations for {student.name}")
+        
+        # Store current recommendations for saving
+        self.current_recommendations = recommendations
+        self.current_rec_student = student
+    
+    def _clear_recommendations(self):
+        """Empty the results table."""
+        self.rec_tree.delete(*self.rec_tree.get_children())
+    
+    def _student_fingerprint(self, student: StudentProfile) -> str:
+        """Short hash of everything in a profile that affects its recommendations."""
+        return self.storage_manager.student_fingerprint(student)
+    
+    def _selections_version(self) -> int:
+        """Change counter of the topic selections; taken topics drop out of results."""
+        return self.recommender.topic_tracker.version()
+    
+    def _invalidate_recommendations(self, student_id: str):
+        """Drop cached recommendations for a student whose profile changed or was removed."""
+        for key in [key for key in self._rec_cache if key[0] == student_id]:
+            del self._rec_cache[key]
     
     def _save_to_history(self):
         """Save current recommendations to history."""
@@ -943,45 +1345,173 @@ Preferences:
             messagebox.showwarning("Warning", "No recommendations to save")
             return
         
+        student = self.current_rec_student
+        recommendations = [
+            {'topic_id': rec.topic.id, 'title': rec.topic.title, 'score': float(rec.score)}
+            for rec in self.current_recommendations
+        ]
+        ml_used = any("ML Fallback" in rec.risk_level for rec in self.current_recommendations)
+        
+        # Render the table cells now so showing the history only inserts them
+        rendered = {
+            'version': _HISTORY_ROW_VERSION,
+            'cells': self._history_cells(student.student_id, student.name, ml_used, recommendations),
+        }
+        self._submit(self.storage_manager.add_history_entry, student.student_id, student.name,
+                     recommendations, ml_used, rendered=rendered, on_done=self._on_history_saved)
+    
+    def _on_history_saved(self, future: Future):
+        """Tk thread: report the outcome of a history save."""
+        try:
+            entry = future.result()
+        except Exception as e:
+            entry = None
+            print(f"Error saving recommendation: {e}")
+        
+        if entry is None:
+            messagebox.showerror("Error", "Failed to save recommendations to history")
+            return
+        
         messagebox.showinfo("Info", "✓ Recommendations saved to history")
-        self._load_history()
+        if hasattr(self, 'history_tree'):
+            view = self._history_view
+            if self._history_job is not None:
+                # Older rows are still being streamed in, so there is nothing to append to yet
+                self._load_history(view[0] if view is not None else None)
+            elif view is not None and view[0] in (None, entry['student_id']):
+                # The table is fully shown and the entry belongs in it: add just this row
+                self._append_history([entry], view[1], view[0])
+            elif view is None:
+                self._load_history()
         self.status_var.set("✓ Saved to history")
     
     def _load_history(self, student_id: Optional[str] = None):
         """Load recommendation history."""
-        self.history_text.delete(1.0, tk.END)
+        self._stop_history_stream()
+        self.status_var.set("⏳ Loading history...")
+        self._submit(self.storage_manager.load_recommendation_history, student_id,
+                     on_done=lambda future: self._show_history(future, student_id))
+    
+    def _stop_history_stream(self):
+        """Cancel a history load still being streamed in; the table then needs a full reload."""
+        if self._history_job is not None:
+            self.root.after_cancel(self._history_job)
+            self._history_job = None
+            self._history_view = None
+    
+    @staticmethod
+    def _history_marker(entry: Dict) -> tuple:
+        """Identifies an entry well enough to tell whether the history was rewritten."""
+        return (entry.get('id'), entry['timestamp'])
+    
+    def _show_history(self, future: Future, student_id: Optional[str]):
+        """Tk thread: show a loaded history, appending only new entries when possible."""
+        # A newer load may have finished first; its stream gives way to this one
+        self._stop_history_stream()
         
-        history = self.storage_manager.load_recommendation_history(student_id)
+        try:
+            history = future.result()
+        except Exception as e:
+            self.status_var.set(f"❌ Error loading history: {str(e)}")
+            return
         
-        if not history:
-            self.history_text.insert(1.0, "No recommendation history found.")
+        # History is append-only between clears: if the table shows a prefix of this
+        # history for the same filter, only the newer entries need rendering
+        view = self._history_view
+        if (view is not None and view[0] == student_id and view[1] <= len(history)
+                and len(history) - view[1] <= _HISTORY_CHUNK
+                and (view[1] == 0 or self._history_marker(history[view[1] - 1]) == view[2])):
+            self._append_history(history[view[1]:], view[1], student_id)
             return
         
-        output = "RECOMMENDATION HISTORY\n"
-        output += "=" * 90 + "\n\n"
+        self.history_tree.delete(*self.history_tree.get_children())
+        self._history_view = (student_id, len(history),
+                              self._history_marker(history[-1]) if history else None)
         
-        for i, entry in enumerate(reversed(history), 1):
-            output += f"Entry #{i}\n"
-            output += f"Date: {entry['timestamp']}\n"
-            output += f"Student: {entry['student_name']} ({entry['student_id']})\n"
-            output += f"ML Used: {'Yes' if entry.get('ml_used', False) else 'No'}\n"
-            output += f"Recommendations: {len(entry['recommendations'])}\n"
-            
-            for rec in entry['recommendations']:
-                output += f"  • {rec.get('title', 'N/A')} (Score: {rec.get('score', 0):.2f})\n"
-            
-            output += "\n" + "-" * 90 + "\n\n"
+        if not history:
+            self.status_var.set("No recommendation history found.")
+            return
         
-        self.history_text.insert(1.0, output)
-        self.status_var.set(f"✓ Loaded {len(history)} history entries")
+        self._history_entries = enumerate(reversed(history), 1)
+        self._history_total = len(history)
+        self._pump_history()
+    
+    def _append_history(self, new_entries: List[Dict], shown: int, student_id: Optional[str]):
+        """Insert entries saved after the `shown` ones above the rows already in the table."""
+        total = shown + len(new_entries)
+        tree = self.history_tree
+        # Newest first: each later entry goes above the one before it
+        for k, entry in enumerate(new_entries, shown):
+            tree.insert('', 0, iid=str(k), values=self._history_row(total - k, entry))
+        
+        # Older rows keep their cells; only their entry number moves down
+        if new_entries:
+            for k in range(shown):
+                tree.set(str(k), "#", total - k)
+            self._history_view = (student_id, total, self._history_marker(new_entries[-1]))
+        self.status_var.set(f"✓ Loaded {total} history entries")
+    
+    def _pump_history(self):
+        """Insert the next chunk of history rows, then let Tk paint and handle input."""
+        # Format the whole chunk first, then insert it in one tight loop with no Tk
+        # calls in between; Tk lays the rows out once, at idle
+        total = self._history_total
+        rows = [self._history_row(i, entry) for i, entry in islice(self._history_entries, _HISTORY_CHUNK)]
+        insert = self.history_tree.insert
+        for row in rows:
+            # Item IDs are positions in the loaded history, so later loads can address rows
+            insert('', tk.END, iid=str(total - row[0]), values=row)
+        shown = rows[-1][0] if rows else 0
+        
+        if shown and shown < self._history_total:
+            self.status_var.set(f"⏳ Loading history... {shown}/{self._history_total}")
+            self._history_job = self.root.after_idle(self._pump_history)
+        else:
+            self._history_job = None
+            self.status_var.set(f"✓ Loaded {self._history_total} history entries")
+    
+    def _history_row(self, number: int, entry: Dict) -> tuple:
+        """Table values for one history entry, using the cells rendered when it was saved."""
+        rendered = entry.get('rendered')
+        if rendered and rendered.get('version') == _HISTORY_ROW_VERSION:
+            cells = rendered['cells']
+        else:
+            cells = self._history_cells(entry['student_id'], entry['student_name'],
+                                        entry.get('ml_used', False), entry['recommendations'])
+        return (number, entry['timestamp'], *cells)
+    
+    def _history_cells(self, student_id: str, student_name: str, ml_used: bool,
+                       recommendations: List[Dict]) -> List:
+        """Student, ML, count and topics cells of a history row."""
+        topics = "; ".join(
+            f"{rec.get('title', 'N/A')} ({rec.get('score', 0):.2f})" for rec in recommendations
+        )
+        return [
+            f"{student_name} ({student_id})",
+            'Yes' if ml_used else 'No',
+            len(recommendations),
+            topics,
+        ]
     
     def _clear_history(self):
         """Clear all recommendation history."""
         if messagebox.askyesno("Confirm", "Are you sure you want to clear all history?"):
-            self.storage_manager.clear_history()
-            self._load_history()
+            self._submit(self.storage_manager.clear_history, on_done=self._on_history_cleared)
+    
+    def _on_history_cleared(self, future: Future):
+        """Tk thread: report clearing the history and reload the (now empty) table."""
+        try:
+            cleared = future.result()
+        except Exception as e:
+            cleared = False
+            print(f"Error clearing history: {e}")
+        
+        self._load_history()
+        if cleared:
             messagebox.showinfo("Success", "✓ History cleared")
             self.status_var.set("✓ History cleared")
+        else:
+            messagebox.showerror("Error", "Failed to clear history")
     
     def _export_data(self):
         """Export all data to file."""
@@ -1,17 +1,33 @@
-from typing import List, Dict, Tuple
-from student_profile import StudentProfile, Proficiency
-from knowledge_base import TopicTemplate, TopicRequirement
+from typing import List, Dict, Optional, Tuple
+import numpy as np
+from student_profile import StudentProfile, Proficiency, PROFICIENCY_NAMES
+from knowledge_base import KnowledgeBase, TopicTemplate, TopicRequirement
+from scoring_kernels import pack_bits
 
 class InferenceEngine:
     """
     Rule-based engine to check constraints and evaluate feasibility.
     """
 
+    def check_hard_constraints_fast(self, student: StudentProfile, topic: TopicTemplate) -> bool:
+        """
+        Pass/fail only version of check_hard_constraints.
+        Cheapest comparisons first; returns on the first failure without building reasons.
+        """
+        reqs = topic.requirements
+        return (student.cgpa >= reqs.min_cgpa
+                and student.team_size_preference >= reqs.team_size_min
+                and student.max_weekly_hours >= reqs.estimated_weekly_hours
+                and reqs.required_courses <= student.completed_courses)
+
     def check_hard_constraints(self, student: StudentProfile, topic: TopicTemplate) -> Tuple[bool, List[str]]:
         """
         Checks necessary conditions for a topic.
         Returns (passed, list of failure reasons).
         """
+        if self.check_hard_constraints_fast(student, topic):
+            return (True, [])
+        
         reasons = []
         reqs = topic.requirements
 
@@ -34,6 +50,21 @@ class InferenceEngine:
 
         return (len(reasons) == 0, reasons)
 
+    def hard_constraint_mask(self, student: StudentProfile, kb: KnowledgeBase) -> np.ndarray:
+        """
+        Batched check_hard_constraints over every topic in kb.topic_list.
+        Returns a boolean array, True where the topic passes; reasons are not built.
+        """
+        passed = student.cgpa >= kb.topic_min_cgpa
+        passed &= student.team_size_preference >= kb.topic_team_min
+        passed &= student.max_weekly_hours >= kb.topic_hours
+        
+        # Topics requiring a course outside the student's completed set fail
+        have = pack_bits((col for col in map(kb.course_index.get, student.completed_courses)
+                          if col is not None), len(kb.course_index))
+        passed &= ~np.any(kb.topic_course_bits & ~have, axis=1)
+        return passed
+
     def evaluate_technical_feasibility(self, student: StudentProfile, topic: TopicTemplate) -> Tuple[float, List[str]]:
         """
         Calculates a feasibility score (0.0 - 1.0) based on skills.
@@ -46,31 +77,39 @@ class InferenceEngine:
         total_weight = 0
         matched_weight = 0
         gaps = []
+        
+        # Student skill keys are stored lowercased, as are the KB's skill names; only a
+        # miss needs get_skill_level's lowercasing
+        skills = student.skills
 
         for skill, min_level_val in req_skills.items():
             total_weight += min_level_val
-            student_level = student.get_skill_level(skill)
+            level = skills.get(skill)
+            student_level = (level or student.get_skill_level(skill)).value
             
-            if student_level.value >= min_level_val:
+            if student_level >= min_level_val:
                 matched_weight += min_level_val
             else:
                 # Partial credit? No, strict penalty for feasibility, but we track the gap
                 # Let's give partial credit for being close
-                matched_weight += student_level.value * 0.5
-                gaps.append(f"Skill '{skill}' level {student_level.name} < required {Proficiency(min_level_val).name}")
+                matched_weight += student_level * 0.5
+                gaps.append(f"Skill '{skill}' level {PROFICIENCY_NAMES[student_level]} < required {PROFICIENCY_NAMES[min_level_val]}")
 
         score = matched_weight / total_weight if total_weight > 0 else 1.0
         return score, gaps
 
-    def assess_risk(self, student: StudentProfile, topic: TopicTemplate) -> Tuple[str, List[str]]:
+    def assess_risk(self, student: StudentProfile, topic: TopicTemplate,
+                    feasibility_score: Optional[float] = None) -> Tuple[str, List[str]]:
         """
         Determines risk level: 'Low', 'Medium', 'High'.
+        feasibility_score may be passed in from a batched evaluation of the whole catalog;
+        the skills are then only walked again to describe gaps when there are some to report.
         """
         risk_level = "Low"
         reasons = []
 
         # 1. Domain experience
-        if topic.domain.lower() not in student.interests:
+        if topic.domain_key not in student.interests:
              reasons.append(f"No prior interest expressed in domain '{topic.domain}'")
              risk_level = "Medium"
 
@@ -80,7 +119,10 @@ class InferenceEngine:
             risk_level = "High"
 
         # 3. Technical Feasibility Check
-        feasibility_score, skill_gaps = self.evaluate_technical_feasibility(student, topic)
+        if feasibility_score is None:
+            feasibility_score, skill_gaps = self.evaluate_technical_feasibility(student, topic)
+        elif feasibility_score < 0.8:
+            skill_gaps = self.evaluate_technical_feasibility(student, topic)[1]
         if feasibility_score < 0.6:
             risk_level = "High"
             reasons.extend(["Significant skill gaps:"] + skill_gaps)
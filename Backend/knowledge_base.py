@@ -1,20 +1,60 @@
-from typing import List, Dict, Set, Any, Tuple
+from typing import List, Dict, FrozenSet, Iterator, Set, Any, Tuple
 from dataclasses import dataclass, field
-from itertools import product
+from itertools import compress, product
+from functools import lru_cache
+import os
+import pickle
 import random
+import sys
+import numpy as np
+from scoring_kernels import pack_bits
 
-@dataclass
-class TopicRequirement:
+# Difficulty label -> code stored in KnowledgeBase.topic_difficulty (unknown labels map to 0)
+DIFFICULTY_CODES = {"Beginner": 0, "Intermediate": 1, "Advanced": 2}
+
+# (domain, technique) pairs that never make sense together
+_INCOMPATIBLE_DT = frozenset({
+    ("Game Development", "Blockchain"),
+    ("Cybersecurity", "Augmented Reality"),
+    ("IoT", "Natural Language Processing"),
+})
+
+# Contexts a technique does not work with
+_BLOCKED_TC = {
+    "Blockchain": frozenset({"Entertainment Platform", "Education System"}),
+    "Augmented Reality": frozenset({"Financial Services", "Supply Chain Management"}),
+}
+
+class _SlotState:
+    """
+    Pickle support for the slotted dataclasses below. Restores both slotted state and
+    the attribute dicts of instances pickled before the classes used __slots__
+    (e.g. the topics saved in an existing ML model).
+    """
+    __slots__ = ()
+
+    def __setstate__(self, state):
+        if isinstance(state, tuple):
+            # (instance dict, slot values) as produced for slotted instances
+            state = state[1] or {}
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+        post_init = getattr(self, '__post_init__', None)
+        if post_init is not None:
+            post_init()
+
+@dataclass(slots=True)
+class TopicRequirement(_SlotState):
     """Requirements for a specific FYP topic."""
     required_skills: Dict[str, int]  # Skill name -> Min proficiency value (1-4)
     min_cgpa: float
-    required_courses: Set[str]
+    required_courses: FrozenSet[str]
     team_size_min: int
     team_size_max: int
     estimated_weekly_hours: int
 
-@dataclass
-class TopicTemplate:
+@dataclass(slots=True)
+class TopicTemplate(_SlotState):
     """Template for a Final Year Project topic."""
     id: str
     title: str
@@ -24,19 +64,29 @@ class TopicTemplate:
     context: str  # NEW: The application context/constraint
     difficulty: str
     requirements: TopicRequirement
-    risk_factors: List[str]
-    keywords: List[str]
+    risk_factors: Tuple[str, ...]
+    keywords: Tuple[str, ...]
+    # Lowercased domain, the form student interests and preferences are keyed by
+    domain_key: str = field(init=False, repr=False, compare=False)
 
-@dataclass
-class DomainInfo:
+    def __post_init__(self):
+        self.domain_key = sys.intern(self.domain.lower())
+
+@dataclass(slots=True)
+class DomainInfo(_SlotState):
     """Information about a project domain."""
     name: str
     base_skills: Dict[str, int]  # Skills common to this domain
     base_courses: List[str]
     description: str
+    complexity: str = "Medium"  # 'Medium' or 'High', as reported by get_domain_complexity
+    name_lower: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.name_lower = sys.intern(self.name.lower())
 
-@dataclass
-class TechniqueInfo:
+@dataclass(slots=True)
+class TechniqueInfo(_SlotState):
     """Information about a technique/technology."""
     name: str
     required_skills: Dict[str, int]  # Skills needed for this technique
@@ -45,15 +95,79 @@ class TechniqueInfo:
     estimated_hours: int
     risk_factors: List[str]
     description: str
+    name_lower: str = field(init=False, repr=False, compare=False)
+    description_lower: str = field(init=False, repr=False, compare=False)
 
-@dataclass
-class ContextInfo:
+    def __post_init__(self):
+        self.name_lower = sys.intern(self.name.lower())
+        self.description_lower = self.description.lower()
+
+@dataclass(slots=True)
+class ContextInfo(_SlotState):
     """Information about an application context/constraint."""
     name: str
     additional_skills: Dict[str, int]  # Extra skills for this context
     additional_courses: List[str]
     complexity_modifier: float  # Multiplier for difficulty (0.8-1.2)
     description: str
+    name_lower: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.name_lower = sys.intern(self.name.lower())
+
+# Title patterns per technique; {ctx} is replaced with the context name
+_TITLE_PATTERNS: Dict[str, Tuple[str, ...]] = {
+    "Machine Learning": (
+        "ML-Powered {ctx}",
+        "Intelligent {ctx}",
+        "{ctx} with Predictive Analytics"
+    ),
+    "Deep Learning": (
+        "Deep Learning-Based {ctx}",
+        "Neural {ctx}",
+        "AI-Driven {ctx}"
+    ),
+    "Computer Vision": (
+        "Vision-Based {ctx}",
+        "Image Recognition for {ctx}",
+        "Visual Intelligence in {ctx}"
+    ),
+    "Natural Language Processing": (
+        "NLP-Enhanced {ctx}",
+        "Language-Aware {ctx}",
+        "Text Analytics for {ctx}"
+    ),
+    "Blockchain": (
+        "Blockchain-Secured {ctx}",
+        "Decentralized {ctx}",
+        "Distributed Ledger for {ctx}"
+    ),
+    "Augmented Reality": (
+        "AR-Enhanced {ctx}",
+        "Augmented {ctx}",
+        "Mixed Reality {ctx}"
+    ),
+    "Microservices": (
+        "Microservices-Based {ctx}",
+        "Scalable {ctx} Architecture",
+        "Distributed {ctx}"
+    ),
+    "Real-time Systems": (
+        "Real-Time {ctx}",
+        "Live {ctx}",
+        "Instant {ctx} Processing"
+    ),
+    "Recommendation Systems": (
+        "Personalized {ctx}",
+        "Smart Recommendation for {ctx}",
+        "Adaptive {ctx}"
+    ),
+    "Chatbot Development": (
+        "Conversational {ctx}",
+        "Chatbot for {ctx}",
+        "AI Assistant for {ctx}"
+    ),
+}
 
 class KnowledgeBase:
     """
@@ -65,14 +179,31 @@ class KnowledgeBase:
         self.domains: Dict[str, DomainInfo] = {}
         self.techniques: Dict[str, TechniqueInfo] = {}
         self.contexts: Dict[str, ContextInfo] = {}
+        self._title_cache: Dict[Tuple[str, str], str] = {}
+        # Immutable pieces shared by every topic with equal content
+        self._risk_cache: Dict[Tuple[str, str], Tuple[str, ...]] = {}
+        self._course_sets: Dict[FrozenSet[str], FrozenSet[str]] = {}
+        # Topics by lowercased domain / technique / context, filled as topics are generated
+        self._by_domain: Dict[str, List[TopicTemplate]] = {}
+        self._by_technique: Dict[str, List[TopicTemplate]] = {}
+        self._by_context: Dict[str, List[TopicTemplate]] = {}
         self._initialize_knowledge()
         self._generate_all_topics()
+        self._build_topic_arrays()
 
     def _initialize_knowledge(self):
         """Initialize the knowledge catalogs."""
         self._init_domains()
         self._init_techniques()
         self._init_contexts()
+        self._context_index: Dict[str, int] = {name: i for i, name in enumerate(self.contexts)}
+        
+        # Validity of every (domain, technique, context) triple, one byte each in product order:
+        # index (domain_idx * n_techniques + technique_idx) * n_contexts + context_idx
+        self._valid_mask = bytes(
+            self._is_valid_combination(d, t, c)
+            for d, t, c in product(self.domains, self.techniques, self.contexts)
+        )
 
     def _init_domains(self):
         """Define project domains."""
@@ -99,7 +230,8 @@ class KnowledgeBase:
                 name="Artificial Intelligence",
                 base_skills={"python": 2, "mathematics": 2},
                 base_courses=["Artificial Intelligence", "Linear Algebra"],
-                description="Building intelligent systems and algorithms"
+                description="Building intelligent systems and algorithms",
+                complexity="High"
             ),
             "IoT": DomainInfo(
                 name="IoT",
@@ -111,7 +243,8 @@ class KnowledgeBase:
                 name="Cybersecurity",
                 base_skills={"networking": 2, "cryptography": 2},
                 base_courses=["Computer Networks", "Information Security"],
-                description="Security systems and threat detection"
+                description="Security systems and threat detection",
+                complexity="High"
             ),
             "Game Development": DomainInfo(
                 name="Game Development",
@@ -123,7 +256,8 @@ class KnowledgeBase:
                 name="Cloud Computing",
                 base_skills={"aws": 1, "docker": 2, "kubernetes": 1},
                 base_courses=["Distributed Systems"],
-                description="Cloud-based applications and services"
+                description="Cloud-based applications and services",
+                complexity="High"
             )
         }
 
@@ -334,106 +468,104 @@ class KnowledgeBase:
 
     def _is_valid_combination(self, domain: str, technique: str, context: str) -> bool:
         """Check if a domain+technique+context combination makes sense."""
-        # Define incompatible combinations
-        incompatible = {
-            ("Game Development", "Blockchain"),
-            ("Cybersecurity", "Augmented Reality"),
-            ("IoT", "Natural Language Processing"),
-        }
-        
-        if (domain, technique) in incompatible:
+        if (domain, technique) in _INCOMPATIBLE_DT:
             return False
         
         # Some contexts don't work with certain techniques
-        if technique == "Blockchain" and context in ["Entertainment Platform", "Education System"]:
-            return False
-        
-        if technique == "Augmented Reality" and context in ["Financial Services", "Supply Chain Management"]:
-            return False
-        
-        return True
+        return context not in _BLOCKED_TC.get(technique, ())
+
+    def _iter_combinations(self) -> Iterator[Tuple[DomainInfo, TechniqueInfo, ContextInfo]]:
+        """Yield every valid (domain, technique, context) combination, in catalog order."""
+        combos = product(self.domains.values(), self.techniques.values(), self.contexts.values())
+        return compress(combos, self._valid_mask)
 
     def _generate_all_topics(self):
         """Generate all valid topic combinations."""
-        topic_id = 1
+        # Bound once; the loop body runs for every topic
+        create_topic = self._create_topic
+        topics = self.topics
+        by_domain = self._by_domain.setdefault
+        by_technique = self._by_technique.setdefault
+        by_context = self._by_context.setdefault
         
-        for domain_name, domain_info in self.domains.items():
-            for technique_name, technique_info in self.techniques.items():
-                for context_name, context_info in self.contexts.items():
-                    
-                    # Check if combination is valid
-                    if not self._is_valid_combination(domain_name, technique_name, context_name):
-                        continue
-                    
-                    # Generate topic
-                    topic = self._create_topic(
-                        topic_id, domain_info, technique_info, context_info
-                    )
-                    self.topics[topic.id] = topic
-                    topic_id += 1
+        for topic_id, (domain_info, technique_info, context_info) in enumerate(self._iter_combinations(), 1):
+            topic = create_topic(topic_id, domain_info, technique_info, context_info)
+            topics[topic.id] = topic
+            by_domain(topic.domain_key, []).append(topic)
+            by_technique(technique_info.name_lower, []).append(topic)
+            by_context(context_info.name_lower, []).append(topic)
 
-    def _generate_title(self, technique: str, context: str) -> str:
-        """Generate varied, natural-sounding titles."""
-        # Define title patterns for different techniques
-        patterns = {
-            "Machine Learning": [
-                f"ML-Powered {context}",
-                f"Intelligent {context}",
-                f"{context} with Predictive Analytics"
-            ],
-            "Deep Learning": [
-                f"Deep Learning-Based {context}",
-                f"Neural {context}",
-                f"AI-Driven {context}"
-            ],
-            "Computer Vision": [
-                f"Vision-Based {context}",
-                f"Image Recognition for {context}",
-                f"Visual Intelligence in {context}"
-            ],
-            "Natural Language Processing": [
-                f"NLP-Enhanced {context}",
-                f"Language-Aware {context}",
-                f"Text Analytics for {context}"
-            ],
-            "Blockchain": [
-                f"Blockchain-Secured {context}",
-                f"Decentralized {context}",
-                f"Distributed Ledger for {context}"
-            ],
-            "Augmented Reality": [
-                f"AR-Enhanced {context}",
-                f"Augmented {context}",
-                f"Mixed Reality {context}"
-            ],
-            "Microservices": [
-                f"Microservices-Based {context}",
-                f"Scalable {context} Architecture",
-                f"Distributed {context}"
-            ],
-            "Real-time Systems": [
-                f"Real-Time {context}",
-                f"Live {context}",
-                f"Instant {context} Processing"
-            ],
-            "Recommendation Systems": [
-                f"Personalized {context}",
-                f"Smart Recommendation for {context}",
-                f"Adaptive {context}"
-            ],
-            "Chatbot Development": [
-                f"Conversational {context}",
-                f"Chatbot for {context}",
-                f"AI Assistant for {context}"
-            ]
-        }
+    def _build_topic_arrays(self):
+        """Encode topic requirements as arrays for batched scoring and filtering."""
+        # Row order of every array follows topic_list
+        self.topic_list: List[TopicTemplate] = list(self.topics.values())
+        
+        # Global skill vocabulary: skill name -> column index
+        self.skill_index: Dict[str, int] = {}
+        for topic in self.topic_list:
+            for skill in topic.requirements.required_skills:
+                self.skill_index.setdefault(skill, len(self.skill_index))
+        
+        # Required skills as CSR: topic i owns entries topic_skill_indptr[i]:topic_skill_indptr[i + 1].
+        # Vocabulary columns and levels are small, so they are stored in the narrowest
+        # integer types (int16 columns, int8 levels, uint8 domains/difficulties) to keep
+        # the arrays the kernels stream over compact
+        indptr, skill_idx, skill_prof = [0], [], []
+        for topic in self.topic_list:
+            for skill, level in topic.requirements.required_skills.items():
+                skill_idx.append(self.skill_index[skill])
+                skill_prof.append(level)
+            indptr.append(len(skill_idx))
+        self.topic_skill_indptr = np.array(indptr, dtype=np.int32)
+        self.topic_skill_idx = np.array(skill_idx, dtype=np.int16)
+        self.topic_skill_prof = np.array(skill_prof, dtype=np.int8)
+        
+        # Required-skill presence as one uint64 bitset row per topic
+        self.topic_skill_bits = np.array([
+            pack_bits((self.skill_index[skill] for skill in topic.requirements.required_skills),
+                      len(self.skill_index))
+            for topic in self.topic_list
+        ], dtype=np.uint64).reshape(len(self.topic_list), -1)
+        
+        # Scalar hard-constraint thresholds, one entry per topic (float64 so comparisons
+        # against the student's values give exactly the per-topic results)
+        reqs = [topic.requirements for topic in self.topic_list]
+        self.topic_min_cgpa = np.array([r.min_cgpa for r in reqs], dtype=np.float64)
+        self.topic_team_min = np.array([r.team_size_min for r in reqs], dtype=np.float64)
+        self.topic_hours = np.array([r.estimated_weekly_hours for r in reqs], dtype=np.float64)
         
-        # Get patterns for this technique, or use default
-        technique_patterns = patterns.get(technique, [f"{context} with {technique}"])
+        # Required courses as one uint64 bitset row per topic over a course vocabulary
+        self.course_index: Dict[str, int] = {}
+        for r in reqs:
+            for course in r.required_courses:
+                self.course_index.setdefault(course, len(self.course_index))
+        self.topic_course_bits = np.zeros((len(reqs), (len(self.course_index) + 63) // 64), dtype=np.uint64)
+        for row, r in enumerate(reqs):
+            self.topic_course_bits[row] = pack_bits((self.course_index[c] for c in r.required_courses),
+                                                    len(self.course_index))
         
-        # Use hash of context to consistently pick same pattern for same context
-        pattern_index = hash(context) % len(technique_patterns)
-        return technique_patterns[pattern_index]
+        # Topic id -> row, and per-topic domain column / difficulty code for the fused score kernel
+        self.topic_row: Dict[str, int] = {topic.id: row for row, topic in enumerate(self.topic_list)}
+        self.domain_index: Dict[str, int] = {}
+        self.topic_domain = np.array([self.domain_index.setdefault(t.domain_key, len(self.domain_index))
+                                      for t in self.topic_list], dtype=np.uint8)
+        self.topic_difficulty = np.array([DIFFICULTY_CODES.get(t.difficulty, 0) for t in self.topic_list],
+                                         dtype=np.uint8)
+
+    def _generate_title(self, technique: str, context: str) -> str:
+        """Generate varied, natural-sounding titles."""
+        key = (technique, context)
+        title = self._title_cache.get(key)
+        if title is None:
+            templates = _TITLE_PATTERNS.get(technique)
+            if templates is None:
+                title = f"{context} with {technique}"
+            else:
+                # The context's catalog position consistently picks the same pattern for it
+                pattern_index = self._context_index[context] % len(templates)
+                title = templates[pattern_index].format(ctx=context)
+            self._title_cache[key] = title
+        return title
     
     def _create_topic(self, topic_id: int, domain: DomainInfo, 
                      technique: TechniqueInfo, context: ContextInfo) -> TopicTemplate:
@@ -443,16 +575,15 @@ class KnowledgeBase:
         title = self._generate_title(technique.name, context.name)
         
         # Generate description
-        description = f"{context.description} implemented with {technique.description.lower()} in the {domain.name.lower()} domain."
+        description = f"{context.description} implemented with {technique.description_lower} in the {domain.name_lower} domain."
         
-        # Combine skills
-        combined_skills = {}
-        combined_skills.update(domain.base_skills)
-        combined_skills.update(technique.required_skills)
-        combined_skills.update(context.additional_skills)
+        # Combine skills (later sources override earlier levels), built in one step
+        combined_skills = {**domain.base_skills, **technique.required_skills, **context.additional_skills}
         
-        # Combine courses
-        combined_courses = set(domain.base_courses + context.additional_courses)
+        # Combine courses; frozen, and interned so students' interned course names
+        # match by identity in the set operations of the constraint checks
+        combined_courses = frozenset(map(sys.intern, (*domain.base_courses, *context.additional_courses)))
+        combined_courses = self._course_sets.setdefault(combined_courses, combined_courses)
         
         # Adjust difficulty based on context modifier
         difficulty = technique.difficulty
@@ -469,11 +600,16 @@ class KnowledgeBase:
             estimated_weekly_hours=hours
         )
         
-        # Combine risk factors
-        risk_factors = technique.risk_factors + [f"{context.name} domain complexity"]
+        # Combine risk factors; one shared tuple per technique and context
+        risk_key = (technique.name, context.name)
+        risk_factors = self._risk_cache.get(risk_key)
+        if risk_factors is None:
+            risk_factors = (*map(sys.intern, technique.risk_factors),
+                            sys.intern(f"{context.name} domain complexity"))
+            self._risk_cache[risk_key] = risk_factors
         
-        # Generate keywords
-        keywords = [domain.name.lower(), technique.name.lower(), context.name.lower()]
+        # Generate keywords (interned names, stored once across topics)
+        keywords = (domain.name_lower, technique.name_lower, context.name_lower)
         
         return TopicTemplate(
             id=f"GEN{topic_id:04d}",
@@ -494,21 +630,60 @@ class KnowledgeBase:
 
     def get_topics_by_domain(self, domain: str) -> List[TopicTemplate]:
         """Get topics filtered by domain."""
-        return [t for t in self.topics.values() if t.domain.lower() == domain.lower()]
+        return list(self._by_domain.get(domain.lower(), ()))
 
     def get_topics_by_technique(self, technique: str) -> List[TopicTemplate]:
         """Get topics filtered by technique."""
-        return [t for t in self.topics.values() if t.technique.lower() == technique.lower()]
+        return list(self._by_technique.get(technique.lower(), ()))
 
     def get_topics_by_context(self, context: str) -> List[TopicTemplate]:
         """Get topics filtered by context."""
-        return [t for t in self.topics.values() if t.context.lower() == context.lower()]
+        return list(self._by_context.get(context.lower(), ()))
 
     def get_domain_complexity(self, domain: str) -> str:
         """Heuristic for domain complexity."""
-        high_complexity = {"Artificial Intelligence", "Cybersecurity", "Cloud Computing"}
-        return "High" if domain in high_complexity else "Medium"
+        info = self.domains.get(domain)
+        return info.complexity if info else "Medium"
     
     def get_total_topic_count(self) -> int:
         """Get total number of generated topics."""
         return len(self.topics)
+
+    @classmethod
+    def load_or_build(cls, path: str = "kb_cache.pkl") -> "KnowledgeBase":
+        """
+        Load the knowledge base pickled by an earlier run, or generate it and save it to path.
+        The cached copy is rebuilt whenever the modules that generate it have changed.
+        """
+        source = _source_stamp()
+        if os.path.exists(path):
+            try:
+                with open(path, 'rb') as f:
+                    cached = pickle.load(f)
+                if cached.get("source") == source:
+                    return cached["kb"]
+            except Exception as e:
+                print(f"⚠️  Ignoring unreadable knowledge base cache {path}: {e}")
+        
+        kb = cls()
+        try:
+            # Written beside the cache and swapped in, so a concurrent run never reads a partial file
+            tmp_file = path + ".tmp"
+            with open(tmp_file, 'wb') as f:
+                pickle.dump({"source": source, "kb": kb}, f, protocol=5)
+            os.replace(tmp_file, path)
+        except OSError as e:
+            print(f"⚠️  Could not write knowledge base cache {path}: {e}")
+        return kb
+
+
+def _source_stamp() -> Tuple[int, ...]:
+    """Modification times of the modules whose code determines the generated knowledge base."""
+    modules = (sys.modules[__name__], sys.modules[pack_bits.__module__])
+    return tuple(os.stat(module.__file__).st_mtime_ns for module in modules)
+
+
+@lru_cache(maxsize=None)
+def get_kb() -> KnowledgeBase:
+    """Return the process-wide KnowledgeBase, generating topics on first use."""
+    return KnowledgeBase()
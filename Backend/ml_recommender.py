@@ -1,14 +1,25 @@
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
+from collections import OrderedDict
 from dataclasses import dataclass
+import threading
+import joblib
 import numpy as np
+from scipy import sparse
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
 import pickle
 import os
+import uuid
 
 from student_profile import StudentProfile
 from knowledge_base import KnowledgeBase, TopicTemplate
 from recommendation_engine import Recommendation
+from scoring_kernels import pack_bits, relaxed_feasibility
+
+# Student queries whose similarity vectors are kept by MLRecommender
+_QUERY_CACHE_SIZE = 256
+# Distinct query phrases (skill, interest, course names...) whose tokens are kept
+_PHRASE_CACHE_SIZE = 4096
 
 
 @dataclass
@@ -33,12 +44,27 @@ class MLRecommender:
         self.model_path = model_path
         self.vectorizer = None
         self.topic_vectors = None
+        # L2-normalized topic vectors, derived once from topic_vectors for cosine similarity
+        self._topic_vectors_normed = None
+        # Inverted index over the normalized vectors: row j lists the topics containing term j
+        self._topic_postings = None
+        # Similarity to every topic per student query text, least recently used first
+        self._query_cache: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        # Tokens (after stop-word removal) per query phrase
+        self._phrase_tokens: Dict[str, Tuple[str, ...]] = {}
+        self._query_lock = threading.Lock()
         self.topic_list = []
         self.is_trained = False
         
         # Try to load pre-trained model
         if os.path.exists(model_path):
-            self.load_model(model_path)
+            try:
+                self.load_model(model_path)
+            except Exception as e:
+                # E.g. a sidecar file missing or written by an incompatible version
+                print(f"⚠️  Could not load ML model from {model_path}: {e}")
+                print("Training ML model on the fly...")
+                self.fit()
         else:
             # If no model exists, train on the fly
             print(f"⚠️  No pre-trained model found at {model_path}")
@@ -64,16 +90,94 @@ class MLRecommender:
             stop_words='english',
             ngram_range=(1, 2),  # Unigrams and bigrams
             min_df=1,
-            max_df=0.8
+            max_df=0.8,
+            dtype=np.float32  # Ranking precision is ample; halves the matrix
         )
         
         # Fit and transform topics
         self.topic_vectors = self.vectorizer.fit_transform(topic_documents)
+        self._prepare_model()
         self.is_trained = True
         
         print(f"✓ ML model trained on {len(self.topic_list)} topics")
         print(f"✓ Vocabulary size: {len(self.vectorizer.vocabulary_)}")
     
+    def _prepare_model(self):
+        """Derive the structures every query reuses from the fitted or loaded model."""
+        # float32 values with int32 indices (also for models trained in float64), halving
+        # the bytes the per-query sparse product streams through
+        normed = normalize(self.topic_vectors.astype(np.float32), norm='l2', axis=1, copy=False).tocsr()
+        normed.indices = normed.indices.astype(np.int32, copy=False)
+        normed.indptr = normed.indptr.astype(np.int32, copy=False)
+        self._topic_vectors_normed = normed
+        # Built once; a query's product then visits only the postings of its own terms
+        postings = normed.T.tocsr()
+        postings.indices = postings.indices.astype(np.int32, copy=False)
+        postings.indptr = postings.indptr.astype(np.int32, copy=False)
+        self._topic_postings = postings
+        self._topic_id_to_idx: Dict[str, int] = {topic.id: i for i, topic in enumerate(self.topic_list)}
+        self._build_topic_arrays()
+        # Pieces of the vectorizer's analyzer, so queries can be counted phrase by phrase
+        self._preprocess = self.vectorizer.build_preprocessor()
+        self._tokenize = self.vectorizer.build_tokenizer()
+        self._stop_words = self.vectorizer.get_stop_words() or frozenset()
+        self._phrase_tokens = {}
+        with self._query_lock:
+            self._query_cache.clear()
+    
+    def _build_topic_arrays(self):
+        """Encode topic_list requirements as arrays (one row per topic) for _relaxed_feasibility."""
+        reqs = [topic.requirements for topic in self.topic_list]
+        n_topics = len(reqs)
+        self._min_cgpa = np.array([r.min_cgpa for r in reqs], dtype=np.float64)
+        self._relaxed_cgpa = self._min_cgpa - 0.5
+        self._est_hours = np.array([r.estimated_weekly_hours for r in reqs], dtype=np.int64)
+        
+        # Required skills by position within each topic (padded), so penalties can be
+        # applied in the same order as the per-topic check
+        self._skill_vocab: Dict[str, int] = {}
+        n_slots = max((len(r.required_skills) for r in reqs), default=0)
+        self._slot_skill = np.zeros((n_topics, n_slots), dtype=np.int32)
+        self._slot_min = np.zeros((n_topics, n_slots), dtype=np.int8)
+        self._slot_used = np.zeros((n_topics, n_slots), dtype=np.uint8)
+        for row, r in enumerate(reqs):
+            for slot, (skill, min_level) in enumerate(r.required_skills.items()):
+                self._slot_skill[row, slot] = self._skill_vocab.setdefault(skill, len(self._skill_vocab))
+                self._slot_min[row, slot] = min_level
+                self._slot_used[row, slot] = 1
+        self._slot_relaxed = np.maximum(1, self._slot_min - 1)
+        
+        # Required courses as one uint64 bitset row per topic, plus how many each topic has
+        self._course_vocab: Dict[str, int] = {}
+        for r in reqs:
+            for course in r.required_courses:
+                self._course_vocab.setdefault(course, len(self._course_vocab))
+        self._course_bits = np.zeros((n_topics, (len(self._course_vocab) + 63) // 64), dtype=np.uint64)
+        for row, r in enumerate(reqs):
+            self._course_bits[row] = pack_bits((self._course_vocab[c] for c in r.required_courses),
+                                               len(self._course_vocab))
+        self._course_counts = np.array([len(r.required_courses) for r in reqs], dtype=np.int64)
+    
+    def _relaxed_feasibility(self, student: StudentProfile) -> np.ndarray:
+        """
+        _check_relaxed_constraints score for every topic in topic_list at once.
+        Penalties are multiplied in the same order as the per-topic check, so the
+        results are identical to it.
+        """
+        # Level 0 marks a skill the student does not have
+        levels = np.zeros(len(self._skill_vocab), dtype=np.int8)
+        for skill, level in student.skills.items():
+            col = self._skill_vocab.get(skill)
+            if col is not None:
+                levels[col] = level.value
+        completed = pack_bits((col for col in map(self._course_vocab.get, student.completed_courses)
+                               if col is not None), len(self._course_vocab))
+        return relaxed_feasibility(
+            student.cgpa, self._min_cgpa, self._relaxed_cgpa, self._slot_skill, self._slot_min,
+            self._slot_relaxed, self._slot_used, levels, self._course_bits, self._course_counts,
+            completed, self._est_hours, student.max_weekly_hours
+        )
+    
     def _create_topic_documents(self, topics: List[TopicTemplate]) -> List[str]:
         """
         Convert topics to text documents for TF-IDF vectorization.
@@ -99,32 +203,125 @@ class MLRecommender:
         
         return documents
     
-    def _create_student_query(self, student: StudentProfile) -> str:
+    def _create_student_query(self, student: StudentProfile) -> Tuple[Tuple[str, int], ...]:
         """
-        Convert student profile to a query document for similarity matching.
+        Convert student profile to a query for similarity matching: its phrases in
+        order, each with how many times it is repeated (higher level = more weight).
         """
         query_parts = []
         
         # Add interests (most important)
         for interest, level in student.interests.items():
-            # Repeat interest based on level (higher level = more weight)
-            query_parts.extend([interest] * level.value)
+            query_parts.append((interest, level.value))
         
         # Add preferred domains
-        query_parts.extend(student.preferred_domains)
+        query_parts.extend((domain, 1) for domain in student.preferred_domains)
         
         # Add skills
         for skill, proficiency in student.skills.items():
-            # Repeat skill based on proficiency
-            query_parts.extend([skill] * proficiency.value)
+            query_parts.append((skill, proficiency.value))
         
         # Add completed courses
-        query_parts.extend(student.completed_courses)
+        query_parts.extend((course, 1) for course in student.completed_courses)
         
         # Add major
-        query_parts.append(student.major)
+        query_parts.append((student.major, 1))
         
-        return ' '.join(query_parts).lower()
+        return tuple((text.lower(), repeat) for text, repeat in query_parts if repeat > 0)
+    
+    def _tokens(self, phrase: str) -> Tuple[str, ...]:
+        """The vectorizer's word tokens of a phrase, stop words removed."""
+        tokens = self._phrase_tokens.get(phrase)
+        if tokens is None:
+            stop_words = self._stop_words
+            tokens = tuple(t for t in self._tokenize(self._preprocess(phrase)) if t not in stop_words)
+            if len(self._phrase_tokens) >= _PHRASE_CACHE_SIZE:
+                self._phrase_tokens.clear()
+            self._phrase_tokens[phrase] = tokens
+        return tokens
+    
+    def _query_vector(self, student_query: Tuple[Tuple[str, int], ...]):
+        """
+        TF-IDF row of a query, equal to vectorizer.transform() of its phrases repeated and
+        joined by spaces, built from term counts without materializing that text.
+        """
+        # Unigram and bigram counts; bigrams also span phrase boundaries and repeats
+        counts: Dict[str, int] = {}
+        previous = None
+        for phrase, repeat in student_query:
+            tokens = self._tokens(phrase)
+            if not tokens:
+                continue
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + repeat
+            for pair in zip(tokens, tokens[1:]):
+                bigram = ' '.join(pair)
+                counts[bigram] = counts.get(bigram, 0) + repeat
+            if repeat > 1:
+                # Each repetition follows the previous one
+                bigram = f"{tokens[-1]} {tokens[0]}"
+                counts[bigram] = counts.get(bigram, 0) + repeat - 1
+            if previous is not None:
+                bigram = f"{previous} {tokens[0]}"
+                counts[bigram] = counts.get(bigram, 0) + 1
+            previous = tokens[-1]
+        
+        vocabulary = self.vectorizer.vocabulary_
+        terms = sorted((vocabulary[term], n) for term, n in counts.items() if term in vocabulary)
+        indices = np.fromiter((j for j, _ in terms), dtype=np.int32, count=len(terms))
+        # Weighted in float64 and rounded back, as TfidfTransformer does in place
+        weights = np.fromiter((n for _, n in terms), dtype=np.float64, count=len(terms))
+        weights = (weights * self.vectorizer.idf_[indices]).astype(self.vectorizer.dtype)
+        vector = sparse.csr_matrix((weights, indices, np.array([0, len(terms)], dtype=np.int32)),
+                                   shape=(1, len(vocabulary)))
+        return normalize(vector, norm='l2', copy=False)
+    
+    def _query_similarities(self, student_query: Tuple[Tuple[str, int], ...]) -> np.ndarray:
+        """
+        Cosine similarity of a student query with every topic (read-only array).
+        Results are memoized per query, so repeat requests for an unchanged
+        profile skip vectorizing it.
+        """
+        return self._query_similarities_batch([student_query])[0]
+    
+    def _query_similarities_batch(self, student_queries: List[Tuple[Tuple[str, int], ...]]) -> List[np.ndarray]:
+        """
+        Cosine similarity of each query with every topic (read-only arrays), in order.
+        Queries missing from the memo are stacked into one matrix and scored in a
+        single product with the topic index.
+        """
+        results: List[Optional[np.ndarray]] = [None] * len(student_queries)
+        with self._query_lock:
+            for i, student_query in enumerate(student_queries):
+                similarities = self._query_cache.get(student_query)
+                if similarities is not None:
+                    self._query_cache.move_to_end(student_query)
+                    results[i] = similarities
+        
+        # Each distinct uncached query is vectorized once
+        pending: Dict[tuple, List[int]] = {}
+        for i, student_query in enumerate(student_queries):
+            if results[i] is None:
+                pending.setdefault(student_query, []).append(i)
+        if not pending:
+            return results
+        
+        # Vectorize student queries; the topic side was normalized once up front
+        student_vectors = sparse.vstack([self._query_vector(q) for q in pending], format='csr')
+        student_vectors = normalize(student_vectors.astype(np.float32, copy=False), norm='l2', axis=1, copy=False)
+        # Topics sharing no term with a query stay 0; scores downstream are computed in float64 as before
+        matrix = (student_vectors @ self._topic_postings).toarray().astype(np.float64)
+        
+        with self._query_lock:
+            for row, (student_query, positions) in zip(matrix, pending.items()):
+                similarities = row.copy()  # Own buffer, so one cached entry doesn't pin the whole batch
+                similarities.setflags(write=False)
+                for i in positions:
+                    results[i] = similarities
+                self._query_cache[student_query] = similarities
+                if len(self._query_cache) > _QUERY_CACHE_SIZE:
+                    self._query_cache.popitem(last=False)
+        return results
     
     def _check_relaxed_constraints(self, student: StudentProfile, topic: TopicTemplate) -> Tuple[float, List[str]]:
         """
@@ -151,11 +348,12 @@ class MLRecommender:
             reasons.append(f"CGPA slightly below requirement (relaxed from {topic.requirements.min_cgpa})")
         
         # 2. Skills Check (Relaxed by 1 level)
+        # KB skill names are already lowercase, the stored form of student skill keys
         skill_penalties = []
         for skill, min_level in topic.requirements.required_skills.items():
             relaxed_level = max(1, min_level - 1)  # Reduce by 1 level, minimum 1
             
-            if not student.has_skill(skill):
+            if not student.has_skill_raw(skill):
                 penalty = 0.5  # Reduced penalty (was 0.6)
                 score *= penalty
                 skill_penalties.append(f"Missing {skill} (can learn)")
@@ -209,74 +407,89 @@ class MLRecommender:
         if not self.is_trained:
             raise RuntimeError("ML model not trained! Call fit() first or load a trained model.")
         
-        unavailable_topic_ids = unavailable_topic_ids or []
-        
-        # Create student query
-        student_query = self._create_student_query(student)
+        # Create student query and its similarity with all topics
+        similarities = self._query_similarities(self._create_student_query(student))
+        return self._rank_topics(student, similarities, top_n, unavailable_topic_ids or [])
+    
+    def get_recommendations_batch(self, students: List[StudentProfile], top_n: int = 3,
+                                  unavailable_topic_ids: List[str] = None) -> List[List[Recommendation]]:
+        """
+        Generate ML-based recommendations for several students at once.
+        Same results as calling get_recommendations for each student, but the
+        similarity of all their queries with the topics is computed in one pass.
         
-        # Vectorize student query
-        student_vector = self.vectorizer.transform([student_query])
+        Args:
+            students: Student profiles
+            top_n: Number of recommendations per student
+            unavailable_topic_ids: Topics already selected by others
         
-        # Calculate cosine similarity with all topics
-        similarities = cosine_similarity(student_vector, self.topic_vectors)[0]
+        Returns:
+            One list of Recommendation objects per student, in the same order
+        """
+        if not self.is_trained:
+            raise RuntimeError("ML model not trained! Call fit() first or load a trained model.")
         
-        # Create candidate list with scores
-        candidates = []
-        for idx, topic in enumerate(self.topic_list):
-            # Skip unavailable topics
-            if topic.id in unavailable_topic_ids:
-                continue
-            
-            # Get similarity score
-            similarity_score = similarities[idx]
-            
-            # Apply relaxed constraints
-            feasibility_score, constraint_reasons = self._check_relaxed_constraints(student, topic)
-            
-            # Skip if feasibility is too low (even with relaxed constraints)
-            # Very lenient threshold for cold start scenarios
-            if feasibility_score < 0.01:  # Changed from 0.1 to 0.01 for cold start
-                continue
-            
-            # Calculate final score (weighted combination)
-            final_score = (0.6 * similarity_score * 100) + (0.4 * feasibility_score * 100)
-            
-            # Generate match reasons
-            match_reasons = self._generate_ml_match_reasons(student, topic, similarity_score)
-            
-            # Combine with constraint reasons
-            all_reasons = match_reasons + constraint_reasons
-            
-            candidates.append({
-                'topic': topic,
-                'similarity_score': similarity_score,
-                'feasibility_score': feasibility_score,
-                'final_score': final_score,
-                'match_reasons': match_reasons,
-                'risk_reasons': constraint_reasons
-            })
-        
-        # Sort by final score
-        candidates.sort(key=lambda x: x['final_score'], reverse=True)
-        
-        # Convert to Recommendation objects
+        unavailable_topic_ids = unavailable_topic_ids or []
+        all_similarities = self._query_similarities_batch(
+            [self._create_student_query(student) for student in students]
+        )
+        return [
+            self._rank_topics(student, similarities, top_n, unavailable_topic_ids)
+            for student, similarities in zip(students, all_similarities)
+        ]
+    
+    def _rank_topics(self, student: StudentProfile, similarities: np.ndarray, top_n: int,
+                     unavailable_topic_ids: List[str]) -> List[Recommendation]:
+        """Combine query similarities with relaxed feasibility and build the top-N recommendations."""
+        # Built once per request; checked against every candidate's domain
+        preferred_domains = frozenset(student.preferred_domains)
+        
+        # Relaxed-constraint feasibility of every topic in one vectorized pass
+        feasibility = self._relaxed_feasibility(student)
+        
+        # Calculate final score (weighted combination) for every topic
+        final_scores = (0.6 * similarities * 100) + (0.4 * feasibility * 100)
+        
+        # Candidates: available topics not too infeasible (even with relaxed constraints);
+        # very lenient threshold for cold start scenarios (changed from 0.1 to 0.01)
+        eligible = feasibility >= 0.01
+        for topic_id in unavailable_topic_ids:
+            idx = self._topic_id_to_idx.get(topic_id)
+            if idx is not None:
+                eligible[idx] = False
+        rows = np.flatnonzero(eligible)
+        
+        # Top-N by final score, keeping topic order among ties as a stable sort does;
+        # everything scoring below the N-th best is dropped before sorting
+        row_scores = final_scores[rows]
+        if 0 < top_n < len(rows):
+            cutoff = np.partition(-row_scores, top_n - 1)[top_n - 1]
+            keep = -row_scores <= cutoff
+            rows, row_scores = rows[keep], row_scores[keep]
+        top_rows = rows[np.argsort(-row_scores, kind='stable')][:top_n]
+        
+        # Convert to Recommendation objects; reasons are only built for these
         recommendations = []
-        for i, candidate in enumerate(candidates[:top_n]):
+        for i, row in enumerate(top_rows.tolist()):
+            topic = self.topic_list[row]
+            similarity_score = float(similarities[row])
+            match_reasons = self._generate_ml_match_reasons(student, topic, similarity_score, preferred_domains)
+            constraint_reasons = self._check_relaxed_constraints(student, topic)[1]
             rec = Recommendation(
-                topic=candidate['topic'],
-                score=candidate['final_score'],
+                topic=topic,
+                score=float(final_scores[row]),
                 rank=i + 1,
-                feasibility_score=candidate['feasibility_score'],
+                feasibility_score=float(feasibility[row]),
                 risk_level="Medium-High (ML Fallback)",  # Indicate ML recommendation
-                match_reasons=candidate['match_reasons'],
-                risk_reasons=candidate['risk_reasons']
+                match_reasons=match_reasons,
+                risk_reasons=constraint_reasons
             )
             recommendations.append(rec)
         
         return recommendations
     
     def _generate_ml_match_reasons(self, student: StudentProfile, topic: TopicTemplate, 
-                                   similarity_score: float) -> List[str]:
+                                   similarity_score: float, preferred_domains: Optional[frozenset] = None) -> List[str]:
         """Generate human-readable match reasons for ML recommendations."""
         reasons = []
         
@@ -287,41 +500,76 @@ class MLRecommender:
             reasons.append(f"Moderate match ({similarity_score:.2%}) based on interests")
         
         # Interest match
-        if topic.domain.lower() in student.interests:
-            level = student.interests[topic.domain.lower()]
+        level = student.interests.get(topic.domain_key)
+        if level is not None:
             reasons.append(f"Matches your {level.name.lower()} interest in {topic.domain}")
         
         # Skill overlap
         matched_skills = [skill for skill in topic.requirements.required_skills.keys() 
-                         if student.has_skill(skill)]
+                         if student.has_skill_raw(skill)]
         if matched_skills:
             reasons.append(f"You have some relevant skills: {', '.join(matched_skills[:3])}")
         
         # Domain preference
-        if topic.domain.lower() in student.preferred_domains:
+        if preferred_domains is None:
+            preferred_domains = frozenset(student.preferred_domains)
+        if topic.domain_key in preferred_domains:
             reasons.append(f"Aligns with your preferred domain: {topic.domain}")
         
         return reasons[:3]  # Limit to top 3 reasons
     
+    @staticmethod
+    def _component_paths(path: str, token: Optional[str] = None) -> Tuple[str, str]:
+        """
+        Sidecar files next to the model file: (topic vectors .npz, vectorizer .joblib).
+        Each save names its pair with a fresh token; without one, the fixed names of earlier versions.
+        """
+        base = os.path.splitext(path)[0] + (f".{token}" if token else "")
+        return base + ".vectors.npz", base + ".vectorizer.joblib"
+    
+    @staticmethod
+    def _remove_stale_components(path: str, keep: Tuple[str, ...]):
+        """Delete sidecar files of the model at path other than the ones in keep."""
+        directory = os.path.dirname(path) or "."
+        prefix = os.path.splitext(os.path.basename(path))[0] + "."
+        for name in os.listdir(directory):
+            if (name.startswith(prefix) and name.endswith((".vectors.npz", ".vectorizer.joblib"))
+                    and name not in keep):
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    pass
+    
     def save_model(self, path: str = None):
-        """Save the trained model to disk."""
+        """
+        Save the trained model to disk: the topic vectors as a .npz of their raw arrays,
+        the vectorizer with joblib, and the topic list in the model file itself.
+        The sidecars get new names and the model file naming them is swapped in last,
+        so an interrupted save leaves the previous model intact.
+        """
         if not self.is_trained:
             raise RuntimeError("Cannot save untrained model!")
         
         path = path or self.model_path
+        vectors_path, vectorizer_path = self._component_paths(path, uuid.uuid4().hex[:12])
         
         # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
         
         # Save model components
+        sparse.save_npz(vectors_path, self.topic_vectors.tocsr())
+        joblib.dump(self.vectorizer, vectorizer_path, compress=3)
         model_data = {
-            'vectorizer': self.vectorizer,
-            'topic_vectors': self.topic_vectors,
-            'topic_list': self.topic_list
+            'topic_list': self.topic_list,
+            'vectors_file': os.path.basename(vectors_path),
+            'vectorizer_file': os.path.basename(vectorizer_path)
         }
         
-        with open(path, 'wb') as f:
+        tmp_file = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_file, 'wb') as f:
             pickle.dump(model_data, f)
+        os.replace(tmp_file, path)
+        self._remove_stale_components(path, (model_data['vectors_file'], model_data['vectorizer_file']))
         
         print(f"✓ ML model saved to {path}")
     
@@ -333,9 +581,21 @@ class MLRecommender:
         with open(path, 'rb') as f:
             model_data = pickle.load(f)
         
-        self.vectorizer = model_data['vectorizer']
-        self.topic_vectors = model_data['topic_vectors']
+        if 'topic_vectors' in model_data:
+            # Single-pickle format written by earlier versions
+            self.vectorizer = model_data['vectorizer']
+            self.topic_vectors = model_data['topic_vectors']
+        else:
+            if 'vectors_file' in model_data:
+                directory = os.path.dirname(path)
+                vectors_path = os.path.join(directory, model_data['vectors_file'])
+                vectorizer_path = os.path.join(directory, model_data['vectorizer_file'])
+            else:
+                vectors_path, vectorizer_path = self._component_paths(path)
+            self.vectorizer = joblib.load(vectorizer_path)
+            self.topic_vectors = sparse.load_npz(vectors_path).tocsr()
         self.topic_list = model_data['topic_list']
+        self._prepare_model()
         self.is_trained = True
         
         print(f"✓ ML model loaded from {path}")
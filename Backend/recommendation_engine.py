@@ -1,9 +1,11 @@
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
-from student_profile import StudentProfile
-from knowledge_base import KnowledgeBase, TopicTemplate
+import numpy as np
+from student_profile import StudentProfile, Proficiency
+from knowledge_base import DIFFICULTY_CODES, KnowledgeBase, TopicTemplate
 from inference_engine import InferenceEngine
 from topic_tracker import TopicTracker
+from scoring_kernels import overlap_counts, pack_bits, topic_scores
 
 @dataclass
 class Recommendation:
@@ -27,110 +29,168 @@ class RecommendationEngine:
         self.topic_tracker = topic_tracker
 
     def generate_recommendations(self, student: StudentProfile, top_n: int = 3) -> List[Recommendation]:
-        candidates = self.kb.get_all_topics()
-        scored_candidates = []
+        kb = self.kb
+        candidates = kb.topic_list
         
-        # Get list of unavailable topics (already selected by other students)
-        unavailable_topics = []
-        if self.topic_tracker:
-            unavailable_topics = self.topic_tracker.get_unavailable_topic_ids()
+        levels, skill_bits = self._encode_skills(student)
+        if student.skills:
+            # How many of each topic's required skills the student has at all
+            skill_overlap = overlap_counts(kb.topic_skill_bits, skill_bits)
+        else:
+            skill_overlap = np.zeros(len(candidates), dtype=np.intp)
 
-        for topic in candidates:
-            # 0. Check if topic is already selected by another student
-            if topic.id in unavailable_topics:
-                continue  # Skip already-selected topics
-            
-            # 1. Hard Filter
-            passed_hard_constraints, failure_reasons = self.inference.check_hard_constraints(student, topic)
-            if not passed_hard_constraints:
-                continue # Skip impossible topics
+        # Built once per request; checked against every topic's domain
+        preferred_domains = frozenset(student.preferred_domains)
 
-            # 2. Score Calculation
-            score = self._calculate_score(student, topic)
-            
-            # 3. Risk Assessment
-            risk_level, risk_reasons = self.inference.assess_risk(student, topic)
-            
-            # 4. Feasibility
-            feas_score, _ = self.inference.evaluate_technical_feasibility(student, topic)
+        # Feasibility and weighted score of every topic in one fused pass; the
+        # student-dependent parts of the score only vary by domain and difficulty
+        interest_pts, pref_pts, difficulty_pts = self._score_tables(student, preferred_domains)
+        feasibility, scores = topic_scores(
+            kb.topic_skill_indptr, kb.topic_skill_idx, kb.topic_skill_prof, levels,
+            kb.topic_domain, interest_pts, pref_pts, kb.topic_difficulty, difficulty_pts
+        )
 
-            # Generate positive match reasons
-            match_reasons = self._get_match_reasons(student, topic)
-
-            scored_candidates.append({
-                'topic': topic,
-                'score': score,
-                'feasibility': feas_score,
-                'risk_level': risk_level,
-                'risk_reasons': risk_reasons,
-                'match_reasons': match_reasons
-            })
-
-        # Rank by score descending
-        scored_candidates.sort(key=lambda x: x['score'], reverse=True)
+        # 1. Hard Filter, for the whole catalog at once
+        passed = self.inference.hard_constraint_mask(student, self.kb)
+
+        # 0. Skip topics already selected by other students
+        if self.topic_tracker:
+            for topic_id in self.topic_tracker.get_unavailable_topic_ids():
+                row = kb.topic_row.get(topic_id)
+                if row is not None:
+                    passed[row] = False
+
+        # 2. Rank by score descending; a stable sort keeps catalog order among ties.
+        # Only topics scoring at least the N-th best are sorted
+        rows = np.flatnonzero(passed)
+        row_scores = scores[rows]
+        if 0 < top_n < len(rows):
+            cutoff = np.partition(-row_scores, top_n - 1)[top_n - 1]
+            keep = -row_scores <= cutoff
+            rows, row_scores = rows[keep], row_scores[keep]
+        ranked = rows[np.argsort(-row_scores, kind='stable')][:top_n]
         
-        # Create Recommendation objects
+        # Create Recommendation objects; ranking does not depend on risk or reasons,
+        # so they are only worked out for the topics actually returned
         results = []
-        for i, item in enumerate(scored_candidates[:top_n]):
+        for i, row in enumerate(ranked.tolist()):
+            topic = candidates[row]
+            feas_score = float(feasibility[row])
+            
+            # 3. Risk Assessment (reusing the batched feasibility score)
+            risk_level, risk_reasons = self.inference.assess_risk(student, topic, feas_score)
+            
+            # Generate positive match reasons
+            match_reasons = self._get_match_reasons(
+                student, topic, skill_overlap[row] > 0, preferred_domains
+            )
+            
             results.append(Recommendation(
-                topic=item['topic'],
-                score=item['score'],
+                topic=topic,
+                score=float(scores[row]),
                 rank=i + 1,
-                feasibility_score=item['feasibility'],
-                risk_level=item['risk_level'],
-                risk_reasons=item['risk_reasons'],
-                match_reasons=item['match_reasons']
+                feasibility_score=feas_score,
+                risk_level=risk_level,
+                risk_reasons=risk_reasons,
+                match_reasons=match_reasons
             ))
             
         return results
 
-    def _calculate_score(self, student: StudentProfile, topic: TopicTemplate) -> float:
+    def _score_tables(self, student: StudentProfile, preferred_domains: frozenset):
+        """
+        Per-student score components for topic_scores: interest and domain-preference
+        points per KB domain column, and difficulty-match points per difficulty code.
+        """
+        domain_index = self.kb.domain_index
+        interest_pts = np.zeros(len(domain_index), dtype=np.float64)
+        pref_pts = np.zeros(len(domain_index), dtype=np.float64)
+        for domain, col in domain_index.items():
+            interest_pts[col] = self._interest_component(student, domain)
+            pref_pts[col] = self._domain_component(domain, preferred_domains)
+        difficulty_pts = np.array([self._difficulty_component(student, label)
+                                   for label in DIFFICULTY_CODES], dtype=np.float64)
+        return interest_pts, pref_pts, difficulty_pts
+
+    def _encode_skills(self, student: StudentProfile):
+        """
+        Encode the student's skills against the KB skill columns in one pass.
+        Returns (int8 proficiency per column, NOVICE when missing; uint64 presence bitset).
+        """
+        skill_index = self.kb.skill_index
+        levels = np.full(len(skill_index), Proficiency.NOVICE.value, dtype=np.int8)
+        columns = []
+        for skill, level in student.skills.items():
+            col = skill_index.get(skill)
+            if col is not None:
+                levels[col] = level.value
+                columns.append(col)
+        return levels, pack_bits(columns, len(skill_index))
+
+    def _calculate_score(self, student: StudentProfile, topic: TopicTemplate, feas_score: float,
+                         preferred_domains: Optional[frozenset] = None) -> float:
         """
         Weighted scoring function.
         Weights: Skills (40%), Interests (30%), Difficulty Match (20%), Domain Preference (10%)
         """
-        # Skill Score
-        feas_score, _ = self.inference.evaluate_technical_feasibility(student, topic)
+        # Skill Score (technical feasibility, computed by the caller)
         skill_component = feas_score * 40
 
-        # Interest Score
+        if preferred_domains is None:
+            preferred_domains = frozenset(student.preferred_domains)
+        interest_component = self._interest_component(student, topic.domain_key)
+        domain_component = self._domain_component(topic.domain_key, preferred_domains)
+        difficulty_component = self._difficulty_component(student, topic.difficulty)
+
+        total_score = skill_component + interest_component + domain_component + difficulty_component
+        return total_score
+
+    @staticmethod
+    def _interest_component(student: StudentProfile, domain_key: str) -> float:
+        """Interest Score (30%) for a topic in the given lowercased domain."""
         interest_score = 0
-        if topic.domain.lower() in student.interests:
-            level = student.interests[topic.domain.lower()]
+        level = student.interests.get(domain_key)
+        if level is not None:
             interest_score = (level.value / 4.0) * 100
-        interest_component = interest_score * 0.30
+        return interest_score * 0.30
 
-        # Domain Preference Bonus
+    @staticmethod
+    def _domain_component(domain_key: str, preferred_domains: frozenset) -> float:
+        """Domain Preference Bonus (10%)."""
         domain_bonus = 0
-        if topic.domain.lower() in student.preferred_domains:
+        if domain_key in preferred_domains:
             domain_bonus = 100
-        domain_component = domain_bonus * 0.10
+        return domain_bonus * 0.10
 
-        # Difficulty Match (Heuristic)
-        # If student GPA is high, they should match with Advanced/Intermediate
+    @staticmethod
+    def _difficulty_component(student: StudentProfile, difficulty: str) -> float:
+        """Difficulty Match (20%)."""
+        # Heuristic: if student GPA is high, they should match with Advanced/Intermediate
         difficulty_score = 50 # Default neutral
-        if topic.difficulty == "Advanced":
+        if difficulty == "Advanced":
             if student.cgpa >= 3.5: difficulty_score = 100
             elif student.cgpa >= 3.0: difficulty_score = 80
             else: difficulty_score = 20
-        elif topic.difficulty == "Intermediate":
+        elif difficulty == "Intermediate":
             if student.cgpa >= 2.5: difficulty_score = 100
             else: difficulty_score = 60
-        difficulty_component = difficulty_score * 0.20
-
-        total_score = skill_component + interest_component + domain_component + difficulty_component
-        return total_score
+        return difficulty_score * 0.20
 
-    def _get_match_reasons(self, student: StudentProfile, topic: TopicTemplate) -> List[str]:
+    def _get_match_reasons(self, student: StudentProfile, topic: TopicTemplate,
+                           has_skill_overlap: bool = True,
+                           preferred_domains: Optional[frozenset] = None) -> List[str]:
         reasons = []
-        if topic.domain.lower() in student.preferred_domains:
+        if preferred_domains is None:
+            preferred_domains = frozenset(student.preferred_domains)
+        if topic.domain_key in preferred_domains:
             reasons.append(f"Matches your preferred domain: {topic.domain}")
         
-        req_skills = topic.requirements.required_skills
+        # Only walk the required skills when the bitset says at least one matches
         matched_skills = []
-        for skill in req_skills:
-            if student.has_skill(skill):
-                matched_skills.append(skill)
+        if has_skill_overlap:
+            for skill in topic.requirements.required_skills:
+                if student.has_skill_raw(skill):
+                    matched_skills.append(skill)
         
         if matched_skills:
             reasons.append(f"You have required skills: {', '.join(matched_skills)}")
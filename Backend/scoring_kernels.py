@@ -0,0 +1,288 @@
+"""
+Scoring Kernels Module
+Numeric kernels that score every topic (knowledge base or ML catalog) for one student at once.
+Numba JIT-compiles them when it is installed; otherwise the NumPy versions are used.
+"""
+
+import threading
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Numba's default workqueue threading layer must not be entered from several
+# Python threads at once (e.g. a threaded WSGI server), so parallel kernel
+# launches are serialized; each launch already spreads over all cores.
+_PARALLEL_LOCK = threading.Lock()
+
+
+def pack_bits(columns, n_columns: int) -> np.ndarray:
+    """Pack column indices into a uint64 bitset of ceil(n_columns / 64) words."""
+    bits = np.zeros((n_columns + 63) // 64, dtype=np.uint64)
+    for col in columns:
+        bits[col >> 6] |= np.uint64(1) << np.uint64(col & 63)
+    return bits
+
+
+def overlap_counts(topic_bits: np.ndarray, student_bits: np.ndarray) -> np.ndarray:
+    """Number of set bits shared by each topic row and the student bitset (popcount of AND)."""
+    shared = np.bitwise_and(topic_bits, student_bits)
+    return np.unpackbits(shared.view(np.uint8), axis=1).sum(axis=1)
+
+
+def _feasibility_numpy(indptr: np.ndarray, skill_idx: np.ndarray, skill_prof: np.ndarray,
+                       student_levels: np.ndarray) -> np.ndarray:
+    """Vectorized technical feasibility for all topics (NumPy fallback)."""
+    n_topics = len(indptr) - 1
+    rows = np.repeat(np.arange(n_topics), np.diff(indptr))
+    required = skill_prof.astype(np.float64)
+    levels = student_levels[skill_idx].astype(np.float64)
+    # Partial credit for being close, as in InferenceEngine
+    contrib = np.where(levels >= required, required, levels * 0.5)
+    matched = np.bincount(rows, weights=contrib, minlength=n_topics)
+    total = np.bincount(rows, weights=required, minlength=n_topics)
+    scores = np.ones(n_topics, dtype=np.float64)
+    np.divide(matched, total, out=scores, where=total > 0)
+    return scores
+
+
+def _topic_scores_numpy(indptr: np.ndarray, skill_idx: np.ndarray, skill_prof: np.ndarray,
+                        student_levels: np.ndarray, topic_domain: np.ndarray,
+                        domain_interest_pts: np.ndarray, domain_pref_pts: np.ndarray,
+                        topic_difficulty: np.ndarray, difficulty_pts: np.ndarray):
+    """Vectorized feasibility and weighted score for all topics (NumPy fallback)."""
+    feasibility = _feasibility_numpy(indptr, skill_idx, skill_prof, student_levels)
+    # Same operation order as RecommendationEngine._calculate_score
+    scores = feasibility * 40
+    scores += domain_interest_pts[topic_domain]
+    scores += domain_pref_pts[topic_domain]
+    scores += difficulty_pts[topic_difficulty]
+    return feasibility, scores
+
+
+def _relaxed_feasibility_numpy(cgpa, min_cgpa, relaxed_cgpa, slot_skill, slot_min, slot_relaxed,
+                               slot_used, student_levels, course_bits, course_counts, completed_bits,
+                               est_hours, max_hours):
+    """Vectorized relaxed-constraint feasibility for all topics (NumPy fallback)."""
+    n_topics = len(min_cgpa)
+    # 1. CGPA
+    score = np.ones(n_topics, dtype=np.float64)
+    below_relaxed = cgpa < relaxed_cgpa
+    score[below_relaxed] *= 0.3
+    score[~below_relaxed & (cgpa < min_cgpa)] *= 0.7
+    
+    # 2. Skills, one slot at a time in requirement order; level 0 means missing
+    have = student_levels[slot_skill]
+    penalty = np.where(have == 0, 0.5,
+                       np.where(have < slot_relaxed, 0.6,
+                                np.where(have < slot_min, 0.8, 1.0)))
+    penalty[slot_used == 0] = 1.0
+    for slot in range(penalty.shape[1]):
+        score *= penalty[:, slot]
+    
+    # 3. Courses, weighted by the share completed
+    matched = overlap_counts(course_bits, completed_bits)
+    has_courses = course_counts > 0
+    match_ratio = matched[has_courses] / course_counts[has_courses]
+    score[has_courses] *= 0.5 + 0.5 * match_ratio
+    
+    # 4. Time availability
+    score[max_hours < est_hours] *= 0.9
+    return score
+
+
+if NUMBA_AVAILABLE:
+    _M1 = np.uint64(0x5555555555555555)
+    _M2 = np.uint64(0x3333333333333333)
+    _M4 = np.uint64(0x0F0F0F0F0F0F0F0F)
+    _H01 = np.uint64(0x0101010101010101)
+
+    @njit('int64(uint64)', cache=True)
+    def _popcount64(x):
+        # SWAR bit count; constants are uint64 so the arithmetic never widens to float
+        x = x - ((x >> np.uint64(1)) & _M1)
+        x = (x & _M2) + ((x >> np.uint64(2)) & _M2)
+        x = (x + (x >> np.uint64(4))) & _M4
+        return np.int64((x * _H01) >> np.uint64(56))
+
+    # Explicit signature: compiled (or loaded from the on-disk cache) at import,
+    # not on the first recommendation request
+    @njit('float64[:](int32[:], int16[:], int8[:], int8[:])', parallel=True, cache=True)
+    def _feasibility_numba(indptr, skill_idx, skill_prof, student_levels):
+        n_topics = len(indptr) - 1
+        scores = np.empty(n_topics, dtype=np.float64)
+        # Topics are independent, so rows are scored in parallel
+        for i in prange(n_topics):
+            total = 0.0
+            matched = 0.0
+            # Only the skills this topic requires are visited
+            for k in range(indptr[i], indptr[i + 1]):
+                required = skill_prof[k]
+                total += required
+                level = student_levels[skill_idx[k]]
+                if level >= required:
+                    matched += required
+                else:
+                    # Partial credit for being close, as in InferenceEngine
+                    matched += level * 0.5
+            scores[i] = matched / total if total > 0 else 1.0
+        return scores
+
+    @njit('Tuple((float64[:], float64[:]))(int32[:], int16[:], int8[:], int8[:], uint8[:], '
+          'float64[:], float64[:], uint8[:], float64[:])', parallel=True, cache=True)
+    def _topic_scores_numba(indptr, skill_idx, skill_prof, student_levels, topic_domain,
+                            domain_interest_pts, domain_pref_pts, topic_difficulty, difficulty_pts):
+        n_topics = len(indptr) - 1
+        feasibility = np.empty(n_topics, dtype=np.float64)
+        scores = np.empty(n_topics, dtype=np.float64)
+        for i in prange(n_topics):
+            total = 0.0
+            matched = 0.0
+            for k in range(indptr[i], indptr[i + 1]):
+                required = skill_prof[k]
+                total += required
+                level = student_levels[skill_idx[k]]
+                if level >= required:
+                    matched += required
+                else:
+                    matched += level * 0.5
+            feas = matched / total if total > 0 else 1.0
+            feasibility[i] = feas
+            # Weighted score in the same operation order as the scalar path
+            # (no fastmath, so results are bit-identical to it)
+            domain = topic_domain[i]
+            scores[i] = (feas * 40 + domain_interest_pts[domain] + domain_pref_pts[domain]
+                         + difficulty_pts[topic_difficulty[i]])
+        return feasibility, scores
+
+    @njit('float64[:](float64, float64[:], float64[:], int32[:, :], int8[:, :], int8[:, :], '
+          'uint8[:, :], int8[:], uint64[:, :], int64[:], uint64[:], int64[:], int64)',
+          parallel=True, cache=True)
+    def _relaxed_feasibility_numba(cgpa, min_cgpa, relaxed_cgpa, slot_skill, slot_min, slot_relaxed,
+                                   slot_used, student_levels, course_bits, course_counts, completed_bits,
+                                   est_hours, max_hours):
+        n_topics = len(min_cgpa)
+        scores = np.empty(n_topics, dtype=np.float64)
+        for i in prange(n_topics):
+            # Penalties multiplied in the same order as the NumPy version
+            score = 1.0
+            if cgpa < relaxed_cgpa[i]:
+                score *= 0.3
+            elif cgpa < min_cgpa[i]:
+                score *= 0.7
+            for slot in range(slot_skill.shape[1]):
+                if not slot_used[i, slot]:
+                    break
+                have = student_levels[slot_skill[i, slot]]
+                if have == 0:
+                    score *= 0.5
+                elif have < slot_relaxed[i, slot]:
+                    score *= 0.6
+                elif have < slot_min[i, slot]:
+                    score *= 0.8
+            n_courses = course_counts[i]
+            if n_courses > 0:
+                # Completed required courses: popcount of the AND, a few words per topic
+                matched = 0
+                for w in range(course_bits.shape[1]):
+                    matched += _popcount64(course_bits[i, w] & completed_bits[w])
+                score *= 0.5 + 0.5 * (matched / n_courses)
+            if max_hours < est_hours[i]:
+                score *= 0.9
+            scores[i] = score
+        return scores
+
+
+def feasibility_scores(indptr: np.ndarray, skill_idx: np.ndarray, skill_prof: np.ndarray,
+                       student_levels: np.ndarray) -> np.ndarray:
+    """
+    Technical feasibility (0.0 - 1.0) of every topic for one student.
+
+    Args:
+        indptr: (n_topics + 1,) CSR row offsets; topic i owns entries indptr[i]:indptr[i + 1]
+        skill_idx: (nnz,) skill column of each required skill
+        skill_prof: (nnz,) minimum proficiency of each required skill
+        student_levels: (n_skills,) student's proficiency per skill (NOVICE when missing)
+
+    Returns:
+        (n_topics,) feasibility scores, matching InferenceEngine.evaluate_technical_feasibility
+    """
+    if NUMBA_AVAILABLE:
+        with _PARALLEL_LOCK:
+            return _feasibility_numba(indptr, skill_idx, skill_prof, student_levels)
+    return _feasibility_numpy(indptr, skill_idx, skill_prof, student_levels)
+
+
+def topic_scores(indptr: np.ndarray, skill_idx: np.ndarray, skill_prof: np.ndarray,
+                 student_levels: np.ndarray, topic_domain: np.ndarray,
+                 domain_interest_pts: np.ndarray, domain_pref_pts: np.ndarray,
+                 topic_difficulty: np.ndarray, difficulty_pts: np.ndarray):
+    """
+    Technical feasibility and weighted recommendation score of every topic, in one pass.
+
+    Args:
+        indptr, skill_idx, skill_prof, student_levels: as for feasibility_scores
+        topic_domain: (n_topics,) domain column of each topic
+        domain_interest_pts: (n_domains,) interest component the student earns per domain
+        domain_pref_pts: (n_domains,) preferred-domain component per domain
+        topic_difficulty: (n_topics,) difficulty code of each topic
+        difficulty_pts: (n_codes,) difficulty-match component per code for this student
+
+    Returns:
+        ((n_topics,) feasibility, (n_topics,) scores matching RecommendationEngine._calculate_score)
+    """
+    args = (indptr, skill_idx, skill_prof, student_levels, topic_domain,
+            domain_interest_pts, domain_pref_pts, topic_difficulty, difficulty_pts)
+    if NUMBA_AVAILABLE:
+        with _PARALLEL_LOCK:
+            return _topic_scores_numba(*args)
+    return _topic_scores_numpy(*args)
+
+
+def relaxed_feasibility(cgpa: float, min_cgpa: np.ndarray, relaxed_cgpa: np.ndarray,
+                        slot_skill: np.ndarray, slot_min: np.ndarray, slot_relaxed: np.ndarray,
+                        slot_used: np.ndarray, student_levels: np.ndarray, course_bits: np.ndarray,
+                        course_counts: np.ndarray, completed_bits: np.ndarray, est_hours: np.ndarray,
+                        max_hours: int) -> np.ndarray:
+    """
+    Relaxed-constraint feasibility (0.0 - 1.0) of every topic for one student.
+
+    Args:
+        cgpa: student's CGPA
+        min_cgpa, relaxed_cgpa: (n_topics,) required CGPA and its relaxed threshold
+        slot_skill: (n_topics, n_slots) skill column of each required skill, in requirement order
+        slot_min, slot_relaxed: (n_topics, n_slots) required proficiency and its relaxed level
+        slot_used: (n_topics, n_slots) 1 for filled slots; rows are filled from the left
+        student_levels: (n_skills,) student's proficiency per skill (0 when missing)
+        course_bits: (n_topics, n_words) uint64 bitset of each topic's required courses
+        course_counts: (n_topics,) number of required courses of each topic
+        completed_bits: (n_words,) uint64 bitset of the courses the student completed
+        est_hours: (n_topics,) estimated weekly hours of each topic
+        max_hours: student's available weekly hours
+
+    Returns:
+        (n_topics,) scores matching MLRecommender._check_relaxed_constraints
+    """
+    args = (float(cgpa), min_cgpa, relaxed_cgpa, slot_skill, slot_min, slot_relaxed, slot_used,
+            student_levels, course_bits, course_counts, completed_bits, est_hours, int(max_hours))
+    if NUMBA_AVAILABLE:
+        with _PARALLEL_LOCK:
+            return _relaxed_feasibility_numba(*args)
+    return _relaxed_feasibility_numpy(*args)
+
+
+def warm_up() -> None:
+    """Run every kernel once on tiny inputs so thread pools are started before the first request."""
+    feasibility_scores(np.array([0, 1], dtype=np.int32), np.zeros(1, dtype=np.int16),
+                       np.ones(1, dtype=np.int8), np.ones(1, dtype=np.int8))
+    topic_scores(np.array([0, 1], dtype=np.int32), np.zeros(1, dtype=np.int16),
+                 np.ones(1, dtype=np.int8), np.ones(1, dtype=np.int8), np.zeros(1, dtype=np.uint8),
+                 np.zeros(1), np.zeros(1), np.zeros(1, dtype=np.uint8), np.zeros(1))
+    relaxed_feasibility(3.0, np.zeros(1), np.zeros(1), np.zeros((1, 1), dtype=np.int32),
+                        np.ones((1, 1), dtype=np.int8), np.ones((1, 1), dtype=np.int8),
+                        np.ones((1, 1), dtype=np.uint8), np.ones(1, dtype=np.int8),
+                        np.ones((1, 1), dtype=np.uint64), np.ones(1, dtype=np.int64),
+                        np.ones(1, dtype=np.uint64), np.zeros(1, dtype=np.int64), 20)
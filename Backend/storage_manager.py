@@ -3,51 +3,436 @@ Storage Manager Module
 Handles persistent storage of student profiles and recommendation history.
 """
 
+import hashlib
 import json
 import os
-from typing import Dict, List, Optional
+import re
+import shutil
+import sys
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import quote, unquote
 from datetime import datetime
 from student_profile import StudentProfile, Proficiency, InterestLevel
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Advisory file locking: fcntl on POSIX, msvcrt on Windows
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+# Profile file name: prefix, percent-encoded ID and a hash of the exact ID (see _shard_name)
+_SHARD_PREFIX = "s_"
+_SHARD_RE = re.compile(r"s_(.*)\.([0-9a-f]{8})\.json")
+
+# Stored level value -> enum member; plain dict lookups instead of Enum value resolution per skill
+_PROF_BY_VALUE = {member.value: member for member in Proficiency}
+_INT_BY_VALUE = {member.value: member for member in InterestLevel}
+
+
+def _json_default(obj):
+    """Serialize sets (e.g. completed courses) as lists."""
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _lock_file(f):
+    """Block until this process holds the exclusive lock on an open file."""
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    elif msvcrt is not None:
+        f.seek(0)
+        while True:
+            try:
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                # LK_LOCK gives up after ~10 seconds; keep waiting
+                continue
+
+
+def _unlock_file(f):
+    """Release the lock taken by _lock_file."""
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    elif msvcrt is not None:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+# UTF-8 JSON encoding/decoding; orjson when installed, else the standard library
+if ORJSON_AVAILABLE:
+    def _dumps(data, indent: bool = False) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(data, default=_json_default, option=option)
+    
+    _loads = orjson.loads
+else:
+    def _dumps(data, indent: bool = False) -> bytes:
+        return json.dumps(data, indent=2 if indent else None, ensure_ascii=False,
+                          default=_json_default).encode('utf-8')
+    
+    _loads = json.loads
+
 
 class StorageManager:
     """Manages persistent storage for student profiles and recommendations."""
     
+    # Counters maintained in stats.json (the student count is the number of profile files)
+    STAT_KEYS = ("total_recommendations", "history_entries")
+    
+    # Summary columns kept per student in students_index.json
+    INDEX_FIELDS = ("student_id", "name", "major", "cgpa", "year")
+    
     def __init__(self, data_dir: str = "data"):
         self.data_dir = data_dir
+        # One JSON file per student profile
+        self.students_dir = os.path.join(data_dir, "students")
+        # Token rewritten by every change to the profiles; see students_version
+        self.generation_file = os.path.join(data_dir, "students_generation")
+        # Former single-file store; read once to migrate into students_dir
         self.students_file = os.path.join(data_dir, "students.json")
-        self.history_file = os.path.join(data_dir, "recommendations_history.json")
+        # One JSON entry per line, appended to as recommendations are saved
+        self.history_file = os.path.join(data_dir, "recommendations_history.jsonl")
+        # Former single-array history; read once to migrate into history_file
+        self.legacy_history_file = os.path.join(data_dir, "recommendations_history.json")
+        self.stats_file = os.path.join(data_dir, "stats.json")
+        self.index_file = os.path.join(data_dir, "students_index.json")
+        # Held while changing the data files; see _locked
+        self.lock_file = os.path.join(data_dir, "storage.lock")
+        
+        # Parsed profile per student ID, keyed by its file's (mtime, size): (key, data)
+        self._shard_cache: Dict[str, tuple] = {}
+        # All parsed profiles, keyed by the students version
+        self._students_cache = None
+        # Parsed summary index; valid while its recorded version matches students_version()
+        self._index_cache = None
         
         # Create data directory if it doesn't exist
         os.makedirs(data_dir, exist_ok=True)
         
+        self._lock = threading.RLock()
+        self._lock_depth = 0
+        self._lock_handle = open(self.lock_file, 'a+b')
+        
         # Initialize files if they don't exist
-        if not os.path.exists(self.students_file):
-            self._save_json(self.students_file, {})
-        if not os.path.exists(self.history_file):
-            self._save_json(self.history_file, [])
+        with self._locked():
+            if not os.path.isdir(self.students_dir):
+                self._migrate_students_file()
+            else:
+                self._rename_unhashed_shards()
+            if not os.path.exists(self.generation_file):
+                self._bump_generation()
+            if not os.path.exists(self.history_file):
+                self._migrate_history_file()
+            if not os.path.exists(self.stats_file):
+                self._rebuild_stats()
+    
+    @contextmanager
+    def _locked(self):
+        """
+        Hold the storage lock: exclusive across this manager's threads and across processes
+        sharing data_dir (threaded Flask, several gunicorn workers, the GUI), so read-modify-write
+        updates of the data files do not interleave. Reentrant within a thread.
+        """
+        with self._lock:
+            if self._lock_depth == 0:
+                _lock_file(self._lock_handle)
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0:
+                    _unlock_file(self._lock_handle)
     
     def _save_json(self, filepath: str, data):
         """Save data to JSON file."""
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        with open(filepath, 'wb') as f:
+            f.write(_dumps(data, indent=True))
+    
+    def _replace_json(self, filepath: str, data):
+        """
+        Save data to a JSON file by writing a temporary file beside it and renaming it
+        into place, so readers see either the old or the new contents, never a partial file.
+        """
+        # Named per process and thread, so concurrent writers never share a temporary file
+        tmp_file = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            self._save_json(tmp_file, data)
+            os.replace(tmp_file, filepath)
+        except BaseException:
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+            raise
     
     def _load_json(self, filepath: str):
         """Load data from JSON file."""
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(filepath, 'rb') as f:
+                return _loads(f.read())
         except (FileNotFoundError, json.JSONDecodeError):
-            return {} if filepath == self.students_file else []
+            return [] if filepath == self.legacy_history_file else {}
+    
+    def _migrate_history_file(self):
+        """Create the history log, copying the entries of the legacy history array into it if present."""
+        tmp_file = self.history_file + ".tmp"
+        with open(tmp_file, 'wb') as out:
+            if not os.path.exists(self.legacy_history_file):
+                pass
+            elif IJSON_AVAILABLE:
+                # Streamed entry by entry, so a large legacy array is never held in memory
+                try:
+                    with open(self.legacy_history_file, 'rb') as f:
+                        for entry in ijson.items(f, 'item', use_float=True):
+                            out.write(_dumps(entry) + b"\n")
+                except ijson.JSONError:
+                    # A damaged file migrates as empty, as _load_json reads it
+                    out.seek(0)
+                    out.truncate()
+            else:
+                for entry in self._load_json(self.legacy_history_file):
+                    out.write(_dumps(entry) + b"\n")
+        os.replace(tmp_file, self.history_file)
+    
+    def _iter_history(self, student_id: Optional[str] = None) -> Iterator[Dict]:
+        """Yield history entries in saved order, parsing only lines that can belong to student_id."""
+        # A matching line always contains one of these (orjson writes no space after
+        # the colon, the json module does); other students' lines are skipped unparsed
+        needles = None
+        if student_id:
+            value = _dumps(student_id)
+            needles = (b'"student_id":' + value, b'"student_id": ' + value)
+        try:
+            f = open(self.history_file, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                if not line.strip() or (needles is not None and
+                                        needles[0] not in line and needles[1] not in line):
+                    continue
+                try:
+                    entry = _loads(line)
+                except json.JSONDecodeError:
+                    # Partly written last line of an interrupted append
+                    continue
+                if needles is None or entry.get("student_id") == student_id:
+                    yield entry
+    
+    def _migrate_students_file(self):
+        """Create the students directory, splitting the legacy students.json into it if present."""
+        legacy = self._load_json(self.students_file) if os.path.exists(self.students_file) else {}
+        # Built aside and renamed into place, so a half-finished migration is never picked up
+        tmp_dir = self.students_dir + ".tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        for student_id, data in legacy.items():
+            path = os.path.join(tmp_dir, self._shard_name(student_id))
+            if os.path.exists(path):
+                raise RuntimeError(f"Student IDs share the profile file {path}; "
+                                   f"{self.students_file} was not migrated")
+            self._save_json(path, data)
+        os.replace(tmp_dir, self.students_dir)
+    
+    def _rename_unhashed_shards(self):
+        """Rename profile files named by the bare encoded ID (earlier versions) to _shard_name."""
+        for name in os.listdir(self.students_dir):
+            if not name.endswith(".json") or self._shard_id(name) is not None:
+                continue
+            student_id = unquote(name[:-5])
+            target = self._shard_path(student_id)
+            if os.path.exists(target):
+                raise RuntimeError(f"Cannot rename {name}: {target} already exists")
+            os.replace(os.path.join(self.students_dir, name), target)
+    
+    @staticmethod
+    def _id_hash(student_id: str) -> str:
+        return hashlib.blake2b(student_id.encode('utf-8'), digest_size=4).hexdigest()
+    
+    @classmethod
+    def _shard_name(cls, student_id: str) -> str:
+        """
+        File name of a student's profile: a prefix (so no ID becomes a reserved Windows name
+        such as CON or COM1), the percent-encoded ID, and a hash of the exact ID, which keeps
+        IDs differing only in letter case apart on case-insensitive filesystems.
+        """
+        return f"{_SHARD_PREFIX}{quote(student_id, safe='')}.{cls._id_hash(student_id)}.json"
+    
+    @classmethod
+    def _shard_id(cls, name: str) -> Optional[str]:
+        """The student ID a _shard_name belongs to, or None for any other file name."""
+        match = _SHARD_RE.fullmatch(name)
+        if match is None:
+            return None
+        student_id = unquote(match.group(1))
+        return student_id if cls._id_hash(student_id) == match.group(2) else None
+    
+    def _shard_path(self, student_id: str) -> str:
+        return os.path.join(self.students_dir, self._shard_name(student_id))
+    
+    def students_version(self) -> Optional[tuple]:
+        """
+        Version of the stored profiles, for caches of them (here, in the API and in the GUI):
+        a random token that save_student and delete_student replace in every process after
+        each change. Profile files edited other than through StorageManager are not noticed.
+        None if there is no students directory.
+        """
+        if not os.path.isdir(self.students_dir):
+            return None
+        try:
+            with open(self.generation_file, 'rb') as f:
+                token = f.read().decode('ascii').strip()
+        except FileNotFoundError:
+            token = ""
+        if not token:
+            # Removed or emptied since start-up
+            with self._locked():
+                token = self._bump_generation()
+        return (token,)
+    
+    def _bump_generation(self) -> str:
+        """Give the profiles a new version token (call with the storage lock held)."""
+        token = uuid.uuid4().hex
+        tmp_file = f"{self.generation_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(token.encode('ascii'))
+        os.replace(tmp_file, self.generation_file)
+        return token
+    
+    def _read_shard(self, student_id: str, remember: bool = True) -> Optional[Dict]:
+        """
+        One student's stored dict, re-parsed only when its file changed; None if absent.
+        With remember=False a freshly parsed dict is not added to the cache.
+        """
+        path = self._shard_path(student_id)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self._shard_cache.pop(student_id, None)
+            return None
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._shard_cache.get(student_id)
+        if cached is None or cached[0] != key:
+            cached = (key, self._load_json(path))
+            if remember:
+                self._shard_cache[student_id] = cached
+        return cached[1] or None
+    
+    def _write_shard(self, student_id: str, data: Dict):
+        """Write one student's file (via a temporary file and rename) and cache what was written."""
+        path = self._shard_path(student_id)
+        self._replace_json(path, data)
+        stat = os.stat(path)
+        self._shard_cache[student_id] = ((stat.st_mtime_ns, stat.st_size), data)
+    
+    def _load_students(self) -> Dict:
+        """All stored student dicts by ID (sorted), re-reading only files that changed on disk."""
+        with self._lock:
+            key = self.students_version()
+            if key is None:
+                return {}
+            if self._students_cache is None or self._students_cache[0] != key:
+                students = {}
+                for student_id in self.get_all_student_ids():
+                    data = self._read_shard(student_id)
+                    if data is not None:
+                        students[student_id] = data
+                self._students_cache = (key, students)
+            return self._students_cache[1]
+    
+    def _after_write(self, before: Optional[tuple], student_id: str, data: Optional[Dict]):
+        """
+        Bring the in-memory profiles and the summary index up to date after one student's
+        file was written (data) or deleted (None), without re-reading the other students.
+        """
+        after = self.students_version()
+        
+        cached = self._students_cache
+        if cached is not None and cached[0] == before:
+            # A new dict, so iterators over the previous one are unaffected
+            students = dict(cached[1])
+            if data is None:
+                students.pop(student_id, None)
+            else:
+                students[student_id] = data
+            self._students_cache = (after, dict(sorted(students.items())))
+        
+        index = self._index_cache or self._load_json(self.index_file)
+        if index.get("version") != list(before or ()):
+            # The index did not describe the directory as it was before this write
+            self._save_index(self._load_students())
+            return
+        rows = {row["student_id"]: row for row in index["students"]}
+        if data is None:
+            rows.pop(student_id, None)
+        else:
+            rows[student_id] = data
+        self._save_index(rows)
+    
+    def _save_index(self, students: Dict):
+        """Write the summary index for the students (ID -> dict with INDEX_FIELDS) currently on disk."""
+        index = {
+            "version": list(self.students_version() or ()),
+            "students": [
+                {key: data[key] for key in self.INDEX_FIELDS}
+                for _, data in sorted(students.items())
+            ]
+        }
+        self._replace_json(self.index_file, index)
+        self._index_cache = index
+    
+    def load_student_index(self) -> List[Dict]:
+        """
+        Summary rows (student_id, name, major, cgpa, year) of all students, sorted by ID.
+        Read from the small index file; rebuilt from the full profiles if it is missing
+        or was not written for the current students version.
+        """
+        with self._lock:
+            version = list(self.students_version() or ())
+            index = self._index_cache
+            if index is None or index.get("version") != version:
+                index = self._load_json(self.index_file)
+                if index.get("version") != version:
+                    with self._locked():
+                        self._save_index(self._load_students())
+                else:
+                    self._index_cache = index
+            return self._index_cache["students"]
     
     # ==================== Student Profile Management ====================
     
     def save_student(self, student: StudentProfile) -> bool:
         """Save or update a student profile."""
         try:
-            students = self._load_json(self.students_file)
-            students[student.student_id] = self._student_to_dict(student)
-            self._save_json(self.students_file, students)
+            # Only this student's file is written
+            data = self._student_to_dict(student)
+            with self._locked():
+                before = self.students_version()
+                self._write_shard(student.student_id, data)
+                self._bump_generation()
+                self._after_write(before, student.student_id, data)
             return True
         except Exception as e:
             print(f"Error saving student: {e}")
@@ -55,79 +440,147 @@ class StorageManager:
     
     def load_student(self, student_id: str) -> Optional[StudentProfile]:
         """Load a student profile by ID."""
-        students = self._load_json(self.students_file)
-        if student_id in students:
-            return self._dict_to_student(students[student_id])
+        data = self._read_shard(student_id)
+        if data is not None:
+            return self._dict_to_student(data)
         return None
     
     def load_all_students(self) -> Dict[str, StudentProfile]:
         """Load all student profiles."""
-        students = self._load_json(self.students_file)
+        students = self._load_students()
         return {sid: self._dict_to_student(data) for sid, data in students.items()}
     
+    def iter_students(self) -> Iterator[StudentProfile]:
+        """
+        Yield student profiles one at a time in ID order, reading and converting each
+        file only when it is reached; profiles not already cached are not kept.
+        """
+        for student_id in self.get_all_student_ids():
+            data = self._read_shard(student_id, remember=False)
+            if data is not None:
+                yield self._dict_to_student(data)
+    
     def delete_student(self, student_id: str) -> bool:
         """Delete a student profile."""
         try:
-            students = self._load_json(self.students_file)
-            if student_id in students:
-                del students[student_id]
-                self._save_json(self.students_file, students)
-                return True
-            return False
+            with self._locked():
+                before = self.students_version()
+                try:
+                    os.remove(self._shard_path(student_id))
+                except FileNotFoundError:
+                    return False
+                self._shard_cache.pop(student_id, None)
+                self._bump_generation()
+                self._after_write(before, student_id, None)
+            return True
         except Exception as e:
             print(f"Error deleting student: {e}")
             return False
     
     def student_exists(self, student_id: str) -> bool:
         """Check if a student profile exists."""
-        students = self._load_json(self.students_file)
-        return student_id in students
+        return os.path.exists(self._shard_path(student_id))
     
     def get_all_student_ids(self) -> List[str]:
         """Get list of all student IDs."""
-        students = self._load_json(self.students_file)
-        return sorted(list(students.keys()))
+        try:
+            names = os.listdir(self.students_dir)
+        except OSError:
+            return []
+        return sorted(filter(None, map(self._shard_id, names)))
     
     # ==================== Recommendation History Management ====================
     
     def save_recommendation(self, student_id: str, student_name: str, 
-                          recommendations: List[Dict], ml_used: bool = False) -> bool:
-        """Save a recommendation to history."""
+                          recommendations: List[Dict], ml_used: bool = False,
+                          rendered: Optional[Dict] = None) -> bool:
+        """Save a recommendation to history, optionally with a caller's pre-rendered display form."""
+        return self.add_history_entry(student_id, student_name, recommendations,
+                                      ml_used, rendered) is not None
+    
+    def add_history_entry(self, student_id: str, student_name: str,
+                          recommendations: List[Dict], ml_used: bool = False,
+                          rendered: Optional[Dict] = None) -> Optional[Dict]:
+        """Like save_recommendation, but returns the stored entry (None on failure)."""
         try:
-            history = self._load_json(self.history_file)
-            
             entry = {
+                "id": str(uuid.uuid4()),
                 "timestamp": datetime.now().isoformat(),
                 "student_id": student_id,
                 "student_name": student_name,
                 "recommendations": recommendations,
                 "ml_used": ml_used
             }
+            if rendered is not None:
+                entry["rendered"] = rendered
             
-            history.append(entry)
-            self._save_json(self.history_file, history)
-            return True
+            # Appended as a single line; earlier entries are not rewritten
+            with self._locked():
+                with open(self.history_file, 'ab') as f:
+                    f.write(_dumps(entry) + b"\n")
+                self._bump_stats(total_recommendations=len(recommendations), history_entries=1)
+            return entry
         except Exception as e:
             print(f"Error saving recommendation: {e}")
-            return False
+            return None
     
     def load_recommendation_history(self, student_id: Optional[str] = None) -> List[Dict]:
         """Load recommendation history, optionally filtered by student ID."""
-        history = self._load_json(self.history_file)
-        
-        if student_id:
-            return [entry for entry in history if entry["student_id"] == student_id]
-        return history
+        return list(self._iter_history(student_id))
     
     def clear_history(self) -> bool:
         """Clear all recommendation history."""
         try:
-            self._save_json(self.history_file, [])
+            with self._locked():
+                open(self.history_file, 'wb').close()
+                self._replace_json(self.stats_file, {key: 0 for key in self.STAT_KEYS})
             return True
         except Exception as e:
             print(f"Error clearing history: {e}")
             return False
     
+    # ==================== Counters ====================
+    
+    def _rebuild_stats(self) -> Dict:
+        """Recompute the counters file from the full history."""
+        with self._locked():
+            total_recommendations = history_entries = 0
+            for entry in self._iter_history():
+                total_recommendations += len(entry.get("recommendations", []))
+                history_entries += 1
+            stats = {
+                "total_recommendations": total_recommendations,
+                "history_entries": history_entries
+            }
+            self._replace_json(self.stats_file, stats)
+        return stats
+    
+    def _load_stats(self) -> Dict:
+        """Load the counters file, rebuilding it if it is missing or damaged."""
+        stats = self._load_json(self.stats_file)
+        if any(key not in stats for key in self.STAT_KEYS):
+            stats = self._rebuild_stats()
+        return stats
+    
+    def _bump_stats(self, **deltas: int):
+        """Adjust maintained counters by the given deltas in a single write."""
+        with self._locked():
+            stats = self._load_stats()
+            stats = {key: max(0, stats[key] + deltas.get(key, 0)) for key in self.STAT_KEYS}
+            self._replace_json(self.stats_file, stats)
+    
+    def get_counters(self) -> Dict[str, int]:
+        """History counters from one read of the counters file, plus the student count."""
+        return {**self._load_stats(), "total_students": self.count_students()}
+    
+    def count_students(self) -> int:
+        """Number of stored student profiles (profile files), without loading them."""
+        return len(self.get_all_student_ids())
+    
+    def count_recommendations(self) -> int:
+        """Total recommendations saved across all history entries, without loading the history."""
+        return self._load_stats()["total_recommendations"]
+    
     # ==================== Conversion Methods ====================
     
     def _student_to_dict(self, student: StudentProfile) -> Dict:
@@ -146,6 +599,16 @@ class StorageManager:
             "completed_courses": list(student.completed_courses)
         }
     
+    def student_fingerprint(self, student: StudentProfile) -> str:
+        """
+        Short hash of everything stored for a profile; equal for profiles that save the same,
+        whatever the order of their completed courses.
+        """
+        data = self._student_to_dict(student)
+        data["completed_courses"] = sorted(data["completed_courses"])
+        encoded = json.dumps(data, sort_keys=True, ensure_ascii=False).encode('utf-8')
+        return hashlib.blake2b(encoded, digest_size=8).hexdigest()
+    
     def _dict_to_student(self, data: Dict) -> StudentProfile:
         """Convert dictionary to StudentProfile object."""
         student = StudentProfile(
@@ -160,17 +623,17 @@ class StorageManager:
         
         # Add skills
         for skill_name, level_value in data.get("skills", {}).items():
-            student.skills[skill_name] = Proficiency(level_value)
+            student.skills[skill_name] = _PROF_BY_VALUE[level_value]
         
         # Add interests
         for interest_name, level_value in data.get("interests", {}).items():
-            student.interests[interest_name] = InterestLevel(level_value)
+            student.interests[interest_name] = _INT_BY_VALUE[level_value]
         
         # Add preferred domains
-        student.preferred_domains = data.get("preferred_domains", [])
+        student.preferred_domains = list(data.get("preferred_domains", []))
         
-        # Add completed courses
-        student.completed_courses = set(data.get("completed_courses", []))
+        # Add completed courses, interned like the knowledge base's course names
+        student.completed_courses = set(map(sys.intern, data.get("completed_courses", [])))
         
         return student
     
@@ -180,8 +643,8 @@ class StorageManager:
         """Export all data to a single JSON file."""
         try:
             all_data = {
-                "students": self._load_json(self.students_file),
-                "history": self._load_json(self.history_file),
+                "students": dict(self._load_students()),
+                "history": self.load_recommendation_history(),
                 "export_date": datetime.now().isoformat()
             }
             self._save_json(export_path, all_data)
@@ -192,14 +655,13 @@ class StorageManager:
     
     def get_statistics(self) -> Dict:
         """Get storage statistics."""
-        students = self._load_json(self.students_file)
-        history = self._load_json(self.history_file)
+        stats = self._load_stats()
         
         return {
-            "total_students": len(students),
-            "total_recommendations": len(history),
+            "total_students": self.count_students(),
+            "total_recommendations": stats["history_entries"],
             "storage_size_kb": (
-                os.path.getsize(self.students_file) + 
+                sum(entry.stat().st_size for entry in os.scandir(self.students_dir)) +
                 os.path.getsize(self.history_file)
             ) / 1024
         }
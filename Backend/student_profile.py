@@ -14,6 +14,10 @@ class InterestLevel(Enum):
     HIGH = 3
     VERY_HIGH = 4
 
+# Member name by integer value (index 0 unused), for naming raw levels without the Enum machinery
+PROFICIENCY_NAMES = ("",) + tuple(member.name for member in Proficiency)
+INTEREST_NAMES = ("",) + tuple(member.name for member in InterestLevel)
+
 @dataclass
 class Skill:
     name: str
@@ -53,9 +57,10 @@ class StudentProfile:
         self.skills[name.lower()] = level
 
     def add_interest(self, domain: str, level: InterestLevel):
-        self.interests[domain.lower()] = level
-        if level in [InterestLevel.HIGH, InterestLevel.VERY_HIGH] and domain.lower() not in self.preferred_domains:
-            self.preferred_domains.append(domain.lower())
+        key = domain.lower()
+        self.interests[key] = level
+        if level in [InterestLevel.HIGH, InterestLevel.VERY_HIGH] and key not in self.preferred_domains:
+            self.preferred_domains.append(key)
 
     def has_skill(self, skill_name: str, min_level: Proficiency = Proficiency.NOVICE) -> bool:
         skill_key = skill_name.lower()
@@ -63,5 +68,10 @@ class StudentProfile:
             return False
         return self.skills[skill_key].value >= min_level.value
 
+    def has_skill_raw(self, key: str, min_level: int = 1) -> bool:
+        """has_skill for a key already in stored (lowercase) form, with a plain integer level."""
+        level = self.skills.get(key)
+        return level is not None and level.value >= min_level
+
     def get_skill_level(self, skill_name: str) -> Proficiency:
         return self.skills.get(skill_name.lower(), Proficiency.NOVICE)
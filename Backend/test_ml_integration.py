@@ -3,10 +3,17 @@ Test script for ML cold start integration.
 Tests the hybrid recommender system with edge cases.
 """
 
+from functools import lru_cache
 from student_profile import StudentProfile, Proficiency, InterestLevel
 from fyp_recommender import FYPRecommender
 
 
+@lru_cache(maxsize=None)
+def get_recommender(enable_ml_fallback: bool = True) -> FYPRecommender:
+    """One recommender per configuration, shared by the scenarios (they only read from it)."""
+    return FYPRecommender(enable_ml_fallback=enable_ml_fallback)
+
+
 def test_cold_start_student():
     """Test a student with very low qualifications (cold start scenario)."""
     print("="*70)
@@ -14,7 +21,7 @@ def test_cold_start_student():
     print("="*70)
     print()
     
-    recommender = FYPRecommender()
+    recommender = get_recommender()
     
     # Create a student who would normally get NO recommendations
     cold_start_student = StudentProfile(
@@ -49,7 +56,7 @@ def test_normal_student():
     print("="*70)
     print()
     
-    recommender = FYPRecommender()
+    recommender = get_recommender()
     
     # Create a normal student
     normal_student = StudentProfile(
@@ -88,7 +95,7 @@ def test_borderline_student():
     print("="*70)
     print()
     
-    recommender = FYPRecommender()
+    recommender = get_recommender()
     
     # Create a borderline student
     borderline_student = StudentProfile(
@@ -125,7 +132,7 @@ def test_ml_disabled():
     print("="*70)
     print()
     
-    recommender = FYPRecommender(enable_ml_fallback=False)
+    recommender = get_recommender(enable_ml_fallback=False)
     
     # Same cold start student
     cold_start_student = StudentProfile(
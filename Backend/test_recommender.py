@@ -4,11 +4,17 @@ from knowledge_base import KnowledgeBase, TopicTemplate, TopicRequirement
 from inference_engine import InferenceEngine
 from recommendation_engine import RecommendationEngine
 from fyp_recommender import FYPRecommender
+from scoring_kernels import topic_scores
 
 class TestRecommenderSystem(unittest.TestCase):
     
+    @classmethod
+    def setUpClass(cls):
+        # Built once; tests only read it (each gets its own student below)
+        cls._recommender = FYPRecommender()
+    
     def setUp(self):
-        self.recommender = FYPRecommender()
+        self.recommender = self._recommender
         self.kb = self.recommender.kb
         self.inference = self.recommender.inference_engine
         
@@ -49,6 +55,58 @@ class TestRecommenderSystem(unittest.TestCase):
         passed, reasons = self.inference.check_hard_constraints(self.student, topic)
         self.assertTrue(passed)
 
+    def test_hard_constraint_mask_matches_per_topic_check(self):
+        self.student.completed_courses.update(["Data Structures", "Web Engineering"])
+        self.student.max_weekly_hours = 15
+        mask = self.inference.hard_constraint_mask(self.student, self.kb)
+        
+        self.assertEqual(len(mask), len(self.kb.topic_list))
+        for passed, topic in zip(mask, self.kb.topic_list):
+            self.assertEqual(bool(passed), self.inference.check_hard_constraints(self.student, topic)[0])
+
+    def test_fused_topic_scores_match_per_topic_score(self):
+        self.student.add_skill("Python", Proficiency.ADVANCED)
+        self.student.add_skill("SQL", Proficiency.NOVICE)
+        self.student.add_interest("Data Science", InterestLevel.HIGH)
+        self.student.preferred_domains = ["web development"]
+        engine = self.recommender.recommendation_engine
+        preferred = frozenset(self.student.preferred_domains)
+
+        levels = engine._encode_skills(self.student)[0]
+        interest_pts, pref_pts, difficulty_pts = engine._score_tables(self.student, preferred)
+        feasibility, scores = topic_scores(
+            self.kb.topic_skill_indptr, self.kb.topic_skill_idx, self.kb.topic_skill_prof, levels,
+            self.kb.topic_domain, interest_pts, pref_pts, self.kb.topic_difficulty, difficulty_pts
+        )
+        for i, topic in enumerate(self.kb.topic_list):
+            feas = self.inference.evaluate_technical_feasibility(self.student, topic)[0]
+            self.assertEqual(feasibility[i], feas)
+            self.assertEqual(scores[i], engine._calculate_score(self.student, topic, feas, preferred))
+
+    def test_ml_relaxed_feasibility_matches_per_topic_check(self):
+        self.student.cgpa = 2.6
+        self.student.max_weekly_hours = 12
+        self.student.add_skill("Python", Proficiency.EXPERT)
+        self.student.add_skill("JavaScript", Proficiency.NOVICE)
+        self.student.completed_courses.update(["Web Engineering"])
+        ml = self.recommender.ml_recommender
+        
+        feasibility = ml._relaxed_feasibility(self.student)
+        for score, topic in zip(feasibility, ml.topic_list):
+            self.assertEqual(score, ml._check_relaxed_constraints(self.student, topic)[0])
+
+    def test_ml_batch_recommendations_match_single(self):
+        self.student.add_skill("Python", Proficiency.INTERMEDIATE)
+        self.student.add_interest("Data Science", InterestLevel.HIGH)
+        other = StudentProfile(student_id="T002", name="Other", cgpa=2.4, major="CS", year=4)
+        other.add_interest("Web Development", InterestLevel.MEDIUM)
+        ml = self.recommender.ml_recommender
+        
+        batch = ml.get_recommendations_batch([self.student, other, self.student], top_n=4)
+        for student, recs in zip([self.student, other, self.student], batch):
+            single = ml.get_recommendations(student, top_n=4)
+            self.assertEqual([(r.topic.id, r.score) for r in recs], [(r.topic.id, r.score) for r in single])
+
     def test_recommendation_scoring(self):
         # Add profile matching Web Dev
         self.student.add_skill("Python", Proficiency.INTERMEDIATE)
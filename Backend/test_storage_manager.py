@@ -0,0 +1,148 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import storage_manager
+from storage_manager import StorageManager
+from student_profile import StudentProfile
+
+
+def _entry(student_id, n, count=1):
+    return {
+        "id": f"{student_id}-{n}",
+        "timestamp": f"2025-01-01T00:00:{n:02d}",
+        "student_id": student_id,
+        "student_name": f"Student {student_id}",
+        "recommendations": [{"topic_id": f"T{i}", "title": "Topic", "score": 50.0} for i in range(count)],
+        "ml_used": False
+    }
+
+
+class TestRecommendationHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.data_dir, ignore_errors=True)
+        self.history_file = os.path.join(self.data_dir, "recommendations_history.jsonl")
+        self.legacy_file = os.path.join(self.data_dir, "recommendations_history.json")
+
+    def _write_legacy(self, content: str):
+        with open(self.legacy_file, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    def test_legacy_array_migrates_in_order(self):
+        legacy = [_entry("S1", 1, 2), _entry("S2", 2), _entry("S1", 3, 3)]
+        self._write_legacy(json.dumps(legacy))
+
+        storage = StorageManager(self.data_dir)
+        self.assertEqual(storage.load_recommendation_history(), legacy)
+        with open(self.history_file, 'rb') as f:
+            self.assertEqual(len(f.readlines()), 3)
+        self.assertEqual(storage.count_recommendations(), 6)
+        self.assertEqual(storage.get_counters()["history_entries"], 3)
+
+    def test_legacy_array_migrates_without_ijson(self):
+        legacy = [_entry("S1", 1), _entry("S2", 2)]
+        self._write_legacy(json.dumps(legacy))
+
+        with mock.patch.object(storage_manager, "IJSON_AVAILABLE", False):
+            storage = StorageManager(self.data_dir)
+        self.assertEqual(storage.load_recommendation_history(), legacy)
+
+    def test_damaged_legacy_array_migrates_as_empty(self):
+        self._write_legacy(json.dumps([_entry("S1", 1), _entry("S2", 2)])[:-40])
+
+        storage = StorageManager(self.data_dir)
+        self.assertEqual(storage.load_recommendation_history(), [])
+        self.assertEqual(storage.count_recommendations(), 0)
+
+    def test_filter_by_non_ascii_student_id(self):
+        storage = StorageManager(self.data_dir)
+        storage.add_history_entry("Zoë", "Zoë", [{"topic_id": "T1"}])
+        storage.add_history_entry("Zoë2", "Zoë Two", [{"topic_id": "T2"}])
+        storage.add_history_entry("S1", "Someone", [{"topic_id": "T3"}])
+        storage.add_history_entry("Zoë", "Zoë", [{"topic_id": "T4"}])
+
+        history = storage.load_recommendation_history("Zoë")
+        self.assertEqual([e["recommendations"][0]["topic_id"] for e in history], ["T1", "T4"])
+        self.assertEqual(len(storage.load_recommendation_history()), 4)
+
+    def test_filter_matches_lines_written_with_spaces(self):
+        # Lines written by the json module put a space after the colon
+        StorageManager(self.data_dir)
+        with open(self.history_file, 'w', encoding='utf-8') as f:
+            for entry in (_entry("S1", 1), _entry("S2", 2), _entry("S1", 3)):
+                f.write(json.dumps(entry) + "\n")
+
+        storage = StorageManager(self.data_dir)
+        self.assertEqual([e["id"] for e in storage.load_recommendation_history("S1")], ["S1-1", "S1-3"])
+
+    def test_truncated_last_line_is_skipped(self):
+        storage = StorageManager(self.data_dir)
+        storage.add_history_entry("S1", "One", [{"topic_id": "T1"}])
+        storage.add_history_entry("S1", "One", [{"topic_id": "T2"}])
+        # An append interrupted part-way through its line
+        with open(self.history_file, 'ab') as f:
+            f.write(json.dumps(_entry("S1", 9)).encode('utf-8')[:30])
+
+        history = storage.load_recommendation_history("S1")
+        self.assertEqual([e["recommendations"][0]["topic_id"] for e in history], ["T1", "T2"])
+        self.assertEqual(len(storage.load_recommendation_history()), 2)
+
+    def test_clear_history_resets_log_and_counters(self):
+        storage = StorageManager(self.data_dir)
+        storage.add_history_entry("S1", "One", [{"topic_id": "T1"}, {"topic_id": "T2"}])
+        self.assertEqual(storage.count_recommendations(), 2)
+
+        self.assertTrue(storage.clear_history())
+        self.assertEqual(storage.load_recommendation_history(), [])
+        self.assertEqual(storage.count_recommendations(), 0)
+
+
+class TestStudentFiles(unittest.TestCase):
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.data_dir, ignore_errors=True)
+        self.students_dir = os.path.join(self.data_dir, "students")
+
+    def test_file_names_are_case_and_reserved_name_safe(self):
+        storage = StorageManager(self.data_dir)
+        ids = ["s001", "S001", "CON", "com1", "a/b.c", "Zoë"]
+        for student_id in ids:
+            self.assertTrue(storage.save_student(StudentProfile(student_id, f"Name {student_id}", 3.0, "CS", 4)))
+
+        names = os.listdir(self.students_dir)
+        # Distinct even where letter case is ignored, and none a bare reserved name
+        self.assertEqual(len({name.lower() for name in names}), len(ids))
+        self.assertFalse({"con.json", "com1.json"} & {name.lower() for name in names})
+        self.assertEqual(storage.get_all_student_ids(), sorted(ids))
+        self.assertEqual(storage.load_student("S001").name, "Name S001")
+        self.assertEqual(storage.load_student("s001").name, "Name s001")
+
+    def test_legacy_students_file_is_split(self):
+        legacy = {sid: {"student_id": sid, "name": sid, "cgpa": 3.0, "major": "CS", "year": 4}
+                  for sid in ("S1", "s1", "NUL")}
+        os.makedirs(self.data_dir, exist_ok=True)
+        with open(os.path.join(self.data_dir, "students.json"), 'w', encoding='utf-8') as f:
+            json.dump(legacy, f)
+
+        storage = StorageManager(self.data_dir)
+        self.assertEqual(storage.get_all_student_ids(), sorted(legacy))
+        self.assertEqual(storage.count_students(), 3)
+
+    def test_files_of_earlier_naming_are_renamed(self):
+        os.makedirs(self.students_dir)
+        with open(os.path.join(self.students_dir, "X%251.json"), 'w', encoding='utf-8') as f:
+            json.dump({"student_id": "X%1", "name": "X", "cgpa": 3.0, "major": "CS", "year": 4}, f)
+
+        storage = StorageManager(self.data_dir)
+        self.assertEqual(storage.get_all_student_ids(), ["X%1"])
+        self.assertNotIn("X%251.json", os.listdir(self.students_dir))
+
+
+if __name__ == '__main__':
+    unittest.main()
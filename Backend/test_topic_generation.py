@@ -9,7 +9,7 @@ def main():
     print("DYNAMIC TOPIC GENERATION DEMONSTRATION")
     print("="*70)
     
-    kb = KnowledgeBase()
+    kb = KnowledgeBase.load_or_build()
     
     # Show statistics
     print(f"\n📊 Total Topics Generated: {kb.get_total_topic_count()}")
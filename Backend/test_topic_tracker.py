@@ -0,0 +1,112 @@
+import csv
+import os
+import shutil
+import tempfile
+import unittest
+
+from topic_tracker import TopicTracker
+
+
+class TestTopicTracker(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir, ignore_errors=True)
+        self.csv_file = os.path.join(self.tmp_dir, "selected_topics.csv")
+        self.db_file = os.path.join(self.tmp_dir, "selected_topics.db")
+
+    def _tracker(self) -> TopicTracker:
+        tracker = TopicTracker(self.csv_file, db_file=self.db_file)
+        self.addCleanup(lambda: tracker._connect().close())
+        return tracker
+
+    def _seed_csv(self, rows):
+        with open(self.csv_file, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['student_id', 'student_name', 'topic_id', 'topic_title', 'score', 'selected_date'])
+            writer.writerows(rows)
+
+    def test_csv_is_imported_into_new_database(self):
+        self._seed_csv([
+            ("S2", "Second", "T9", "Topic Nine", "71.5", "2025-01-02 10:00:00"),
+            ("S1", "First", "T3", "Topic Three", "88.25", "2025-01-01 09:00:00"),
+        ])
+        tracker = self._tracker()
+
+        self.assertEqual(tracker.get_selected_topics(), [
+            {'student_id': "S2", 'student_name': "Second", 'topic_id': "T9", 'topic_title': "Topic Nine",
+             'score': "71.50", 'selected_date': "2025-01-02 10:00:00"},
+            {'student_id': "S1", 'student_name': "First", 'topic_id': "T3", 'topic_title': "Topic Three",
+             'score': "88.25", 'selected_date': "2025-01-01 09:00:00"},
+        ])
+        self.assertFalse(tracker.is_topic_available("T3"))
+        self.assertEqual(tracker.get_student_selection("S2")['topic_id'], "T9")
+
+    def test_csv_is_not_imported_again(self):
+        self._seed_csv([("S1", "First", "T3", "Topic Three", "88.25", "2025-01-01 09:00:00")])
+        self._tracker().clear_all_selections()
+
+        self.assertEqual(self._tracker().get_selected_topics(), [])
+
+    def test_taken_topic_or_student_is_rejected(self):
+        tracker = self._tracker()
+        self.assertTrue(tracker.save_selection("S1", "First", "T1", "Topic One", 80.123))
+        self.assertEqual(tracker.get_student_selection("S1")['score'], "80.12")
+
+        # Topic already taken by S1, and S1 already has a topic
+        self.assertFalse(tracker.save_selection("S2", "Second", "T1", "Topic One", 70))
+        self.assertFalse(tracker.save_selection("S1", "First", "T2", "Topic Two", 75))
+
+        self.assertEqual(tracker.get_unavailable_topic_ids(), ["T1"])
+        self.assertIsNone(tracker.get_student_selection("S2"))
+        self.assertTrue(tracker.is_topic_available("T2"))
+
+    def test_bulk_save_reports_each_entry(self):
+        tracker = self._tracker()
+        tracker.save_selection("S0", "Zero", "T0", "Topic Zero", 50)
+
+        saved = tracker.save_selections_bulk([
+            {'student_id': "S1", 'student_name': "One", 'topic_id': "T1", 'topic_title': "A", 'score': 60},
+            {'student_id': "S2", 'student_name': "Two", 'topic_id': "T0", 'topic_title': "B", 'score': 61},
+            {'student_id': "S3", 'student_name': "Three", 'topic_id': "T1", 'topic_title': "C", 'score': 62},
+            {'student_id': "S1", 'student_name': "One", 'topic_id': "T4", 'topic_title': "D", 'score': 63},
+            {'student_id': "S5", 'student_name': "Five", 'topic_id': "T5", 'topic_title': "E", 'score': "64.5",
+             'selected_date': "2025-03-01 12:00:00"},
+        ])
+
+        self.assertEqual(saved, [True, False, False, False, True])
+        self.assertEqual(tracker.get_unavailable_topic_ids(), ["T0", "T1", "T5"])
+        self.assertEqual(tracker.get_student_selection("S5")['selected_date'], "2025-03-01 12:00:00")
+        self.assertEqual(tracker.save_selections_bulk([]), [])
+
+    def test_version_changes_only_on_writes(self):
+        tracker = self._tracker()
+        start = tracker.version()
+
+        tracker.save_selection("S1", "First", "T1", "Topic One", 80)
+        after_save = tracker.version()
+        self.assertNotEqual(after_save, start)
+
+        # Rejected saves and reads leave it unchanged
+        tracker.save_selection("S2", "Second", "T1", "Topic One", 70)
+        tracker.save_selections_bulk([
+            {'student_id': "S1", 'student_name': "First", 'topic_id': "T2", 'topic_title': "B", 'score': 1}
+        ])
+        tracker.get_selected_topics()
+        self.assertEqual(tracker.version(), after_save)
+
+        tracker.clear_all_selections()
+        self.assertNotEqual(tracker.version(), after_save)
+
+    def test_version_is_shared_between_trackers(self):
+        first = self._tracker()
+        second = self._tracker()
+        before = second.version()
+
+        first.save_selection("S1", "First", "T1", "Topic One", 80)
+        self.assertNotEqual(second.version(), before)
+        self.assertFalse(second.is_topic_available("T1"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,152 +1,232 @@
 import csv
 import os
+import sqlite3
+import threading
 from datetime import datetime
 from typing import List, Dict, Optional, Tuple
 
+# Score is stored as a number and read back in the two-decimal form the CSV file used
+_SELECT_COLUMNS = ("student_id, student_name, topic_id, topic_title, "
+                   "printf('%.2f', score) AS score, selected_date")
+# Format of selected_date
+_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
 class TopicTracker:
     """
-    Manages topic selections using CSV file storage.
-    Prevents topic overlap by tracking which students have selected which topics.
+    Manages topic selections using SQLite storage.
+    Prevents topic overlap by tracking which students have selected which topics;
+    the table's unique keys enforce one selection per student and per topic.
     """
-    def __init__(self, csv_file: str = "selected_topics.csv"):
+    def __init__(self, csv_file: str = "selected_topics.csv", db_file: Optional[str] = None):
+        # Former CSV store; imported once when the database is first created
         self.csv_file = csv_file
+        self.db_file = db_file or os.path.splitext(csv_file)[0] + ".db"
         self.fieldnames = ['student_id', 'student_name', 'topic_id', 'topic_title', 'score', 'selected_date']
-        self._initialize_csv()
-    
-    def _initialize_csv(self):
-        """Create CSV file with headers if it doesn't exist."""
-        if not os.path.exists(self.csv_file):
-            with open(self.csv_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=self.fieldnames)
-                writer.writeheader()
-    
-    def save_selection(self, student_id: str, student_name: str, topic_id: str, 
+        # sqlite3 connections are per thread (the API server and GUI use worker threads)
+        self._local = threading.local()
+        self._initialize_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        """This thread's connection to the database, opened on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_file, timeout=10)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def _initialize_db(self):
+        """Create the selections table if it doesn't exist, importing the CSV file into a new database."""
+        is_new = not os.path.exists(self.db_file)
+        conn = self._connect()
+        # Readers do not block the writer (or each other) across processes
+        conn.execute("PRAGMA journal_mode=WAL")
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS selections (
+                    student_id TEXT PRIMARY KEY,
+                    student_name TEXT,
+                    topic_id TEXT UNIQUE,
+                    topic_title TEXT,
+                    score REAL,
+                    selected_date TEXT
+                )
+            """)
+        if is_new and os.path.exists(self.csv_file):
+            with open(self.csv_file, 'r', newline='', encoding='utf-8') as f:
+                rows = list(csv.DictReader(f))
+            if rows:
+                self._insert_rows([
+                    self._make_row(r['student_id'], r['student_name'], r['topic_id'],
+                                   r['topic_title'], float(r['score']), r['selected_date'])
+                    for r in rows
+                ])
+
+    def version(self) -> int:
+        """Counter bumped by every change to the selections, from any process."""
+        return self._connect().execute("PRAGMA user_version").fetchone()[0]
+
+    def _insert_rows(self, rows: List[Tuple]) -> List[bool]:
+        """Insert rows in one transaction; a row clashing with an existing student or topic is skipped."""
+        conn = self._connect()
+        with conn:
+            saved = [
+                conn.execute(
+                    "INSERT INTO selections VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT DO NOTHING", row
+                ).rowcount == 1
+                for row in rows
+            ]
+            if any(saved):
+                self._bump_version(conn)
+        return saved
+
+    @staticmethod
+    def _bump_version(conn: sqlite3.Connection):
+        # Runs inside the write transaction, so concurrent writers cannot interleave
+        current = conn.execute("PRAGMA user_version").fetchone()[0]
+        conn.execute(f"PRAGMA user_version = {current + 1}")
+
+    def save_selection(self, student_id: str, student_name: str, topic_id: str,
                       topic_title: str, score: float) -> bool:
         """
-        Save a student's topic selection to the CSV file.
-        
+        Save a student's topic selection to the database.
+
         Args:
             student_id: Student's unique identifier
             student_name: Student's name
             topic_id: Selected topic's ID
             topic_title: Selected topic's title
             score: Recommendation score for this topic
-            
+
         Returns:
             True if saved successfully, False if topic already selected
         """
-        # Check if topic is already selected
-        if not self.is_topic_available(topic_id):
-            return False
-        
-        # Check if student already has a selection
-        existing = self.get_student_selection(student_id)
-        if existing:
-            print(f"Warning: Student {student_id} already selected topic {existing['topic_id']}")
-            return False
-        
-        # Save the selection
-        with open(self.csv_file, 'a', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=self.fieldnames)
-            writer.writerow({
-                'student_id': student_id,
-                'student_name': student_name,
-                'topic_id': topic_id,
-                'topic_title': topic_title,
-                'score': f"{score:.2f}",
-                'selected_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            })
-        
-        return True
-    
+        # The unique keys reject a taken topic or a second selection by the same student
+        if self._insert_rows([self._make_row(student_id, student_name, topic_id, topic_title, score)])[0]:
+            return True
+
+        if self.is_topic_available(topic_id):
+            existing = self.get_student_selection(student_id)
+            if existing:
+                print(f"Warning: Student {student_id} already selected topic {existing['topic_id']}")
+        return False
+
+    def save_selections_bulk(self, entries: List[Dict]) -> List[bool]:
+        """
+        Save several selections in a single transaction.
+
+        Args:
+            entries: Dicts with student_id, student_name, topic_id, topic_title and score
+                     (and optionally selected_date)
+
+        Returns:
+            One flag per entry: True if saved, False if skipped because the topic or the
+            student already had a selection (including earlier entries of the same batch)
+        """
+        if not entries:
+            return []
+        # One timestamp for the whole batch
+        now = datetime.now().strftime(_DATE_FORMAT)
+        return self._insert_rows([
+            self._make_row(entry['student_id'], entry['student_name'], entry['topic_id'],
+                           entry['topic_title'], float(entry['score']), entry.get('selected_date') or now)
+            for entry in entries
+        ])
+
+    def _make_row(self, student_id: str, student_name: str, topic_id: str, topic_title: str,
+                  score: float, selected_date: Optional[str] = None) -> Tuple:
+        return (
+            student_id,
+            student_name,
+            topic_id,
+            topic_title,
+            round(score, 2),
+            selected_date or datetime.now().strftime(_DATE_FORMAT)
+        )
+
     def is_topic_available(self, topic_id: str) -> bool:
         """
         Check if a topic is still available (not selected by another student).
-        
+
         Args:
             topic_id: Topic ID to check
-            
+
         Returns:
             True if available, False if already selected
         """
-        selected_topics = self.get_selected_topics()
-        return topic_id not in [t['topic_id'] for t in selected_topics]
-    
+        row = self._connect().execute(
+            "SELECT 1 FROM selections WHERE topic_id = ? LIMIT 1", (topic_id,)
+        ).fetchone()
+        return row is None
+
     def get_selected_topics(self) -> List[Dict[str, str]]:
         """
-        Get all selected topics from the CSV file.
-        
+        Get all selected topics, in the order they were selected.
+
         Returns:
             List of dictionaries containing selection information
         """
-        if not os.path.exists(self.csv_file):
-            return []
-        
-        selections = []
-        with open(self.csv_file, 'r', newline='', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                selections.append(row)
-        
-        return selections
-    
+        rows = self._connect().execute(
+            f"SELECT {_SELECT_COLUMNS} FROM selections ORDER BY rowid"
+        ).fetchall()
+        return [dict(row) for row in rows]
+
     def get_student_selection(self, student_id: str) -> Optional[Dict[str, str]]:
         """
         Get a specific student's topic selection.
-        
+
         Args:
             student_id: Student's unique identifier
-            
+
         Returns:
             Dictionary with selection info or None if no selection
         """
-        selections = self.get_selected_topics()
-        for selection in selections:
-            if selection['student_id'] == student_id:
-                return selection
-        return None
-    
+        row = self._connect().execute(
+            f"SELECT {_SELECT_COLUMNS} FROM selections WHERE student_id = ?", (student_id,)
+        ).fetchone()
+        return dict(row) if row is not None else None
+
     def get_unavailable_topic_ids(self) -> List[str]:
         """
         Get list of all topic IDs that are no longer available.
-        
+
         Returns:
             List of topic IDs that have been selected
         """
-        selections = self.get_selected_topics()
-        return [s['topic_id'] for s in selections]
-    
+        rows = self._connect().execute("SELECT topic_id FROM selections ORDER BY rowid").fetchall()
+        return [row[0] for row in rows]
+
     def display_all_selections(self) -> str:
         """
         Generate a formatted string showing all topic selections.
-        
+
         Returns:
             Formatted string with all selections
         """
         selections = self.get_selected_topics()
-        
+
         if not selections:
             return "No topics have been selected yet."
-        
+
         output = "\n" + "="*70 + "\n"
         output += "SELECTED TOPICS REGISTRY\n"
         output += "="*70 + "\n\n"
-        
+
         for i, sel in enumerate(selections, 1):
             output += f"{i}. Student: {sel['student_name']} (ID: {sel['student_id']})\n"
             output += f"   Topic: {sel['topic_title']} (ID: {sel['topic_id']})\n"
             output += f"   Score: {sel['score']}\n"
             output += f"   Selected: {sel['selected_date']}\n\n"
-        
+
         return output
-    
+
     def clear_all_selections(self) -> None:
         """
-        Clear all topic selections from the CSV file.
+        Clear all topic selections from the database.
         Useful for resetting the system for testing.
         """
-        with open(self.csv_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=self.fieldnames)
-            writer.writeheader()
-        print(f"✓ All topic selections cleared from {self.csv_file}")
-
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM selections")
+            self._bump_version(conn)
+        print(f"✓ All topic selections cleared from {self.db_file}")
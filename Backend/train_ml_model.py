@@ -3,16 +3,87 @@ Training script for the ML-based recommender system.
 Run this script to train and save the content-based filtering model.
 
 Usage:
-    python train_ml_model.py
+    python train_ml_model.py            # retrains only if the saved model is out of date
+    python train_ml_model.py --force    # always retrain
 """
 
-from knowledge_base import KnowledgeBase
-from ml_recommender import MLRecommender
-from student_profile import StudentProfile, Proficiency, InterestLevel
+import argparse
 import os
 
+# The recommender modules (numpy, scipy, scikit-learn, numba) are imported in the
+# functions below, so --help answers without loading them
+
+# Code that builds the topics and their documents; a model older than these is retrained
+MODEL_SOURCES = ("knowledge_base.py", "ml_recommender.py")
+
+
+def model_is_current(model_path: str) -> bool:
+    """True if the saved model is newer than every file in MODEL_SOURCES."""
+    if not os.path.exists(model_path):
+        return False
+    here = os.path.dirname(os.path.abspath(__file__))
+    sources = [os.path.join(here, name) for name in MODEL_SOURCES]
+    return os.path.getmtime(model_path) > max(os.path.getmtime(source) for source in sources)
+
+
+def create_validation_students():
+    """Representative profiles: a typical student, a borderline one and a cold start."""
+    from student_profile import StudentProfile, Proficiency, InterestLevel
+    
+    typical = StudentProfile(
+        student_id="TEST001",
+        name="Test Student (Typical)",
+        cgpa=3.3,
+        major="Computer Science",
+        year=4,
+        max_weekly_hours=20
+    )
+    typical.add_skill("Python", Proficiency.ADVANCED)
+    typical.add_skill("Machine Learning", Proficiency.INTERMEDIATE)
+    typical.add_interest("Data Science", InterestLevel.HIGH)
+    typical.completed_courses.update(["Data Structures", "Database Systems"])
+    
+    borderline = StudentProfile(
+        student_id="TEST002",
+        name="Test Student (Borderline)",
+        cgpa=2.6,
+        major="Computer Science",
+        year=4,
+        max_weekly_hours=12
+    )
+    borderline.add_skill("JavaScript", Proficiency.INTERMEDIATE)
+    borderline.add_skill("SQL", Proficiency.NOVICE)
+    borderline.add_interest("Web Development", InterestLevel.HIGH)
+    
+    # A challenging student profile (cold start scenario)
+    cold_start = StudentProfile(
+        student_id="TEST003",
+        name="Test Student (Cold Start)",
+        cgpa=2.0,  # Very low CGPA
+        major="Computer Science",
+        year=4,
+        max_weekly_hours=10
+    )
+    cold_start.add_skill("Python", Proficiency.NOVICE)
+    cold_start.add_interest("Web Development", InterestLevel.MEDIUM)
+    
+    return [typical, borderline, cold_start]
+
 
 def main():
+    parser = argparse.ArgumentParser(description="Train and save the ML recommender model.")
+    parser.add_argument("--force", action="store_true",
+                        help="retrain even if the saved model is up to date")
+    args = parser.parse_args()
+    
+    from knowledge_base import KnowledgeBase
+    from ml_recommender import MLRecommender
+    
+    model_path = "models/ml_model.pkl"
+    retrain = args.force or not model_is_current(model_path)
+    # Without a saved model, MLRecommender trains on construction
+    had_model = os.path.exists(model_path)
+    
     print("="*70)
     print("ML MODEL TRAINING SCRIPT")
     print("="*70)
@@ -20,69 +91,65 @@ def main():
     
     # Step 1: Load Knowledge Base
     print("Step 1: Loading Knowledge Base...")
-    kb = KnowledgeBase()
+    kb = KnowledgeBase.load_or_build()
     topic_count = kb.get_total_topic_count()
     print(f"✓ Loaded {topic_count} topics from knowledge base")
     print()
     
     # Step 2: Initialize ML Recommender
     print("Step 2: Initializing ML Recommender...")
-    ml_recommender = MLRecommender(kb)
-    print()
-    
-    # Step 3: Train the model
-    print("Step 3: Training content-based filtering model...")
-    print("   - Building TF-IDF vectorizer")
-    print("   - Extracting topic features")
-    print("   - Computing topic vectors")
-    ml_recommender.fit()
+    ml_recommender = MLRecommender(kb, model_path)
     print()
     
-    # Step 4: Save the model
-    print("Step 4: Saving trained model...")
-    model_path = "models/ml_model.pkl"
-    ml_recommender.save_model(model_path)
-    print()
+    if retrain:
+        # Step 3: Train the model
+        print("Step 3: Training content-based filtering model...")
+        print("   - Building TF-IDF vectorizer")
+        print("   - Extracting topic features")
+        print("   - Computing topic vectors")
+        if had_model:
+            ml_recommender.fit()
+        print()
+        
+        # Step 4: Save the model
+        print("Step 4: Saving trained model...")
+        ml_recommender.save_model(model_path)
+        print()
+    else:
+        print("Steps 3-4: Saved model is up to date, skipping training (use --force to retrain)")
+        print()
     
-    # Step 5: Validate with sample student
-    print("Step 5: Validating model with sample student...")
+    # Step 5: Validate with sample students
+    print("Step 5: Validating model with sample students...")
     print("-" * 70)
     
-    # Create a challenging student profile (cold start scenario)
-    test_student = StudentProfile(
-        student_id="TEST001",
-        name="Test Student (Cold Start)",
-        cgpa=2.0,  # Very low CGPA
-        major="Computer Science",
-        year=4,
-        max_weekly_hours=10
-    )
-    test_student.add_skill("Python", Proficiency.NOVICE)
-    test_student.add_interest("Web Development", InterestLevel.MEDIUM)
-    
-    print(f"Test Student Profile:")
-    print(f"  Name: {test_student.name}")
-    print(f"  CGPA: {test_student.cgpa}")
-    print(f"  Skills: {list(test_student.skills.keys())}")
-    print(f"  Interests: {list(test_student.interests.keys())}")
-    print()
+    test_students = create_validation_students()
     
-    # Get ML recommendations
+    # Get ML recommendations for all of them in one batch
     print("Generating ML recommendations...")
-    recommendations = ml_recommender.get_recommendations(test_student, top_n=5)
+    all_recommendations = ml_recommender.get_recommendations_batch(test_students, top_n=5)
     
-    if recommendations:
-        print(f"✓ Successfully generated {len(recommendations)} recommendations")
+    for test_student, recommendations in zip(test_students, all_recommendations):
         print()
-        print("Sample Recommendations:")
-        print("-" * 70)
-        for i, rec in enumerate(recommendations[:3], 1):
-            print(f"{i}. {rec.topic.title}")
-            print(f"   Score: {rec.score:.2f} | Feasibility: {rec.feasibility_score:.2%}")
-            print(f"   Domain: {rec.topic.domain} | Difficulty: {rec.topic.difficulty}")
+        print(f"Test Student Profile:")
+        print(f"  Name: {test_student.name}")
+        print(f"  CGPA: {test_student.cgpa}")
+        print(f"  Skills: {list(test_student.skills.keys())}")
+        print(f"  Interests: {list(test_student.interests.keys())}")
+        print()
+        
+        if recommendations:
+            print(f"✓ Successfully generated {len(recommendations)} recommendations")
             print()
-    else:
-        print("⚠️  No recommendations generated (this may indicate an issue)")
+            print("Sample Recommendations:")
+            print("-" * 70)
+            for i, rec in enumerate(recommendations[:3], 1):
+                print(f"{i}. {rec.topic.title}")
+                print(f"   Score: {rec.score:.2f} | Feasibility: {rec.feasibility_score:.2%}")
+                print(f"   Domain: {rec.topic.domain} | Difficulty: {rec.topic.difficulty}")
+                print()
+        else:
+            print("⚠️  No recommendations generated (this may indicate an issue)")
     
     print("="*70)
     print("TRAINING COMPLETE!")
@@ -97,6 +164,7 @@ def main():
     print()
     print("To retrain the model:")
     print("  - Run this script again after updating the knowledge base")
+    print("  - Or run it with --force")
     print("  - Or delete the model file and it will auto-train on first use")
     print("="*70)
 
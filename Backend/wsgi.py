@@ -0,0 +1,12 @@
+"""
+WSGI entry point for running the API server under a production server.
+
+Usage:
+    gunicorn -w 4 -k gthread --threads 4 -b 0.0.0.0:5000 wsgi:app
+
+Do not add --preload: importing the app warms up the Numba kernels, which starts
+their thread pool, and a pool started before fork() hangs the forked workers.
+Each worker builds its own knowledge base and ML matrices instead (under 1 MB).
+"""
+
+from api_server import app